@@ -7,6 +7,8 @@
 from django.http import Http404
 from django.utils import feedgenerator
 
+from imanage.schedule.services import prefetch_schedule_changes
+
 XML_REPLACE = str.maketrans(
     {
         "<": "&lt;",
@@ -47,7 +49,11 @@ def description(self, obj):
         return f"Updates to the {sanitize_xml(obj.name)} schedule."
 
     def items(self, obj):
-        return obj.schedules.filter(version__isnull=False).order_by("-published")
+        return prefetch_schedule_changes(
+            obj.schedules.filter(version__isnull=False)
+            .select_related("event")
+            .order_by("-published")
+        )
 
     def item_title(self, item):
         return f"New {sanitize_xml(item.event.name)} schedule released ({sanitize_xml(item.version)})"
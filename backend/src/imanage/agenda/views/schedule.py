@@ -31,6 +31,7 @@
 )
 from imanage.schedule.ascii import draw_ascii_schedule
 from imanage.schedule.exporters import ScheduleData
+from imanage.schedule.services import prefetch_schedule_changes
 
 
 class EventSocialMediaCard(SocialMediaCardMixin, View):
@@ -250,7 +251,7 @@ class ChangelogView(EventPermissionRequired, TemplateView):
 
     @context
     def schedules(self):
-        return (
+        return prefetch_schedule_changes(
             self.request.event.schedules.all()
             .filter(version__isnull=False)
             .select_related("event")
@@ -5,11 +5,11 @@
 # SPDX-FileContributor: luto
 
 import io
-from collections import defaultdict
 
 from django.conf import settings
 from django.core.exceptions import SuspiciousFileOperation
 from django.core.files.storage import Storage
+from django.db.models import Prefetch
 from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import redirect
 from django.utils.functional import cached_property
@@ -34,6 +34,7 @@ class SpeakerList(EventPermissionRequired, Filterable, ListView):
     template_name = "agenda/speakers.html"
     permission_required = "schedule.list_schedule"
     default_filters = ("user__name__icontains",)
+    paginate_by = 100
 
     def get_queryset(self):
         qs = (
@@ -41,18 +42,26 @@ def get_queryset(self):
                 user__in=self.request.event.speakers, event=self.request.event
             )
             .select_related("user", "event")
-            .order_by("user__name")
+            .order_by("user__name", "pk")
         )
         qs = self.filter_queryset(qs)
+        # Prefetching only runs for the speakers on the current page
+        return qs.prefetch_related(
+            Prefetch(
+                "user__submissions",
+                queryset=self.request.event.talks.select_related(None)
+                .prefetch_related(None)
+                .order_by("title")
+                .distinct(),
+                to_attr="event_talks",
+            )
+        )
 
-        speaker_mapping = defaultdict(list)
-        for talk in self.request.event.talks.all().prefetch_related("speakers"):
-            for speaker in talk.speakers.all():
-                speaker_mapping[speaker.code].append(talk)
-
-        for profile in qs:
-            profile.talks = speaker_mapping[profile.user.code]
-        return qs
+    def get_context_data(self, **kwargs):
+        result = super().get_context_data(**kwargs)
+        for profile in result["speakers"]:
+            profile.talks = profile.user.event_talks
+        return result
 
 
 class SpeakerView(PermissionRequired, TemplateView):
@@ -42,6 +42,7 @@
 from imanage.submission.models import (
     Submission,
     SubmissionInvitation,
+    SubmissionStates,
     SubmissionType,
     Tag,
     Track,
@@ -51,6 +52,7 @@
     speaker_profiles_for_user,
     submissions_for_user,
 )
+from imanage.submission.services import bulk_set_state
 
 
 class AddSpeakerSerializer(serializers.Serializer):
@@ -63,6 +65,29 @@ class RemoveSpeakerSerializer(serializers.Serializer):
     user = serializers.CharField(required=True)
 
 
+BULK_STATES = (
+    SubmissionStates.SUBMITTED,
+    SubmissionStates.ACCEPTED,
+    SubmissionStates.REJECTED,
+    SubmissionStates.CONFIRMED,
+    SubmissionStates.CANCELED,
+)
+
+
+class BulkStateSerializer(serializers.Serializer):
+    submissions = serializers.ListField(
+        child=serializers.CharField(), allow_empty=False
+    )
+    state = serializers.ChoiceField(choices=BULK_STATES)
+
+
+class BulkStateResultSerializer(serializers.Serializer):
+    code = serializers.CharField()
+    success = serializers.BooleanField()
+    state = serializers.CharField(allow_null=True)
+    detail = serializers.CharField(allow_null=True)
+
+
 @extend_schema_view(
     list=extend_schema(
         summary="List Submissions",
@@ -122,6 +147,17 @@ class RemoveSpeakerSerializer(serializers.Serializer):
     confirm=extend_schema(summary="Confirm Submission"),
     cancel=extend_schema(summary="Cancel Submission"),
     make_submitted=extend_schema(summary="Make Submission Submitted"),
+    bulk_state=extend_schema(
+        summary="Change the State of Multiple Submissions",
+        description=(
+            "Moves all given submissions to the new state in one request, with "
+            "the same effects as the individual state actions. Submissions that "
+            "can’t be moved to the new state are skipped, and the response lists "
+            "the result for every submission code."
+        ),
+        request=BulkStateSerializer,
+        responses={200: BulkStateResultSerializer(many=True)},
+    ),
     add_speaker=extend_schema(
         summary="Add Speaker to Submission",
         request=AddSpeakerSerializer,
@@ -143,6 +179,7 @@ class SubmissionViewSet(ActivityLogMixin, ImanageViewSetMixin, viewsets.ModelVie
     ordering = ("code",)
     permission_map = {
         "make_submitted": "submission.state_change_submission",
+        "bulk_state": "submission.state_change_submission",
         "add_speaker": "submission.update_submission",
         "remove_speaker": "submission.update_submission",
         "invite_speaker": "submission.update_submission",
@@ -324,6 +361,53 @@ def make_submitted(self, request, **kwargs):
                 {"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=["POST"], url_path="bulk-state")
+    def bulk_state(self, request, **kwargs):
+        serializer = BulkStateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_state = serializer.validated_data["state"]
+        if new_state in (
+            SubmissionStates.CONFIRMED,
+            SubmissionStates.CANCELED,
+        ) and not request.user.has_perm(
+            "submission.orga_update_submission", self.event
+        ):
+            raise PermissionDenied()
+
+        codes = [code.upper() for code in serializer.validated_data["submissions"]]
+        submissions = {
+            submission.code.upper(): submission
+            for submission in submissions_for_user(self.event, request.user)
+            .filter(code__in=codes)
+            .select_related("event", "submission_type")
+            .prefetch_related("speakers")
+        }
+        errors = bulk_set_state(
+            self.event, submissions.values(), new_state, person=request.user
+        )
+        results = []
+        for code in codes:
+            if not (submission := submissions.get(code)):
+                results.append(
+                    {
+                        "code": code,
+                        "success": False,
+                        "state": None,
+                        "detail": "Not found.",
+                    }
+                )
+                continue
+            error = errors[submission.code]
+            results.append(
+                {
+                    "code": submission.code,
+                    "success": not error,
+                    "state": submission.state,
+                    "detail": error,
+                }
+            )
+        return Response(BulkStateResultSerializer(results, many=True).data)
+
     @action(detail=True, methods=["POST"], url_path="add-speaker")
     def add_speaker(self, request, **kwargs):
         serializer = AddSpeakerSerializer(data=request.data)
@@ -6,11 +6,15 @@
 # SPDX-FileContributor: Laura Klünder
 
 import copy
+import datetime as dt
+import hashlib
 import json
 import logging
+import shutil
 from collections import OrderedDict
 from contextlib import suppress
 from pathlib import Path
+from uuid import uuid4
 
 from django.conf import settings
 from django.contrib import messages
@@ -23,6 +27,7 @@
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.functional import Promise, cached_property
+from django.utils.timezone import now
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.views.generic.base import TemplateResponseMixin
@@ -32,6 +37,7 @@
 from imanage.cfp.signals import cfp_steps
 from imanage.common.exceptions import SendMailException
 from imanage.common.language import language
+from imanage.common.models.file import CachedFile
 from imanage.common.text.phrases import phrases
 from imanage.common.text.serialize import json_roundtrip
 from imanage.person.forms import SpeakerProfileForm, UserForm
@@ -47,6 +53,8 @@
 from imanage.submission.models.submission import Submission
 
 LOGGER = logging.getLogger(__name__)
+# Uploads of unfinished submissions are deleted after this time
+TEMPORARY_UPLOAD_EXPIRY = dt.timedelta(days=1)
 
 
 def i18n_string(data, locales):
@@ -94,6 +102,70 @@ def cfp_session(request):
     return session_data[key]
 
 
+class TemporaryUpload(UploadedFile):
+    """An upload of an unfinished submission. The file is only opened once
+    it is read, and can be read again after it was closed."""
+
+    def __init__(self, storage, storage_name, **kwargs):
+        self.storage = storage
+        self.storage_name = storage_name
+        super().__init__(file=None, **kwargs)
+
+    @property
+    def file(self):
+        if self._file is None:
+            self._file = self.storage.open(self.storage_name, "rb")
+        return self._file
+
+    @file.setter
+    def file(self, value):
+        self._file = value
+
+    @property
+    def closed(self):
+        return self._file is None or self._file.closed
+
+    def open(self, mode=None):
+        self.file.seek(0)
+        return self
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class LinkedTemporaryUpload(TemporaryUpload):
+    """An upload of an unfinished submission on a local file system. Like
+    Django's ``TemporaryUploadedFile``, it has a file path, so file system
+    storage moves it to its final location instead of copying it. The path
+    is a hard link to the stored file, so only the link is moved, and the
+    stored upload is kept if saving the submission is rolled back."""
+
+    def __init__(self, storage, storage_name, link_dir, **kwargs):
+        super().__init__(storage, storage_name, **kwargs)
+        self.link_dir = Path(link_dir)
+        self.link_path = None
+
+    def temporary_file_path(self):
+        if self.link_path is None or not self.link_path.exists():
+            source = self.storage.path(self.storage_name)
+            self.link_dir.mkdir(parents=True, exist_ok=True)
+            self.link_path = self.link_dir / f"{uuid4().hex}{Path(source).suffix}"
+            try:
+                self.link_path.hardlink_to(source)
+            except OSError:  # e.g. on different file systems
+                shutil.copyfile(source, self.link_path)
+        return str(self.link_path)
+
+    def close(self):
+        super().close()
+        if self.link_path is not None:
+            # Only left behind if the storage did not move it
+            self.link_path.unlink(missing_ok=True)
+            self.link_path = None
+
+
 def cfp_field_labels():
     """CfP-specific display labels for fields.
 
@@ -107,6 +179,15 @@ def cfp_field_labels():
     }
 
 
+class StepInvalid(Exception):
+    """Raised by a step's ``done`` method when its stored data is no longer
+    valid, so that the wizard can send the user back to that step."""
+
+    def __init__(self, step):
+        super().__init__(step.identifier)
+        self.step = step
+
+
 class BaseCfPStep:
     icon = "pencil"
 
@@ -187,6 +268,10 @@ def post(self, request):
     def done(self, request, draft=False):
         pass
 
+    def after_done(self, request, draft=False):
+        """Called after all steps' ``done`` methods ran and their changes were
+        committed, e.g. to send emails."""
+
     def get_csp_update(self, request):
         pass
 
@@ -248,7 +333,49 @@ def get_form(self, from_storage=False):
 
     def is_completed(self, request):
         self.request = request
-        return self.get_form(from_storage=True).is_valid()
+        if self.cfp_session.get("valid", {}).get(self.identifier) == (
+            self.get_validation_key()
+        ):
+            return True
+        form = self.get_form(from_storage=True)
+        valid = form.is_valid()
+        self.close_files()
+        if valid:
+            self.set_valid()
+        return valid
+
+    def get_validation_key(self):
+        """Returns a hash of everything the validity of the stored step data
+        depends on, so that steps are only validated again once that changes.
+        Steps that depend on other steps' data have to include it here."""
+        access_code = getattr(self.request, "access_code", None)
+        key = {
+            "data": self.cfp_session["data"].get(self.identifier),
+            "files": self.cfp_session["files"].get(self.identifier),
+            "code": self.cfp_session.get("code"),
+            "user": self.request.user.pk,
+            "access_code": access_code.pk if access_code else None,
+            **self.get_extra_validation_key(),
+        }
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def get_extra_validation_key(self):
+        return {}
+
+    def set_valid(self):
+        self.cfp_session.setdefault("valid", {})[
+            self.identifier
+        ] = self.get_validation_key()
+
+    def validate_for_save(self, form):
+        """Validates the stored data once more before it is saved. The cached
+        validity may be outdated, e.g. when a session type's deadline passed
+        or an upload expired since the step was completed."""
+        if not form.is_valid():
+            self.cfp_session.get("valid", {}).pop(self.identifier, None)
+            raise StepInvalid(self)
 
     def get_context_data(self, **kwargs):
         result = super().get_context_data(**kwargs)
@@ -272,6 +399,7 @@ def post(self, request):
             return self.get(request)
         self.set_data(form.cleaned_data)
         self.set_files(form.files)
+        self.set_valid()
         next_url = self.get_next_url(request)
         return redirect(next_url) if next_url else None
 
@@ -285,31 +413,97 @@ def set_data(self, data):
             json.dumps(serialize_data, default=serialize_value)
         )
 
+    @cached_property
+    def uploads(self):
+        return []
+
+    @property
+    def upload_session_key(self):
+        return f"cfp-upload-{self.request.resolver_match.kwargs['tmpid']}"
+
     def get_files(self):
         saved_files = self.cfp_session["files"].get(self.identifier, {})
+        cached_files = {
+            str(cached_file.pk): cached_file
+            for cached_file in CachedFile.objects.filter(
+                session_key=self.upload_session_key,
+                pk__in=[
+                    field_dict["cached_file"]
+                    for field_dict in saved_files.values()
+                    if "cached_file" in field_dict
+                ],
+            )
+        }
         files = {}
         for field, field_dict in saved_files.items():
             field_dict = field_dict.copy()
-            tmp_name = field_dict.pop("tmp_name")
-            files[field] = UploadedFile(
-                file=self.file_storage.open(tmp_name), **field_dict
-            )
+            if "tmp_name" in field_dict:
+                # Stored before uploads were tracked as cached files
+                storage = self.file_storage
+                storage_name = field_dict.pop("tmp_name")
+            else:
+                cached_file = cached_files.get(field_dict.pop("cached_file"))
+                if not cached_file or not cached_file.file:
+                    continue
+                storage = cached_file.file.storage
+                storage_name = cached_file.file.name
+            if not storage.exists(storage_name):
+                continue
+            try:
+                storage.path(storage_name)
+            except NotImplementedError:  # Storage without local paths
+                files[field] = TemporaryUpload(storage, storage_name, **field_dict)
+            else:
+                files[field] = LinkedTemporaryUpload(
+                    storage, storage_name, self.file_storage.location, **field_dict
+                )
+        self.uploads.extend(files.values())
         return files or None
 
     def set_files(self, files):
         for field, field_file in files.items():
-            tmp_filename = self.file_storage.save(field_file.name, field_file)
+            cached_file = CachedFile.objects.create(
+                expires=now() + TEMPORARY_UPLOAD_EXPIRY,
+                timestamp=now(),
+                filename=field_file.name,
+                content_type=field_file.content_type or "",
+                session_key=self.upload_session_key,
+            )
+            cached_file.file.save(field_file.name, field_file, save=False)
+            cached_file.save(update_fields=("file",))
             file_dict = {
-                "tmp_name": tmp_filename,
+                "cached_file": str(cached_file.pk),
                 "name": field_file.name,
                 "content_type": field_file.content_type,
                 "size": field_file.size,
                 "charset": field_file.charset,
             }
             data = self.cfp_session["files"].get(self.identifier, {})
+            if previous := data.get(field, {}).get("cached_file"):
+                CachedFile.objects.filter(pk=previous).delete()
             data[field] = file_dict
             self.cfp_session["files"][self.identifier] = data
 
+    def clear_files(self):
+        """Removes this step's temporary uploads once they have been saved."""
+        saved_files = self.cfp_session["files"].pop(self.identifier, {})
+        CachedFile.objects.filter(
+            pk__in=[
+                field_dict["cached_file"]
+                for field_dict in saved_files.values()
+                if "cached_file" in field_dict
+            ]
+        ).delete()
+
+    def close_files(self):
+        """Closes the stored uploads handed to this step's forms."""
+        while self.uploads:
+            self.uploads.pop().close()
+
+    def after_done(self, request, draft=False):
+        self.close_files()
+        self.clear_files()
+
     @cached_property
     def config(self):
         return self.event.cfp_flow.config.get("steps", {}).get(self.identifier, {})
@@ -401,9 +595,26 @@ def get_form_initial(self):
             result["additional_speaker"] = ",".join(result["additional_speaker"])
         return result
 
+    def get_extra_validation_key(self):
+        return {
+            field: self.request.GET.get(field) for field in ("submission_type", "track")
+        }
+
+    def validate_for_save(self, form):
+        # When only one session type is left (e.g. because the chosen type's
+        # deadline passed), the form drops the field and uses that type instead.
+        super().validate_for_save(form)
+        default_type = form.default_values.get("submission_type")
+        stored_type = form.data.get("submission_type")
+        stored_type = getattr(stored_type, "pk", stored_type)
+        if default_type and stored_type and str(stored_type) != str(default_type.pk):
+            self.cfp_session.get("valid", {}).pop(self.identifier, None)
+            raise StepInvalid(self)
+
     def done(self, request, draft=False):
         self.request = request
         form = self.get_form(from_storage=True)
+        self.validate_for_save(form)
         form.instance.event = self.event
         if draft:
             form.instance.state = SubmissionStates.DRAFT
@@ -433,21 +644,10 @@ def done(self, request, draft=False):
             )
 
             additional_speakers = form.cleaned_data.get("additional_speaker") or []
-            for email in additional_speakers:
-                try:
-                    invitation = SubmissionInvitation.objects.create(
-                        submission=submission,
-                        email=email,
-                    )
-                    invitation.send(_from=request.user)
-                    submission.log_action(
-                        "imanage.submission.invitation.send",
-                        person=request.user,
-                        data={"email": email},
-                    )
-                except SendMailException as exception:
-                    LOGGER.warning(str(exception))
-                    messages.warning(self.request, phrases.cfp.submission_email_fail)
+            request.submission_invitations = [
+                SubmissionInvitation.objects.create(submission=submission, email=email)
+                for email in additional_speakers
+            ]
 
         access_code = getattr(request, "access_code", None)
         if access_code != submission.access_code:
@@ -458,6 +658,20 @@ def done(self, request, draft=False):
 
         request.submission = submission
 
+    def after_done(self, request, draft=False):
+        super().after_done(request, draft=draft)
+        for invitation in getattr(request, "submission_invitations", []):
+            try:
+                invitation.send(_from=request.user)
+                request.submission.log_action(
+                    "imanage.submission.invitation.send",
+                    person=request.user,
+                    data={"email": invitation.email},
+                )
+            except SendMailException as exception:
+                LOGGER.warning(str(exception))
+                messages.warning(request, phrases.cfp.submission_email_fail)
+
     @property
     def label(self):
         return phrases.base.general
@@ -509,6 +723,13 @@ def is_applicable(self, request):
     def get_extra_form_kwargs(self):
         return {"target": ""}
 
+    def get_extra_validation_key(self):
+        info_data = self.cfp_session.get("data", {}).get("info", {})
+        return {
+            "track": info_data.get("track"),
+            "submission_type": info_data.get("submission_type"),
+        }
+
     def get_form_kwargs(self):
         result = super().get_form_kwargs()
         info_data = self.cfp_session.get("data", {}).get("info", {})
@@ -528,7 +749,7 @@ def done(self, request, draft=False):
         form = self.get_form(from_storage=True)
         form.speaker = request.user
         form.submission = request.submission
-        form.is_valid()
+        self.validate_for_save(form)
         form.save()
 
     @property
@@ -565,7 +786,7 @@ def get_context_data(self, **kwargs):
     def done(self, request, draft=False):
         if not getattr(request.user, "is_authenticated", False):
             form = self.get_form(from_storage=True)
-            form.is_valid()
+            self.validate_for_save(form)
             uid = form.save()
             request.user = User.objects.filter(pk=uid).first()
         # This should never happen
@@ -619,6 +840,13 @@ def get_form_kwargs(self):
         result["essential_only"] = True
         return result
 
+    def get_extra_validation_key(self):
+        user_data = self.cfp_session.get("data", {}).get("user", {})
+        return {
+            "user_id": user_data.get("user_id"),
+            "register_name": user_data.get("register_name"),
+        }
+
     def get_context_data(self, **kwargs):
         result = super().get_context_data(**kwargs)
         email = getattr(self.request.user, "email", None)
@@ -631,7 +859,7 @@ def get_context_data(self, **kwargs):
 
     def done(self, request, draft=False):
         form = self.get_form(from_storage=True)
-        form.is_valid()
+        self.validate_for_save(form)
         form.user = request.user
         form.save()
 
@@ -15,7 +15,7 @@
 from django.utils.translation import gettext_lazy as _
 from django.views import View
 
-from imanage.cfp.flow import cfp_session
+from imanage.cfp.flow import StepInvalid, cfp_session
 from imanage.cfp.views.event import EventPageMixin
 from imanage.common.exceptions import SendMailException
 from imanage.common.text.phrases import phrases
@@ -48,7 +48,6 @@ def get(request, *args, **kwargs):
 
 
 class SubmitWizard(EventPageMixin, View):
-    @transaction.atomic
     def dispatch(self, request, *args, **kwargs):
         self.event = self.request.event
         request.access_code = None
@@ -118,11 +117,19 @@ def done(self, request, draft=False, steps=None):
                 valid_steps.append(step)
 
         # We are done, or at least the data checks out. Time to save results.
-        request.event.cfp_flow.steps_dict["user"].done(request)
-        for step in valid_steps:
-            if step.identifier != "user":
-                step.done(request, draft=draft)
+        try:
+            with transaction.atomic():
+                request.event.cfp_flow.steps_dict["user"].done(request)
+                for step in valid_steps:
+                    if step.identifier != "user":
+                        step.done(request, draft=draft)
+        except StepInvalid as exception:
+            query = {"draft": 1} if draft else None
+            return redirect(exception.step.get_step_url(request, query=query))
 
+        # Emails are only sent once the proposal has been committed
+        for step in valid_steps:
+            step.after_done(request, draft=draft)
         if not draft:
             try:
                 request.submission.send_initial_mails(person=request.user)
@@ -224,6 +224,32 @@ class EnhancedSelectMultiple(EnhancedSelectMixin, forms.SelectMultiple):
     pass
 
 
+class LazyEnhancedSelectMultiple(EnhancedSelectMultiple):
+    """An enhanced multi-select that only renders its selected options.
+
+    The remaining options are added in the browser from a shared choice
+    list, identified by ``choices_id``, so that many selects with the same
+    long choice list don't each repeat it in the page.
+    """
+
+    def __init__(self, *args, choices_id=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.choices_id = choices_id
+
+    def get_context(self, name, value, attrs):
+        ctx = super().get_context(name, value, attrs)
+        ctx["widget"]["attrs"]["data-choices"] = self.choices_id
+        return ctx
+
+    def optgroups(self, name, value, attrs=None):
+        all_choices = self.choices
+        self.choices = [choice for choice in all_choices if str(choice[0]) in value]
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = all_choices
+
+
 def get_count(value, label):
     instance = getattr(value, "instance", None)
     if instance and hasattr(instance, "count"):
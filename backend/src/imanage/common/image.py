@@ -8,6 +8,7 @@
 
 from csp.decorators import csp_update
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.utils.translation import gettext_lazy as _
@@ -16,6 +17,8 @@
     "tiny": (64, 64),
     "default": (460, 460),
 }
+# Don't queue thumbnail generation for the same image more often than this
+THUMBNAIL_QUEUE_TIMEOUT = 5 * 60
 MAX_DIMENSIONS = (
     settings.IMAGE_DEFAULT_MAX_WIDTH,
     settings.IMAGE_DEFAULT_MAX_HEIGHT,
@@ -140,8 +143,8 @@ def process_image(*, image, generate_thumbnail=False):
             create_thumbnail(image, size, processed_img=img_without_exif)
 
 
-def get_thumbnail_field_name(image, size):
-    thumbnail_field_name = f"{image.field.name}_thumbnail"
+def get_thumbnail_field_name(field_name, size):
+    thumbnail_field_name = f"{field_name}_thumbnail"
     if size != "default":
         thumbnail_field_name += f"_{size}"
     return thumbnail_field_name
@@ -157,7 +160,7 @@ def create_thumbnail(image, size, processed_img=None):
     """
     if size not in THUMBNAIL_SIZES:
         return
-    thumbnail_field_name = get_thumbnail_field_name(image, size)
+    thumbnail_field_name = get_thumbnail_field_name(image.field.name, size)
     if not image.instance._meta.get_field(thumbnail_field_name):
         return
 
@@ -180,12 +183,53 @@ def create_thumbnail(image, size, processed_img=None):
     return thumbnail_field
 
 
+def create_thumbnails(image, force=False):
+    """Create all missing thumbnails for an image field, loading the image
+    only once. With ``force``, existing thumbnails are replaced, too."""
+    instance = image.instance
+    sizes = [
+        size
+        for size in THUMBNAIL_SIZES
+        if force
+        or not getattr(instance, get_thumbnail_field_name(image.field.name, size))
+    ]
+    if not sizes:
+        return
+    img = load_img(image)
+    if not img:
+        return
+    for size in sizes:
+        create_thumbnail(image, size, processed_img=img)
+    return sizes
+
+
+def queue_thumbnails(image):
+    """Queue the generation of missing thumbnails for an image field, unless
+    it was queued recently."""
+    instance = image.instance
+    if not instance.pk:
+        return
+    cache_key = (
+        f"thumbnails_queued_{instance._meta.label_lower}_{instance.pk}"
+        f"_{image.field.name}"
+    )
+    if cache.add(cache_key, True, THUMBNAIL_QUEUE_TIMEOUT):
+        instance.process_image(image.field.name, thumbnails_only=True)
+
+
 def get_thumbnail(image, size):
-    thumbnail_field_name = get_thumbnail_field_name(image, size)
+    """Returns the thumbnail for an image field, or the image itself if the
+    thumbnail has not been generated yet. In that case, the thumbnail is
+    generated in the background.
+
+    We trust the thumbnail field to tell us if a thumbnail exists instead of
+    asking the storage, as that is a round trip per image."""
+    thumbnail_field_name = get_thumbnail_field_name(image.field.name, size)
     if not (image.instance._meta.get_field(thumbnail_field_name)):
         return image
 
     thumbnail_field = getattr(image.instance, thumbnail_field_name, None)
-    if not thumbnail_field or not thumbnail_field.storage.exists(thumbnail_field.path):
-        return create_thumbnail(image, size)
-    return thumbnail_field
+    if thumbnail_field:
+        return thumbnail_field
+    queue_thumbnails(image)
+    return image
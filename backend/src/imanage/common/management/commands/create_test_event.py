@@ -2,28 +2,37 @@
 # SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
 
 import datetime as dt
+import math
 import random
 import re
+import statistics
+from collections import defaultdict
+from itertools import batched
 
 from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand
-from django.db import IntegrityError, transaction
+from django.db import transaction
 from django.utils.timezone import now
 from django_scopes import scope, scopes_disabled
 
+from imanage.common.models import ActivityLog
 from imanage.event.models import Event, Team
 from imanage.event.utils import create_organiser_with_team
 from imanage.person.models import SpeakerProfile, User
-from imanage.schedule.models import Room
-from imanage.submission.models import Review, Submission, SubmissionType, Track
+from imanage.schedule.models import Room, TalkSlot
+from imanage.submission.models import (
+    Review,
+    Submission,
+    SubmissionStates,
+    SubmissionType,
+    Track,
+)
+from imanage.submission.models.submission import SpeakerRole
+from imanage.submission.services import update_talk_slots
 
-
-def schedule_slot(submission, time, room):
-    slot = submission.slots.first()
-    slot.start = time
-    slot.end = time + dt.timedelta(minutes=submission.submission_type.default_duration)
-    slot.room = room
-    slot.save()
+BATCH_SIZE = 1000
 
 
 class Command(BaseCommand):
@@ -48,6 +57,45 @@ def add_arguments(self, parser):
             default="",
             help="Seed the random generator with a number for stable results",
         )
+        parser.add_argument(
+            "--submissions",
+            type=int,
+            default=None,
+            help="Number of submissions. Default: between 53 and 85.",
+        )
+        parser.add_argument(
+            "--speakers",
+            type=int,
+            default=None,
+            help="Number of speakers. Default: slightly fewer than submissions.",
+        )
+        parser.add_argument(
+            "--reviews",
+            type=int,
+            default=None,
+            help="Number of reviews. Default: about 2.4 per submission.",
+        )
+        parser.add_argument(
+            "--rooms", type=int, default=2, help="Number of rooms. Default: 2"
+        )
+        parser.add_argument(
+            "--slots",
+            type=int,
+            default=36,
+            help="Number of sessions to accept and schedule. Default: 36",
+        )
+        parser.add_argument(
+            "--schedules",
+            type=int,
+            default=1,
+            help="Number of schedule versions to release. Default: 1",
+        )
+        parser.add_argument(
+            "--log-entries",
+            type=int,
+            default=0,
+            help="Number of additional activity log entries. Default: 0",
+        )
 
     def build_event(self, end_stage, slug):
         administrators = User.objects.filter(is_administrator=True)
@@ -98,7 +146,7 @@ def build_event(self, end_stage, slug):
                 event=event, name="Workshop", default_duration=90
             )
 
-            event.display_settings["header_pattern"] = random.choice(
+            event.display_settings["header_pattern"] = self.random.choice(
                 ("plain", "pcb", "bubbles", "signal", "topo", "graph")
             )
             event.save()
@@ -127,62 +175,121 @@ def build_event(self, end_stage, slug):
             event.cfp.save()
             event.settings.review_max_score = 2
             self.event = event
-            self.build_room()
-            self.build_room()
+            self.build_rooms(max(1, self.options["rooms"]))
         return event
 
-    def build_room(self):
-        name = " ".join(
+    def build_rooms(self, count):
+        rooms = []
+        for position in range(count):
+            name = " ".join(
+                [
+                    clr
+                    for clr in re.split(r"([A-Z][a-z]*\d*)", self.fake.color_name())
+                    if clr
+                ]
+            )
+            rooms.append(
+                Room(event=self.event, name=f"{name} Room", position=position)
+            )
+        return Room.objects.bulk_create(rooms)
+
+    def generate_codes(self, model, count):
+        """Generates unique codes for models using
+        :class:`~imanage.common.models.mixins.GenerateCode`, as
+        ``bulk_create`` skips their ``save`` method. Unlike ``assign_code``,
+        this checks against existing codes only once, and uses the seeded
+        random generator."""
+        with scopes_disabled():
+            taken = set(
+                model.objects.exclude(**{f"{model._code_property}__isnull": True})
+                .values_list(model._code_property, flat=True)
+                .iterator()
+            )
+        codes = []
+        while len(codes) < count:
+            code = "".join(
+                self.random.choices(model._code_charset, k=model._code_length)
+            )
+            if code not in taken:
+                taken.add(code)
+                codes.append(code)
+        return codes
+
+    def build_users(self, count):
+        """Creates ``count`` users with unique ``@example.org`` email addresses.
+        Addresses already in use get a numeric suffix."""
+        names = [self.fake.name() for _ in range(count)]
+        emails = [f"{self.fake.user_name()}@example.org".lower() for _ in range(count)]
+        with scopes_disabled():
+            taken = set()
+            for batch in batched(emails, BATCH_SIZE):
+                taken.update(
+                    User.objects.filter(email__in=batch).values_list("email", flat=True)
+                )
+        for index, email in enumerate(emails):
+            if email in taken:
+                local, domain = email.split("@")
+                email = f"{local}{index}@{domain}"
+                emails[index] = email
+            taken.add(email)
+        # All test users have the same unusable password, so we hash it once
+        password = make_password(None)
+        users = [
+            User(
+                name=name,
+                email=email,
+                code=code,
+                password=password,
+                locale="en",
+                timezone="Europe/Berlin",
+            )
+            for name, email, code in zip(
+                names, emails, self.generate_codes(User, count)
+            )
+        ]
+        return User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+    def build_speakers(self, count):
+        speakers = self.build_users(count)
+        SpeakerProfile.objects.bulk_create(
             [
-                clr
-                for clr in re.split(r"([A-Z][a-z]*\d*)", self.fake.color_name())
-                if clr
-            ]
-        )
-        return Room.objects.create(
-            event=self.event, name=f"{name} Room", position=self.fake.random_digit()
+                SpeakerProfile(
+                    user=user,
+                    event=self.event,
+                    biography="\n\n".join(self.fake.texts(2)),
+                )
+                for user in speakers
+            ],
+            batch_size=BATCH_SIZE,
         )
+        return speakers
 
-    def create_user_with_retry(
-        self, name, email_base, locale="en", timezone="Europe/Berlin", max_retries=10
-    ):
-        """Create a user with retry logic for handling IntegrityError on non-unique emails."""
-        for attempt in range(max_retries):
-            try:
-                if attempt == 0:
-                    email = email_base
-                else:
-                    email = f"{email_base.split('@')[0]}{attempt}@{email_base.split('@')[1]}"
-
-                return User.objects.create_user(
-                    name=name,
-                    email=email,
-                    locale=locale,
-                    timezone=timezone,
+    def build_log_entries(self, entries):
+        """Creates activity log entries from ``(submission, action_type, person,
+        timestamp)`` tuples."""
+        content_type = ContentType.objects.get_for_model(Submission)
+        logs = ActivityLog.objects.bulk_create(
+            [
+                ActivityLog(
+                    event=self.event,
+                    person=person,
+                    content_type=content_type,
+                    object_id=submission.pk,
+                    action_type=action_type,
+                    is_orga_action=person is None,
                 )
-            except IntegrityError:
-                if attempt == max_retries - 1:
-                    raise
-                continue
-
-    def build_cfp_stage(self):
-        """Targeting 53-85 total submissions, with at least some speakers with
-        double submissions and some with multiple speakers.
-
-        Submissions are distributed across the submission timeline in a
-        realistic fashion.
-        """
-        target_talk_submissions = self.fake.random_int(min=40, max=65)
-        target_workshop_submissions = self.fake.random_int(min=13, max=20)
-        total_submissions = target_talk_submissions + target_workshop_submissions
-        target_speaker_count = self.fake.random_int(
-            min=int(total_submissions / 1.8),
-            max=int(total_submissions / 1.1),
+                for submission, action_type, person, _ in entries
+            ],
+            batch_size=BATCH_SIZE,
         )
-        speakers = [self.build_speaker() for _ in range(target_speaker_count)]
-        for _ in range(total_submissions - target_speaker_count):
-            speakers.append(random.choice(speakers))
-
+        # bulk_create always sets auto_now_add fields to the current time
+        for log, (*_, timestamp) in zip(logs, entries):
+            log.timestamp = timestamp
+        ActivityLog.objects.bulk_update(logs, ["timestamp"], batch_size=BATCH_SIZE)
+
+    def get_submission_times(self, total_submissions):
+        """Distributes submissions across the submission timeline in a
+        realistic fashion, with most of them coming in on the last day."""
         submission_times = []
         max_submission_time = min(now(), self.event.cfp.deadline)
         for _ in range(int(total_submissions / 10)):
@@ -213,139 +320,220 @@ def build_cfp_stage(self):
                     datetime_end=max_submission_time,
                 )
             )
+        return submission_times
+
+    def build_cfp_stage(self):
+        """Unless configured otherwise, we target 53-85 total submissions,
+        with at least some speakers with double submissions and some with
+        multiple speakers. About a quarter of all submissions are workshops."""
+        total_submissions = self.options["submissions"]
+        if total_submissions is None:
+            total_submissions = self.fake.random_int(min=53, max=85)
+        target_workshop_submissions = total_submissions // 4
+        target_speaker_count = self.options["speakers"]
+        if target_speaker_count is None:
+            target_speaker_count = self.fake.random_int(
+                min=int(total_submissions / 1.8),
+                max=int(total_submissions / 1.1),
+            )
+        target_speaker_count = max(1, target_speaker_count)
+
+        speakers = self.build_speakers(target_speaker_count)
+        submitters = speakers[:total_submissions]
+        for _ in range(total_submissions - len(submitters)):
+            submitters.append(self.random.choice(speakers))
+
         talk = self.event.submission_types.get(name__iexact="talk")
         workshop = self.event.submission_types.get(name__iexact="workshop")
-        submission_types = [workshop for _ in range(target_workshop_submissions)] + [
-            talk for _ in range(target_talk_submissions)
-        ]
-        random.shuffle(submission_types)
-        submissions = [
-            self.build_submission(speaker, submission_type, submission_time)
-            for speaker, submission_type, submission_time in zip(
-                speakers, submission_types, submission_times
-            )
-        ]
-        for _ in range(self.fake.random_int(min=5, max=15)):
-            submission = random.choice(submissions)
-            speaker = random.choice(speakers)
-            submission.speakers.add(speaker)
-
-    def build_speaker(self):
-        email = self.fake.user_name() + "@example.org"
-        user = User.objects.filter(email__iexact=email).first()
-        if user:  # pragma: no cover
-            return user
-        user = self.create_user_with_retry(
-            name=self.fake.name(),
-            email_base=email,
-            # TODO: generate avatar,
-        )
-        SpeakerProfile.objects.create(
-            user=user, event=self.event, biography="\n\n".join(self.fake.texts(2))
+        submission_types = [workshop] * target_workshop_submissions + [talk] * (
+            total_submissions - target_workshop_submissions
         )
-        return user
-
-    def build_submission(self, speaker, submission_type, submission_time):
-        with self.freeze_time(submission_time):
-            submission = Submission.objects.create(
+        self.random.shuffle(submission_types)
+        tracks = list(self.event.tracks.all())
+        submission_times = self.get_submission_times(total_submissions)
+        submissions = [
+            Submission(
                 event=self.event,
+                code=code,
                 title=self.fake.catch_phrase(),
                 submission_type=submission_type,
-                track=random.choice(self.event.tracks.all()),
+                track=self.random.choice(tracks),
                 abstract=self.fake.bs().capitalize() + "!",
                 description=self.fake.text(),
                 content_locale="en",
-                do_not_record=random.choice([False] * 10 + [True]),
+                do_not_record=self.random.choice([False] * 10 + [True]),
             )
-            submission.log_action("imanage.submission.create", person=speaker)
-        submission.speakers.add(speaker)
-        return submission
-
-    def build_review_stage(self):
-        """We will go with only three reviewers: One to review all submissions,
-        one to review more positively, one to review more negatively."""
-        reviewers = [
-            self.create_user_with_retry(
-                name=self.fake.name(),
-                email_base=self.fake.user_name() + "@example.org",
+            for code, submission_type in zip(
+                self.generate_codes(Submission, total_submissions), submission_types
             )
-            for _ in range(3)
         ]
-        team = Team.objects.create(
-            organiser=self.event.organiser, name="DemoCon Reviewers", is_reviewer=True
+        submissions = Submission.objects.bulk_create(
+            submissions, batch_size=BATCH_SIZE
+        )
+        # bulk_create always sets auto_now_add fields to the current time
+        for submission, submission_time in zip(submissions, submission_times):
+            submission.created = submission_time
+        Submission.objects.bulk_update(
+            submissions, ["created"], batch_size=BATCH_SIZE
         )
-        team.limit_events.add(self.event)
-        all_submissions = list(self.event.submissions.all())
 
-        reviewer = reviewers[0]
-        for submission in all_submissions:
-            self.build_review(reviewer, submission)
+        speaker_roles = dict.fromkeys(
+            (submission.pk, speaker.pk)
+            for submission, speaker in zip(submissions, submitters)
+        )
+        for _ in range(
+            self.random.randint(total_submissions // 14, total_submissions // 5)
+        ):
+            submission = self.random.choice(submissions)
+            speaker = self.random.choice(speakers)
+            speaker_roles[(submission.pk, speaker.pk)] = None
+        SpeakerRole.objects.bulk_create(
+            [
+                SpeakerRole(submission_id=submission_id, user_id=user_id)
+                for submission_id, user_id in speaker_roles
+            ],
+            batch_size=BATCH_SIZE,
+        )
 
-        random.shuffle(all_submissions)
-        reviewer = reviewers[1]
-        for submission in all_submissions[: (int(len(all_submissions) * 0.8))]:
-            self.build_review(reviewer, submission, positive=True)
+        self.build_log_entries(
+            [
+                (submission, "imanage.submission.create", speaker, submission_time)
+                for submission, speaker, submission_time in zip(
+                    submissions, submitters, submission_times
+                )
+            ]
+            + [
+                (
+                    self.random.choice(submissions),
+                    "imanage.submission.update",
+                    self.random.choice(speakers),
+                    self.fake.date_time_between_dates(
+                        datetime_start=min(submission_times, default=now()),
+                        datetime_end=now(),
+                    ),
+                )
+                for _ in range(self.options["log_entries"])
+            ]
+        )
 
-        random.shuffle(all_submissions)
-        reviewer = reviewers[2]
-        for submission in all_submissions[: (int(len(all_submissions) * 0.6))]:
-            self.build_review(reviewer, submission, positive=False)
+    def build_review_stage(self):
+        """Reviewers review up to 200 submissions each, so that smaller events
+        get three reviewers: One to review neutrally, one to review more
+        positively, one to review more negatively."""
+        submissions = list(self.event.submissions.all().order_by("pk"))
+        if not submissions:
+            return
+        total_reviews = self.options["reviews"]
+        if total_reviews is None:
+            total_reviews = int(len(submissions) * 2.4)
+        reviewer_count = max(3, math.ceil(total_reviews / min(len(submissions), 200)))
+        reviewers = self.build_users(reviewer_count)
+        team = Team.objects.create(
+            organiser=self.event.organiser, name="DemoCon Reviewers", is_reviewer=True
+        )
+        team.limit_events.add(self.event)
+        team.members.add(*reviewers)
 
-        all_talks = sorted(
-            self.event.submissions.filter(submission_type__name="Talk"),
-            key=lambda talk: talk.median_score,
+        reviews = []
+        scores = defaultdict(list)
+        for index, reviewer in enumerate(reviewers):
+            review_count = total_reviews // reviewer_count + (
+                index < total_reviews % reviewer_count
+            )
+            rating = [0, 1, 2]
+            if index % 3 == 1:
+                rating.append(2)
+            elif index % 3 == 2:
+                rating.append(0)
+            for submission in self.random.sample(submissions, review_count):
+                score = self.random.choice(rating)
+                scores[submission.pk].append(score)
+                reviews.append(
+                    Review(submission=submission, user=reviewer, score=score)
+                )
+        Review.objects.bulk_create(reviews, batch_size=BATCH_SIZE)
+
+        # Accept the best submissions, reject the rest
+        submissions.sort(
+            key=lambda submission: (
+                statistics.median(scores[submission.pk])
+                if scores[submission.pk]
+                else -1
+            ),
             reverse=True,
         )
-        all_workshops = sorted(
-            self.event.submissions.filter(submission_type__name="Workshop"),
-            key=lambda talk: talk.median_score,
-            reverse=True,
+        slot_count = min(self.options["slots"], len(submissions))
+        confirmed, rejected = submissions[:slot_count], submissions[slot_count:]
+        for state, group in (
+            (SubmissionStates.CONFIRMED, confirmed),
+            (SubmissionStates.REJECTED, rejected),
+        ):
+            for batch in batched(group, BATCH_SIZE):
+                Submission.objects.filter(
+                    pk__in=[submission.pk for submission in batch]
+                ).update(state=state)
+            for submission in group:
+                submission.state = state
+        # Accepting submissions creates their slots in the WIP schedule
+        update_talk_slots(self.event, confirmed)
+        decided = now()
+        self.build_log_entries(
+            [
+                (submission, f"imanage.submission.{action}", None, decided)
+                for submission in confirmed
+                for action in ("accept", "confirm")
+            ]
+            + [
+                (submission, "imanage.submission.reject", None, decided)
+                for submission in rejected
+            ]
         )
 
-        for index, talk in enumerate(all_talks):
-            if index < 27:
-                talk.accept()
-                talk.confirm()
-            else:
-                talk.reject()
-
-        for index, talk in enumerate(all_workshops):
-            if index < 9:
-                talk.accept()
-                talk.confirm()
-            else:
-                talk.reject()
-
-    def build_review(self, reviewer, submission, positive=None):
-        rating = [0, 1, 2]
-        if positive is True:
-            rating.append(2)
-        elif positive is False:
-            rating.append(0)
-        return Review.objects.create(
-            submission=submission, user=reviewer, score=random.choice(rating)
+    def build_schedule_stage(self):
+        """Distributes confirmed sessions evenly over all rooms and days.
+        Each room starts its day at 9:00, with 15 minutes between sessions.
+        Every additional schedule version moves about a tenth of all
+        sessions by half an hour."""
+        wip_schedule = self.event.wip_schedule
+        slots = (
+            wip_schedule.talks.filter(submission__state=SubmissionStates.CONFIRMED)
+            .select_related("submission__submission_type")
+            .order_by("submission_id", "pk")
+        )
+        rooms = list(self.event.rooms.all())
+        days = (self.event.date_to - self.event.date_from).days + 1
+        next_start = {}
+        slots = list(slots)
+        for index, slot in enumerate(slots):
+            room = rooms[index % len(rooms)]
+            day = (index // len(rooms)) % days
+            start = next_start.get(
+                (room.pk, day),
+                self.event.datetime_from + dt.timedelta(days=day, hours=9),
+            )
+            end = start + dt.timedelta(
+                minutes=slot.submission.submission_type.default_duration
+            )
+            next_start[(room.pk, day)] = end + dt.timedelta(minutes=15)
+            slot.room = room
+            slot.start = start
+            slot.end = end
+        TalkSlot.objects.bulk_update(
+            slots, ["room", "start", "end"], batch_size=BATCH_SIZE
         )
 
-    def build_schedule_stage(self):
-        # Three days, two rooms, nine talks and three workshops and day == 3 * 12 = 36 slots
-        talks = self.event.submissions.filter(
-            state="confirmed", submission_type__name="Talk"
-        ).iterator()
-        workshops = self.event.submissions.filter(
-            state="confirmed", submission_type__name="Workshop"
-        ).iterator()
-        talk_room, workshop_room = self.event.rooms.all()
-        current_time = self.event.datetime_from + dt.timedelta(hours=9)
-
-        for _ in range(3):
-            for _ in range(3):
-                schedule_slot(next(workshops), current_time, workshop_room)
-                for _ in range(3):
-                    schedule_slot(next(talks), current_time, talk_room)
-                    current_time += dt.timedelta(minutes=30)
-                current_time += dt.timedelta(minutes=60)
-            current_time += dt.timedelta(hours=16, minutes=30)
-        self.event.wip_schedule.freeze("v1.0")
+        for version in range(1, self.options["schedules"] + 1):
+            if version > 1:
+                moved = list(wip_schedule.talks.filter(start__isnull=False))
+                moved = self.random.sample(moved, len(moved) // 10)
+                for slot in moved:
+                    slot.start += dt.timedelta(minutes=30)
+                    slot.end += dt.timedelta(minutes=30)
+                TalkSlot.objects.bulk_update(
+                    moved, ["start", "end"], batch_size=BATCH_SIZE
+                )
+            wip_schedule.freeze(f"v{version}.0", notify_speakers=False)
+            wip_schedule = self.event.wip_schedule
 
     @transaction.atomic
     def handle(self, *args, **options):
@@ -357,24 +545,14 @@ def handle(self, *args, **options):
                 Faker.seed(int(seed))
 
             self.fake = Faker()
+            self.random = random.Random(int(seed) if seed else None)
         except ImportError:  # pragma: no cover
             self.stdout.write(
                 self.style.ERROR('Please run "pip install Faker" to use this command.')
             )
             return
 
-        try:
-            from freezegun import freeze_time
-
-            self.freeze_time = freeze_time
-        except ImportError:  # pragma: no cover
-            self.stdout.write(
-                self.style.ERROR(
-                    'Please run "pip install freezegun" to use this command.'
-                )
-            )
-            return
-
+        self.options = options
         end_stage = options.get("stage")
         event = self.build_event(end_stage, slug=options.get("slug"))
         if not event:
@@ -0,0 +1,159 @@
+# SPDX-FileCopyrightText: 2026-present Tobias Kunze
+# SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections, models
+from django_scopes import scopes_disabled
+
+from imanage.common.image import (
+    THUMBNAIL_SIZES,
+    create_thumbnails,
+    get_thumbnail_field_name,
+)
+
+
+def get_thumbnail_image_fields():
+    """Returns ``(model, field_name, thumbnail_field_names)`` for every image
+    field that has thumbnail fields."""
+    result = []
+    for model in apps.get_models():
+        field_names = {field.name for field in model._meta.get_fields()}
+        for field in model._meta.get_fields():
+            if not isinstance(field, models.ImageField):
+                continue
+            thumbnail_fields = [
+                name
+                for size in THUMBNAIL_SIZES
+                if (name := get_thumbnail_field_name(field.name, size)) in field_names
+            ]
+            if thumbnail_fields:
+                result.append((model, field.name, thumbnail_fields))
+    return result
+
+
+def get_jobs(force=False):
+    """Yields ``(model label, pk, field name)`` for every image that is
+    missing a thumbnail, or every image at all with ``force``. As images are
+    only listed while they are missing thumbnails, an interrupted run picks
+    up where it left off."""
+    with scopes_disabled():
+        for model, field_name, thumbnail_fields in get_thumbnail_image_fields():
+            queryset = model.objects.exclude(
+                models.Q(**{f"{field_name}__isnull": True})
+                | models.Q(**{field_name: ""})
+            )
+            if not force:
+                missing = models.Q()
+                for name in thumbnail_fields:
+                    missing |= models.Q(**{f"{name}__isnull": True}) | models.Q(
+                        **{name: ""}
+                    )
+                queryset = queryset.filter(missing)
+            for pk in (
+                queryset.order_by("pk").values_list("pk", flat=True).iterator()
+            ):
+                yield model._meta.label, pk, field_name
+
+
+def generate_thumbnails(job, force=False):
+    """Generates the thumbnails for one image. Runs in worker processes,
+    so it only receives and returns plain data."""
+    label, pk, field_name = job
+    with scopes_disabled():
+        instance = apps.get_model(label).objects.filter(pk=pk).first()
+        image = getattr(instance, field_name, None) if instance else None
+        if not image:
+            return job, False
+        try:
+            return job, bool(create_thumbnails(image, force=force))
+        except Exception:
+            return job, False
+
+
+class Command(BaseCommand):
+    help = "Generate missing thumbnails for all images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes. Default: number of CPUs",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=0,
+            help="Maximum number of images to process per second. Default: no limit",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate all thumbnails, not only missing ones.",
+        )
+
+    def handle(self, *args, **options):
+        jobs = list(get_jobs(force=options["force"]))
+        self.stdout.write(f"Found {len(jobs)} images to process.")
+        workers = max(1, options["workers"])
+        rate = options["rate"]
+        self.done = self.failed = 0
+        start = time.monotonic()
+
+        if workers == 1:
+            for index, job in enumerate(jobs):
+                self.wait_for_rate(start, index, rate)
+                self.report(generate_thumbnails(job, force=options["force"]))
+        else:
+            # Workers are started fresh and open their own database connections
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            ) as executor:
+                pending = set()
+                for index, job in enumerate(jobs):
+                    self.wait_for_rate(start, index, rate)
+                    pending.add(
+                        executor.submit(
+                            generate_thumbnails, job, force=options["force"]
+                        )
+                    )
+                    # Only keep a few jobs queued, so that the rate limit holds
+                    # and we can report progress as we go.
+                    if len(pending) >= workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self.report(future.result())
+                for future in wait(pending).done:
+                    self.report(future.result())
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated thumbnails for {self.done} images, {self.failed} failed."
+            )
+        )
+
+    def wait_for_rate(self, start, index, rate):
+        if rate and (delay := start + index / rate - time.monotonic()) > 0:
+            time.sleep(delay)
+
+    def report(self, result):
+        (label, pk, field_name), success = result
+        if success:
+            self.done += 1
+            if self.done % 100 == 0:
+                self.stdout.write(f"Generated thumbnails for {self.done} images.")
+        else:
+            self.failed += 1
+            self.stderr.write(
+                f"Could not generate thumbnails for {label} {pk} ({field_name})."
+            )
@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: 2026-present Tobias Kunze
+# SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
+
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+SETUP_SCRIPT = "import django; django.setup()"
+
+
+def parse_importtime(output):
+    """Parses the stderr output of ``python -X importtime`` into a list of
+    ``(module, self_us, cumulative_us)`` tuples."""
+    result = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:") :].split("|")
+            result.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            # The header line ("self [us] | cumulative | imported package")
+            continue
+    return result
+
+
+def profile_setup(settings_module=None):
+    """Runs ``django.setup()`` in a fresh interpreter with import time
+    tracing enabled and returns the parsed import times."""
+    env = os.environ.copy()
+    if settings_module:
+        env["DJANGO_SETTINGS_MODULE"] = settings_module
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SETUP_SCRIPT],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode:
+        raise CommandError(process.stderr.strip().splitlines()[-1])
+    return parse_importtime(process.stderr)
+
+
+class Command(BaseCommand):
+    help = "Report the slowest module imports during django.setup()"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Number of modules to show."
+        )
+        parser.add_argument(
+            "--sort",
+            choices=("self", "cumulative"),
+            default="self",
+            help="Sort by time spent in the module itself or including its imports.",
+        )
+        parser.add_argument(
+            "--filter",
+            type=str,
+            default="",
+            help="Only show modules starting with this prefix, e.g. 'imanage'.",
+        )
+
+    def handle(self, *args, **options):
+        timings = profile_setup(os.environ.get("DJANGO_SETTINGS_MODULE"))
+        total = sum(self_us for _, self_us, _ in timings)
+        if prefix := options["filter"]:
+            timings = [timing for timing in timings if timing[0].startswith(prefix)]
+        index = 1 if options["sort"] == "self" else 2
+        timings = sorted(timings, key=lambda timing: timing[index], reverse=True)
+
+        self.stdout.write(f"{'self [ms]':>10} {'cumul. [ms]':>12}  module")
+        for module, self_us, cumulative_us in timings[: options["limit"]]:
+            self.stdout.write(
+                f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>12.1f}  {module}"
+            )
+        self.stdout.write(f"Total import time: {total / 1000:.1f} ms")
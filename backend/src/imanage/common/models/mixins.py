@@ -226,7 +226,7 @@ def delete(self, *args, **kwargs):
         self._delete_files()
         return super().delete(*args, **kwargs)
 
-    def process_image(self, field, generate_thumbnail=False):
+    def process_image(self, field, generate_thumbnail=False, thumbnails_only=False):
         from imanage.common.tasks import task_process_image
 
         task_process_image.apply_async(
@@ -234,9 +234,10 @@ def process_image(self, field, generate_thumbnail=False):
                 "field": field,
                 "model": str(self._meta.model_name.capitalize()),
                 "pk": self.pk,
-                "generate_thumbnail": generate_thumbnail,
+                "generate_thumbnail": generate_thumbnail or thumbnails_only,
+                "thumbnails_only": thumbnails_only,
             },
-            countdown=10,
+            countdown=0 if thumbnails_only else 10,
         )
 
 
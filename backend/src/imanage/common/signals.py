@@ -3,6 +3,7 @@
 
 import logging
 import uuid
+import weakref
 from functools import wraps
 from typing import Any, Callable
 
@@ -10,7 +11,7 @@
 from django.apps import apps
 from django.conf import settings
 from django.core.cache import cache
-from django.dispatch.dispatcher import NO_RECEIVERS
+from django.dispatch.dispatcher import NO_RECEIVERS, NONE_ID
 
 from imanage.event.models import Event
 
@@ -24,13 +25,50 @@ def _populate_app_cache():
         app_cache[app_config.name] = app_config
 
 
+def _weak_receiver(receiver):
+    if hasattr(receiver, "__self__") and hasattr(receiver, "__func__"):
+        return weakref.WeakMethod(receiver)
+    try:
+        return weakref.ref(receiver)
+    except TypeError:  # pragma: no cover
+        return lambda: receiver
+
+
+def _receiver_sort_key(receiver):
+    return receiver.__module__, receiver.__name__
+
+
 class EventPluginSignal(django.dispatch.Signal):
     """An extension to Django's built-in signals.
 
     It sends out it's events only to receivers which belong to plugins
     that are enabled for the given Event.
+
+    Finding the active receivers is comparatively expensive, and many signals
+    are sent several times per request, so we keep a table of the sorted
+    active receivers per set of enabled plugins. As the plugin set is part of
+    the key, enabling or disabling a plugin results in a new table, and
+    connecting or disconnecting receivers discards all tables of the signal.
     """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._receiver_tables = {}
+        self._has_sender_receivers = None
+
+    def connect(self, *args, **kwargs):
+        super().connect(*args, **kwargs)
+        self.clear_receiver_tables()
+
+    def disconnect(self, *args, **kwargs):
+        result = super().disconnect(*args, **kwargs)
+        self.clear_receiver_tables()
+        return result
+
+    def clear_receiver_tables(self):
+        self._receiver_tables = {}
+        self._has_sender_receivers = None
+
     def get_live_receivers(self, sender):
         receivers = self._live_receivers(sender)
         if not receivers:
@@ -58,6 +96,40 @@ def _is_active(sender, receiver):
             return app and app.name in sender.plugin_list
         return False
 
+    def _build_receiver_table(self, sender):
+        return sorted(
+            (
+                receiver
+                for receiver in self.get_live_receivers(sender)
+                if self._is_active(sender, receiver)
+            ),
+            key=_receiver_sort_key,
+        )
+
+    def get_active_receivers(self, sender: Event) -> list[Callable]:
+        """Returns all receivers belonging to core modules or to plugins that
+        are enabled for the given event, sorted by module and name."""
+        if not app_cache:
+            _populate_app_cache()
+
+        if self._has_sender_receivers is None:
+            self._has_sender_receivers = any(
+                lookup_key[1] != NONE_ID for lookup_key, *_ in self.receivers
+            )
+        if self._has_sender_receivers:
+            # Receivers that were connected for a specific sender can't be
+            # shared between events, so we don't cache them.
+            return self._build_receiver_table(sender)
+
+        key = ((sender.plugins or "") if sender else None, tuple(settings.CORE_MODULES))
+        if (table := self._receiver_tables.get(key)) is not None:
+            receivers = [ref() for ref in table]
+            if None not in receivers:
+                return receivers
+        receivers = self._build_receiver_table(sender)
+        self._receiver_tables[key] = [_weak_receiver(r) for r in receivers]
+        return receivers
+
     def send(self, sender: Event, **named) -> list[tuple[Callable, Any]]:
         """Send signal from sender to all connected receivers that belong to
         plugins enabled for the given Event.
@@ -68,24 +140,16 @@ def send(self, sender: Event, **named) -> list[tuple[Callable, Any]]:
         if sender and not isinstance(sender, Event):
             raise ValueError("Sender needs to be an event.")
 
-        responses = []
         if (
             not self.receivers
             or self.sender_receivers_cache.get(sender) is NO_RECEIVERS
         ):
-            return responses
-
-        if not app_cache:
-            _populate_app_cache()
+            return []
 
-        for receiver in self.get_live_receivers(sender):
-            if self._is_active(sender, receiver):
-                response = receiver(signal=self, sender=sender, **named)
-                responses.append((receiver, response))
-        return sorted(
-            responses,
-            key=lambda response: (response[0].__module__, response[0].__name__),
-        )
+        return [
+            (receiver, receiver(signal=self, sender=sender, **named))
+            for receiver in self.get_active_receivers(sender)
+        ]
 
     def send_robust(self, sender: Event, **named) -> list[tuple[Callable, Any]]:
         """Send signal from sender to all connected receivers that belong to
@@ -105,21 +169,14 @@ def send_robust(self, sender: Event, **named) -> list[tuple[Callable, Any]]:
         ):
             return []
 
-        if not app_cache:  # pragma: no cover
-            _populate_app_cache()
-
-        for receiver in self.get_live_receivers(sender):
-            if self._is_active(sender, receiver):
-                try:
-                    response = receiver(signal=self, sender=sender, **named)
-                except Exception as err:
-                    responses.append((receiver, err))
-                else:
-                    responses.append((receiver, response))
-        return sorted(
-            responses,
-            key=lambda response: (response[0].__module__, response[0].__name__),
-        )
+        for receiver in self.get_active_receivers(sender):
+            try:
+                response = receiver(signal=self, sender=sender, **named)
+            except Exception as err:
+                responses.append((receiver, err))
+            else:
+                responses.append((receiver, response))
+        return responses
 
     def send_chained(
         self, sender: Event, chain_kwarg_name, **named
@@ -8,7 +8,7 @@
 from django_scopes import scopes_disabled
 
 from imanage.celery_app import app
-from imanage.common.image import process_image
+from imanage.common.image import create_thumbnails, process_image
 from imanage.event.models import Event
 from imanage.person.models import User
 from imanage.submission.models import Submission
@@ -17,7 +17,14 @@
 
 
 @app.task(name="imanage.process_image")
-def task_process_image(*, model: str, pk: int, field: str, generate_thumbnail: bool):
+def task_process_image(
+    *,
+    model: str,
+    pk: int,
+    field: str,
+    generate_thumbnail: bool,
+    thumbnails_only: bool = False,
+):
     models = {
         "Event": Event,
         "Submission": Submission,
@@ -36,7 +43,10 @@ def task_process_image(*, model: str, pk: int, field: str, generate_thumbnail: b
             return
 
         try:
-            process_image(image=image, generate_thumbnail=generate_thumbnail)
+            if thumbnails_only:
+                create_thumbnails(image)
+            else:
+                process_image(image=image, generate_thumbnail=generate_thumbnail)
         except Exception as e:  # pragma: no cover
             logger.error("Could not process image %s: %s", image.path, e)
 
@@ -6,7 +6,7 @@
 
 import html
 from copy import copy
-from functools import partial
+from functools import cache, partial
 
 import bleach
 import markdown
@@ -67,14 +67,30 @@
 
 ALLOWED_PROTOCOLS = {"http", "https", "mailto", "tel"}
 
-ALLOWED_TLDS = sorted(  # Sorting this list makes sure that shorter substring TLDs don't win against longer TLDs, e.g. matching '.com' before '.co'
-    {suffix.rsplit(".")[-1] for suffix in PublicSuffixList()._publicsuffix},
-    reverse=True,
-)
-TLD_REGEX = bleach.linkifier.build_url_re(
-    tlds=ALLOWED_TLDS, protocols=ALLOWED_PROTOCOLS
-)
-EMAIL_REGEX = bleach.linkifier.build_email_re(tlds=ALLOWED_TLDS)
+
+# Building the TLD list from the public suffix list and compiling the regexes and
+# cleaners derived from it is slow, so we only do it once we render markdown for
+# the first time, instead of in every process that happens to import this module.
+@cache
+def get_allowed_tlds():
+    # Sorting this list makes sure that shorter substring TLDs don't win against
+    # longer TLDs, e.g. matching '.com' before '.co'
+    return sorted(
+        {suffix.rsplit(".")[-1] for suffix in PublicSuffixList()._publicsuffix},
+        reverse=True,
+    )
+
+
+@cache
+def get_tld_regex():
+    return bleach.linkifier.build_url_re(
+        tlds=get_allowed_tlds(), protocols=ALLOWED_PROTOCOLS
+    )
+
+
+@cache
+def get_email_regex():
+    return bleach.linkifier.build_email_re(tlds=get_allowed_tlds())
 
 
 def link_callback(attrs, is_new, **kwargs):
@@ -100,45 +116,63 @@ def link_callback(attrs, is_new, **kwargs):
 abslink_callback = partial(link_callback, safelink=False)
 
 
-CLEANER = bleach.Cleaner(
-    tags=ALLOWED_TAGS,
-    attributes=ALLOWED_ATTRIBUTES,
-    protocols=ALLOWED_PROTOCOLS,
-    filters=[
-        partial(
-            bleach.linkifier.LinkifyFilter,
-            url_re=TLD_REGEX,
-            parse_email=True,
-            email_re=EMAIL_REGEX,
-            skip_tags={"pre", "code"},
-            callbacks=bleach.linkifier.DEFAULT_CALLBACKS + [safelink_callback],
-        )
-    ],
-)
-ABSLINK_CLEANER = bleach.Cleaner(
-    tags=ALLOWED_TAGS,
-    attributes=ALLOWED_ATTRIBUTES,
-    protocols=ALLOWED_PROTOCOLS,
-    filters=[
-        partial(
-            bleach.linkifier.LinkifyFilter,
-            url_re=TLD_REGEX,
-            parse_email=True,
-            email_re=EMAIL_REGEX,
-            skip_tags={"pre", "code"},
-            callbacks=bleach.linkifier.DEFAULT_CALLBACKS + [abslink_callback],
-        )
-    ],
-)
-NO_LINKS_CLEANER = bleach.Cleaner(
-    tags=copy(ALLOWED_TAGS)
-    - {
-        "a",
-    },
-    attributes=ALLOWED_ATTRIBUTES,
-    protocols=ALLOWED_PROTOCOLS,
-    strip=True,
-)
+def _build_link_cleaner(callback):
+    return bleach.Cleaner(
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        filters=[
+            partial(
+                bleach.linkifier.LinkifyFilter,
+                url_re=get_tld_regex(),
+                parse_email=True,
+                email_re=get_email_regex(),
+                skip_tags={"pre", "code"},
+                callbacks=bleach.linkifier.DEFAULT_CALLBACKS + [callback],
+            )
+        ],
+    )
+
+
+@cache
+def get_cleaner():
+    return _build_link_cleaner(safelink_callback)
+
+
+@cache
+def get_abslink_cleaner():
+    return _build_link_cleaner(abslink_callback)
+
+
+@cache
+def get_no_links_cleaner():
+    return bleach.Cleaner(
+        tags=copy(ALLOWED_TAGS)
+        - {
+            "a",
+        },
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True,
+    )
+
+
+_LAZY_ATTRIBUTES = {
+    "ALLOWED_TLDS": get_allowed_tlds,
+    "TLD_REGEX": get_tld_regex,
+    "EMAIL_REGEX": get_email_regex,
+    "CLEANER": get_cleaner,
+    "ABSLINK_CLEANER": get_abslink_cleaner,
+    "NO_LINKS_CLEANER": get_no_links_cleaner,
+}
+
+
+def __getattr__(name):
+    # Keep the old module-level constants importable for plugins, but build
+    # them on first access only.
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 STRIKETHROUGH_RE = "(~{2})(.+?)(~{2})"
@@ -166,10 +200,11 @@ def extendMarkdown(self, md):
 )
 
 
-def render_markdown(text: str, cleaner=CLEANER) -> str:
+def render_markdown(text: str, cleaner=None) -> str:
     """Process markdown and cleans HTML in a text input."""
     if not text:
         return ""
+    cleaner = cleaner or get_cleaner()
     body_md = cleaner.clean(md.reset().convert(str(text)))
     return mark_safe(body_md)
 
@@ -177,7 +212,7 @@ def render_markdown(text: str, cleaner=CLEANER) -> str:
 def render_markdown_abslinks(text: str) -> str:
     """Process markdown and cleans HTML in a text input, but use absolute links instead
     of safelink redirects."""
-    return render_markdown(text, cleaner=ABSLINK_CLEANER)
+    return render_markdown(text, cleaner=get_abslink_cleaner())
 
 
 @register.filter
@@ -188,7 +223,7 @@ def rich_text(text: str):
 @register.filter
 def rich_text_without_links(text: str):
     """Process markdown and cleans HTML in a text input, but without links."""
-    return render_markdown(text, cleaner=NO_LINKS_CLEANER)
+    return render_markdown(text, cleaner=get_no_links_cleaner())
 
 
 @register.filter
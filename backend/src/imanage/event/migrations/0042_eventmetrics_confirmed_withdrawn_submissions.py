@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2026-present Tobias Kunze
+# SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
+
+# Generated by Django 6.0 on 2026-10-19 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0041_announcement_securityalert_moderationlog_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventmetrics",
+            name="confirmed_submissions",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="eventmetrics",
+            name="withdrawn_submissions",
+            field=models.IntegerField(default=0),
+        ),
+    ]
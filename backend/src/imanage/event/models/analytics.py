@@ -8,7 +8,10 @@
 
 
 class EventMetrics(ImanageModel):
-    """Aggregated metrics for events, tracked over time."""
+    """Aggregated metrics for events, tracked over time.
+
+    There is one snapshot per event and day, which is refreshed periodically
+    by :func:`imanage.event.services.update_event_metrics`."""
 
     event = models.ForeignKey(
         to="Event",
@@ -22,6 +25,8 @@ class EventMetrics(ImanageModel):
     accepted_submissions = models.IntegerField(default=0)
     rejected_submissions = models.IntegerField(default=0)
     pending_submissions = models.IntegerField(default=0)
+    confirmed_submissions = models.IntegerField(default=0)
+    withdrawn_submissions = models.IntegerField(default=0)
     
     # Review metrics
     total_reviews = models.IntegerField(default=0)
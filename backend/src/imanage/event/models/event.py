@@ -5,6 +5,7 @@
 import datetime as dt
 import json
 import zoneinfo
+from itertools import batched
 
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
@@ -43,6 +44,8 @@
 SLUG_CHARS = "a-zA-Z0-9.-"
 SLUG_REGEX = rf"[a-zA-Z0-9]([{SLUG_CHARS}]*[a-zA-Z0-9])?"
 FULL_SLUG_REGEX = rf"^{SLUG_REGEX}$"
+# Number of files deleted per background task when an event is shredded
+SHRED_FILE_BATCH_SIZE = 500
 
 
 def validate_event_slug_permitted(value):
@@ -136,6 +139,70 @@ def default_mail_settings():
     }
 
 
+def clone_objects(objects, **attributes):
+    """Saves copies of ``objects`` with one bulk insert, after setting the
+    given ``attributes`` on them. Attribute values can be callables, which
+    receive the original object and return the value to set.
+
+    The objects are turned into their copies in place. Returns a dictionary
+    mapping the original primary keys to the copies."""
+    objects = list(objects)
+    if not objects:
+        return {}
+    result = {}
+    for obj in objects:
+        old_pk = obj.pk
+        for attribute, value in attributes.items():
+            setattr(obj, attribute, value(obj) if callable(value) else value)
+        obj.pk = None
+        obj._state.adding = True
+        result[old_pk] = obj
+    type(objects[0]).objects.bulk_create(objects)
+    return result
+
+
+def clone_relations(object_map, field_name, target_map):
+    """Copies the many-to-many relation ``field_name`` from the original
+    objects in ``object_map`` to their copies, as returned by
+    ``clone_objects``, pointing them at the copies in ``target_map``.
+    Uses one query on the through table and one bulk insert."""
+    if not object_map:
+        return
+    field = next(iter(object_map.values()))._meta.get_field(field_name)
+    through = field.remote_field.through
+    source = f"{field.m2m_field_name()}_id"
+    target = f"{field.m2m_reverse_field_name()}_id"
+    through.objects.bulk_create(
+        [
+            through(
+                **{source: object_map[source_id].pk, target: target_map[target_id].pk}
+            )
+            for source_id, target_id in through.objects.filter(
+                **{f"{source}__in": object_map}
+            ).values_list(source, target)
+            if target_id in target_map
+        ]
+    )
+
+
+def get_file_names(queryset):
+    """Returns the names of all files stored in the file fields of the
+    objects in ``queryset``, without loading the objects."""
+    fields = [
+        field.attname
+        for field in queryset.model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+    if not fields:
+        return []
+    return [
+        name
+        for values in queryset.order_by().values_list(*fields).iterator()
+        for name in values
+        if name
+    ]
+
+
 @hierarkey.add()
 class Event(ImanageModel):
     """The Event class has direct or indirect relations to all other models.
@@ -677,126 +744,84 @@ def copy_data_from(self, other_event, skip_attributes=None):
             setattr(self, attribute, getattr(other_event, attribute))
         self.save()
 
-        for extra_link in other_event.extra_links.all():
-            extra_link.pk = None
-            extra_link.event = self
-            extra_link.save()
+        clone_objects(other_event.extra_links.all(), event=self)
 
         self.mail_templates.all().delete()
-        for template in other_event.mail_templates.all().filter(is_auto_created=False):
-            template.pk = None
-            template.event = self
-            template.save()
+        clone_objects(
+            other_event.mail_templates.all().filter(is_auto_created=False), event=self
+        )
 
         self.submission_types.exclude(pk=self.cfp.default_type_id).delete()
-        submission_type_map = {}
-        for submission_type in other_event.submission_types.all():
-            submission_type_map[submission_type.pk] = submission_type
-            is_default = submission_type == other_event.cfp.default_type
-            submission_type.pk = None
-            submission_type.event = self
-            submission_type.save()
-            if is_default:
-                old_default = self.cfp.default_type
-                self.cfp.default_type = submission_type
-                self.cfp.save()
-                old_default.delete(skip_log=True)
-
-        track_map = {}
-        for track in other_event.tracks.all():
-            track_map[track.pk] = track
-            track.pk = None
-            track.event = self
-            track.save()
+        submission_type_map = clone_objects(
+            other_event.submission_types.all(), event=self
+        )
+        if new_default := submission_type_map.get(other_event.cfp.default_type_id):
+            old_default = self.cfp.default_type
+            self.cfp.default_type = new_default
+            self.cfp.save()
+            old_default.delete(skip_log=True)
+
+        track_map = clone_objects(other_event.tracks.all(), event=self)
 
         if not self.rooms.exists():
-            for room in other_event.rooms.all():
-                availabilities = list(room.availabilities.all())
-                room.pk = None
-                room.event = self
-                room.save()
-                for availability in availabilities:
-                    availability.pk = None
-                    availability.room = room
-                    availability.event = self
-                    availability.start += delta
-                    availability.end += delta
-                    availability.save()
-
-        question_map = {}
-        for question in other_event.questions.all():
-            question_map[question.pk] = question
-            options = list(question.options.all())
-            tracks = list(question.tracks.all().values_list("pk", flat=True))
-            types = list(question.submission_types.all().values_list("pk", flat=True))
-            question.pk = None
-            question.event = self
-            question.save()
-            question.tracks.set([])
-            question.submission_types.set([])
-            for option in options:
-                option.pk = None
-                option.question = question
-                option.save()
-            for track in tracks:
-                question.tracks.add(track_map.get(track))
-            for stype in types:
-                question.submission_types.add(submission_type_map.get(stype))
-
-        information_map = {}
-        for information in other_event.information.all():
-            information_map[information.pk] = information
-            tracks = information.limit_tracks.all().values_list("pk", flat=True)
-            types = information.limit_types.all().values_list("pk", flat=True)
-            information.pk = None
-            information.event = self
-            information.save()
-            information.limit_tracks.set([])
-            information.limit_types.set([])
-            for track in tracks:
-                information.limit_tracks.add(track_map.get(track))
-            for stype in types:
-                information.limit_types.add(submission_type_map.get(stype))
+            from imanage.schedule.models import Availability
+
+            room_map = clone_objects(other_event.rooms.all(), event=self)
+            availabilities = list(Availability.objects.filter(room_id__in=room_map))
+            for availability in availabilities:
+                availability.start += delta
+                availability.end += delta
+            clone_objects(
+                availabilities,
+                event=self,
+                room=lambda availability: room_map[availability.room_id],
+            )
+
+        from imanage.submission.models import AnswerOption, ReviewScore
+
+        question_map = clone_objects(other_event.questions.all(), event=self)
+        clone_objects(
+            AnswerOption.objects.filter(question_id__in=question_map),
+            question=lambda option: question_map[option.question_id],
+        )
+        clone_relations(question_map, "tracks", track_map)
+        clone_relations(question_map, "submission_types", submission_type_map)
+
+        information_map = clone_objects(other_event.information.all(), event=self)
+        clone_relations(information_map, "limit_tracks", track_map)
+        clone_relations(information_map, "limit_types", submission_type_map)
 
         self.review_phases.all().delete()
-        for review_phase in other_event.review_phases.all():
-            review_phase.pk = None
-            review_phase.event = self
+        review_phases = list(other_event.review_phases.all())
+        for review_phase in review_phases:
             review_phase.is_active = False
             if review_phase.start:
                 review_phase.start += delta
             if review_phase.end:
                 review_phase.end += delta
-            review_phase.save()
+        clone_objects(review_phases, event=self)
 
         self.score_categories.all().delete()
-        for score_category in other_event.score_categories.all():
-            scores = list(score_category.scores.all())
-            tracks = list(score_category.limit_tracks.all())
-            score_category.pk = None
-            score_category.event = self
-            score_category.save()
-            score_category.limit_tracks.set([])
-            for track in tracks:
-                if track in track_map:
-                    score_category.limit_tracks.add(track_map.get(track))
-            for score in scores:
-                score.pk = None
-                score.category = score_category
-                score.save()
-
-        for sett in other_event.settings._objects.all():
-            if sett.value.startswith("file://"):
-                continue
-            sett.object = self
-            sett.pk = None
-            sett.save()
+        score_category_map = clone_objects(
+            other_event.score_categories.all(), event=self
+        )
+        clone_objects(
+            ReviewScore.objects.filter(category_id__in=score_category_map),
+            category=lambda score: score_category_map[score.category_id],
+        )
+        clone_relations(score_category_map, "limit_tracks", track_map)
+
+        clone_objects(
+            [
+                sett
+                for sett in other_event.settings._objects.all()
+                if not sett.value.startswith("file://")
+            ],
+            object=self,
+        )
         self.settings.flush()
 
-        for user_prefs in other_event.user_preferences.all():
-            user_prefs.pk = None
-            user_prefs.event = self
-            user_prefs.save()
+        clone_objects(other_event.user_preferences.all(), event=self)
 
         self.cfp.copy_data_from(other_event.cfp, skip_attributes=skip_attributes)
         event_copy_data.send(
@@ -1084,8 +1109,9 @@ def release_schedule(
         :param notify_speakers: Generate emails for all speakers with changed slots.
         :param comment: Public comment for the release
         :type user: :class:`~imanage.person.models.user.User`
+        :returns: The released and the new WIP schedule.
         """
-        self.wip_schedule.freeze(
+        return self.wip_schedule.freeze(
             name=name, user=user, notify_speakers=notify_speakers, comment=comment
         )
 
@@ -1187,11 +1213,17 @@ def has_unreleased_schedule_changes(self) -> bool:
         return has_unreleased_schedule_changes(self)
 
     @transaction.atomic
-    def shred(self, person=None, send_notifications=True):
+    def shred(self, person=None, send_notifications=True, progress=None):
         """Irrevocably deletes an event and all related data.
-        
+
+        Related data is deleted with one queryset delete per model. Uploaded
+        files are deleted in batches in the background, once the deletion has
+        been committed.
+
         :param person: The person performing the deletion
         :param send_notifications: Whether to send cancellation notifications to participants
+        :param progress: Optional callable, called with the number of
+            finished and total deletion steps.
         """
         from imanage.common.models import ActivityLog
         from imanage.person.models import SpeakerProfile
@@ -1199,6 +1231,7 @@ def shred(self, person=None, send_notifications=True):
         from imanage.submission.models import (
             Answer,
             AnswerOption,
+            CfP,
             Feedback,
             Question,
             Resource,
@@ -1228,7 +1261,7 @@ def shred(self, person=None, send_notifications=True):
             (self.logged_actions(), False),
             (self.mail_templates.all(), False),
             (self.queued_mails.all(), False),
-            (self.cfp, False),
+            (CfP.objects.filter(event=self), False),
             (self.mail_templates.all(), False),
             (self.information.all(), True),
             (TalkSlot.objects.filter(schedule__event=self), False),
@@ -1245,18 +1278,27 @@ def shred(self, person=None, send_notifications=True):
             (SpeakerProfile.objects.filter(event=self), False),
             (self.rooms.all(), False),
             (ActivityLog.objects.filter(event=self), False),
-            (self, False),
+            (Event.objects.filter(pk=self.pk), True),
         ]
 
-        for entry, detail in deletion_order:
-            if detail:
-                for obj in entry:
-                    if isinstance(obj, Submission):
-                        obj.delete(force=True)
-                    else:
-                        obj.delete()
-            else:
-                entry.delete()
+        file_names = []
+        for index, (queryset, with_files) in enumerate(deletion_order):
+            if with_files:
+                file_names += get_file_names(queryset)
+            queryset.delete()
+            if progress:
+                progress(index + 1, len(deletion_order))
+
+        if file_names:
+            from imanage.event.services import task_delete_files
+
+            def delete_files():
+                for batch in batched(file_names, SHRED_FILE_BATCH_SIZE):
+                    task_delete_files.apply_async(
+                        kwargs={"names": list(batch)}, ignore_result=True
+                    )
+
+            transaction.on_commit(delete_files)
 
     shred.alters_data = True
 
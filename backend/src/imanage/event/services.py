@@ -2,15 +2,23 @@
 # SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
 
 import datetime as dt
+from contextlib import suppress
 
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q
 from django.dispatch import receiver
 from django.utils.timezone import now
 from django_scopes import scope, scopes_disabled
 
 from imanage.celery_app import app
 from imanage.common.models.file import CachedFile
-from imanage.common.signals import periodic_task
-from imanage.event.models import Event
+from imanage.common.signals import minimum_interval, periodic_task
+from imanage.event.models import AttendeeMetrics, Event, EventMetrics
+from imanage.submission.models import Review, Submission, SubmissionStates
+
+# How often the EventMetrics snapshots of running events are refreshed
+METRICS_INTERVAL_MINUTES = 15
 
 
 @app.task(name="imanage.event.periodic_event_services")
@@ -70,3 +78,205 @@ def periodic_event_services(sender, **kwargs):
 def clean_cached_files(sender, **kwargs):
     for cf in CachedFile.objects.filter(expires__lt=now()):
         cf.delete()
+
+
+@receiver(signal=periodic_task)
+@minimum_interval(minutes_after_success=60)
+def clean_cfp_uploads(sender, **kwargs):
+    """CfP uploads are tracked as cached files and cleaned up with them. This
+    removes the untracked uploads that older versions left behind, and links
+    to cached files left behind by interrupted submissions."""
+    from imanage.cfp.flow import TEMPORARY_UPLOAD_EXPIRY, FormFlowStep
+
+    storage = FormFlowStep.file_storage
+    cutoff = now() - TEMPORARY_UPLOAD_EXPIRY
+    try:
+        __, filenames = storage.listdir("")
+    except FileNotFoundError:
+        return
+    for filename in filenames:
+        with suppress(FileNotFoundError):
+            if storage.get_modified_time(filename) < cutoff:
+                storage.delete(filename)
+
+
+def _shred_progress_key(event_id):
+    return f"event_{event_id}_shred_progress"
+
+
+def set_shred_progress(event_id, done, total, failed=False):
+    """Records how many steps of deleting an event are done. ``total`` is
+    ``None`` while the deletion has not started yet."""
+    cache.set(
+        _shred_progress_key(event_id),
+        {"done": done, "total": total, "failed": failed},
+        24 * 60 * 60,
+    )
+
+
+def get_shred_progress(event_ids) -> dict:
+    """Returns a dictionary of event IDs to their deletion progress, as set
+    by ``set_shred_progress``, for all given events that are being deleted."""
+    keys = {_shred_progress_key(event_id): event_id for event_id in event_ids}
+    return {keys[key]: value for key, value in cache.get_many(keys).items()}
+
+
+@app.task(name="imanage.event.shred")
+def task_shred_event(*, event_id: int, person_id: int = None):
+    from imanage.person.models import User
+
+    with scopes_disabled():
+        event = Event.objects.filter(pk=event_id).first()
+        person = User.objects.filter(pk=person_id).first() if person_id else None
+    if not event:
+        cache.delete(_shred_progress_key(event_id))
+        return
+
+    with scope(event=event):
+        try:
+            event.shred(
+                person=person,
+                progress=lambda done, total: set_shred_progress(
+                    event_id, done=done, total=total
+                ),
+            )
+        except Exception:
+            set_shred_progress(event_id, done=0, total=None, failed=True)
+            raise
+    cache.delete(_shred_progress_key(event_id))
+
+
+@app.task(name="imanage.event.delete_files")
+def task_delete_files(*, names: list):
+    """Deletes files of deleted objects from the default storage."""
+    for name in names:
+        with suppress(Exception):
+            default_storage.delete(name)
+
+
+def get_submission_state_counts(event, since=None) -> dict:
+    """Returns the number of submissions per state in a single grouped
+    query. With ``since``, only submissions created after that are counted."""
+    submissions = Submission.objects.filter(event=event)
+    if since:
+        submissions = submissions.filter(created__gt=since)
+    return dict(
+        submissions.order_by().values_list("state").annotate(count=Count("id"))
+    )
+
+
+def get_review_stats(event, since=None) -> dict:
+    """Returns the review count, average score and average turnaround in a
+    single query. Reviews that were never changed don't count towards the
+    turnaround. With ``since``, only reviews created after that are counted."""
+    reviews = Review.objects.filter(submission__event=event)
+    if since:
+        reviews = reviews.filter(created__gt=since)
+    return reviews.aggregate(
+        total=Count("id"),
+        avg_score=Avg("score"),
+        avg_turnaround=Avg(
+            ExpressionWrapper(
+                F("updated") - F("created"), output_field=DurationField()
+            ),
+            filter=Q(updated__gt=F("created")),
+        ),
+    )
+
+
+def get_attendee_stats(event) -> dict:
+    return AttendeeMetrics.objects.filter(event=event).aggregate(
+        total=Count("id"),
+        checked_in=Count("id", filter=Q(checked_in=True)),
+        active=Count("id", filter=Q(last_active__gte=now() - dt.timedelta(days=7))),
+    )
+
+
+def update_attendee_metrics(event):
+    """Refreshes the submission and review counts of all attendees of an
+    event with one grouped query each."""
+    attendees = list(AttendeeMetrics.objects.filter(event=event))
+    if not attendees:
+        return
+    user_ids = [attendee.user_id for attendee in attendees]
+    papers = dict(
+        Submission.objects.filter(event=event, speakers__in=user_ids)
+        .order_by()
+        .values_list("speakers")
+        .annotate(count=Count("id"))
+    )
+    reviews = dict(
+        Review.objects.filter(submission__event=event, user_id__in=user_ids)
+        .order_by()
+        .values_list("user_id")
+        .annotate(count=Count("id"))
+    )
+    changed = []
+    for attendee in attendees:
+        papers_submitted = papers.get(attendee.user_id, 0)
+        reviews_completed = reviews.get(attendee.user_id, 0)
+        if (attendee.papers_submitted, attendee.reviews_completed) != (
+            papers_submitted,
+            reviews_completed,
+        ):
+            attendee.papers_submitted = papers_submitted
+            attendee.reviews_completed = reviews_completed
+            changed.append(attendee)
+    AttendeeMetrics.objects.bulk_update(
+        changed, ["papers_submitted", "reviews_completed"], batch_size=500
+    )
+
+
+def update_event_metrics(event):
+    """Stores today's snapshot of an event's submission, review and attendee
+    numbers, and refreshes the per-attendee counts."""
+    counts = get_submission_state_counts(event)
+    reviews = get_review_stats(event)
+    attendees = get_attendee_stats(event)
+    turnaround = reviews["avg_turnaround"]
+    # EventMetrics.date is set with date.today(), so we look it up the same way
+    metrics, _ = EventMetrics.objects.update_or_create(
+        event=event,
+        date=dt.date.today(),
+        defaults={
+            "total_submissions": sum(counts.values()),
+            "accepted_submissions": counts.get(SubmissionStates.ACCEPTED, 0),
+            "rejected_submissions": counts.get(SubmissionStates.REJECTED, 0),
+            "pending_submissions": counts.get(SubmissionStates.SUBMITTED, 0),
+            "confirmed_submissions": counts.get(SubmissionStates.CONFIRMED, 0),
+            "withdrawn_submissions": counts.get(SubmissionStates.WITHDRAWN, 0),
+            "total_reviews": reviews["total"],
+            "avg_review_score": (
+                float(reviews["avg_score"])
+                if reviews["avg_score"] is not None
+                else None
+            ),
+            "avg_review_turnaround_days": (
+                turnaround.total_seconds() / 86400 if turnaround else None
+            ),
+            "registered_attendees": attendees["total"],
+            "active_attendees": attendees["active"],
+        },
+    )
+    update_attendee_metrics(event)
+    return metrics
+
+
+@app.task(name="imanage.event.update_event_metrics")
+def task_update_event_metrics(event_slug):
+    with scopes_disabled():
+        event = Event.objects.filter(slug=event_slug).first()
+    if not event:
+        return
+    with scope(event=event):
+        update_event_metrics(event)
+
+
+@receiver(signal=periodic_task)
+@minimum_interval(
+    minutes_after_success=METRICS_INTERVAL_MINUTES, minutes_after_error=5
+)
+def periodic_event_metrics(sender, **kwargs):
+    cutoff = now() - dt.timedelta(days=3)
+    for event in Event.objects.filter(date_to__gte=cutoff.date()):
+        task_update_event_metrics.apply_async(args=(event.slug,), ignore_result=True)
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
 
 import json
-from collections import defaultdict
+from collections import Counter, defaultdict
 from contextlib import suppress
 
 from django import forms
@@ -14,10 +14,12 @@
 
 from imanage.common.forms.mixins import ReadOnlyFlag
 from imanage.common.forms.renderers import InlineFormRenderer, TabularFormRenderer
-from imanage.common.forms.widgets import EnhancedSelectMultiple
+from imanage.common.forms.widgets import (
+    EnhancedSelectMultiple,
+    LazyEnhancedSelectMultiple,
+)
 from imanage.common.text.phrases import phrases
 from imanage.orga.forms.export import ExportForm
-from imanage.person.models import User
 from imanage.submission.models import (
     QuestionTarget,
     Review,
@@ -26,6 +28,7 @@
     Tag,
 )
 from imanage.submission.rules import questions_for_user
+from imanage.submission.services import update_review_assignments
 
 
 class TagsForm(ReadOnlyFlag, forms.ModelForm):
@@ -78,11 +81,9 @@ def __init__(
         if self.event.review_settings["text_mandatory"]:
             self.fields["text"].widget.attrs["class"] = "hide-optional"
 
+        # Uses prefetched scores where available, e.g. in the bulk review view
         self.scores = (
-            {
-                score.category: score.id
-                for score in self.instance.scores.all().select_related("category")
-            }
+            {score.category_id: score.id for score in self.instance.scores.all()}
             if self.instance.id
             else {}
         )
@@ -90,7 +91,7 @@ def __init__(
             self.fields[f"score_{category.id}"] = self.build_score_field(
                 category,
                 read_only=kwargs.get("read_only", False),
-                initial=self.scores.get(category),
+                initial=self.scores.get(category.id),
                 hide_optional=self.event.review_settings["score_mandatory"],
             )
         self.fields["text"].widget.attrs["rows"] = 2
@@ -168,6 +169,20 @@ def clean(self):
 
         return cleaned_data
 
+    def get_scores(self):
+        """Returns the chosen ``ReviewScore`` objects, taken from the
+        categories' (prefetched) scores rather than from the database."""
+        result = []
+        for category in self.categories:
+            score_id = self.cleaned_data.get(f"score_{category.id}")
+            if score_id:
+                result += [
+                    score
+                    for score in category.scores.all()
+                    if str(score.id) == str(score_id)
+                ]
+        return result
+
     def save(self, *args, **kwargs):
         self.instance.submission = self.submission
         self.instance.user = self.user
@@ -202,19 +217,16 @@ class DirectionForm(forms.Form):
 
 
 class ReviewAssignmentForm(forms.Form):
-    def __init__(self, *args, event=None, review_mapping=None, **kwargs):
+    """Shows one row per submission or reviewer in ``rows`` (usually one page
+    of them). Choice lists are rendered once in ``choice_lists`` instead of
+    once per row, and saving only writes the assignments that changed."""
+
+    def __init__(self, *args, event=None, review_mapping=None, rows=None, **kwargs):
         self.event = event
         self.review_mapping = review_mapping or {}
-        self.reviewers = (
-            User.objects.filter(teams__in=self.event.teams.filter(is_reviewer=True))
-            .order_by("name")
-            .distinct()
-        ).prefetch_related("assigned_reviews", "teams", "teams__limit_tracks")
-        self.submissions = (
-            self.event.submissions.order_by("title")
-            .select_related("track")
-            .prefetch_related("assigned_reviewers")
-        )
+        self.rows = rows or []
+        self.reviewers = self.event.reviewers.order_by("name")
+        self.submissions = self.event.submissions.order_by("title")
         self.reviewers_by_track = defaultdict(set)
         for team in self.event.teams.filter(is_reviewer=True).prefetch_related(
             "members", "limit_tracks"
@@ -224,8 +236,32 @@ def __init__(self, *args, event=None, review_mapping=None, **kwargs):
                     self.reviewers_by_track[track].update(team.members.all())
             else:
                 self.reviewers_by_track[None].update(team.members.all())
+        self.choice_lists = {}
         super().__init__(*args, **kwargs)
 
+    def build_field(self, label, choices_id, choices, initial):
+        self.choice_lists[choices_id] = choices
+        return forms.MultipleChoiceField(
+            choices=choices,
+            widget=LazyEnhancedSelectMultiple(choices_id=choices_id),
+            initial=initial,
+            label=label,
+            required=False,
+        )
+
+    def save_assignments(self, mapping_key, get_pair):
+        """Compares the submitted assignments of every row with the current
+        ones from ``review_mapping`` and writes only the difference.
+        ``get_pair(row, pk)`` returns a ``(submission_id, user_id)`` tuple."""
+        current_assignments = self.review_mapping[mapping_key]
+        added, removed = set(), set()
+        for row in self.rows:
+            current = set(current_assignments.get(row.id, []))
+            new = {int(pk) for pk in self.cleaned_data[row.code]}
+            added.update(get_pair(row, pk) for pk in new - current)
+            removed.update(get_pair(row, pk) for pk in current - new)
+        update_review_assignments(added=added, removed=removed)
+
     class Media:
         js = [forms.Script("orga/js/forms/assignment.js", defer="")]
 
@@ -234,17 +270,16 @@ class ReviewerForProposalForm(ReviewAssignmentForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._review_choices_by_track = {}
-        for submission in self.submissions:
+        for submission in self.rows:
             initial_assignments = self.review_mapping[
                 "submission_to_assigned_reviewers"
             ].get(submission.id, [])
 
-            self.fields[submission.code] = forms.MultipleChoiceField(
+            self.fields[submission.code] = self.build_field(
+                label=submission.title,
+                choices_id=f"track-{submission.track_id or 'all'}",
                 choices=self.get_review_choices_by_track(submission.track),
-                widget=EnhancedSelectMultiple,
                 initial=initial_assignments,
-                label=submission.title,
-                required=False,
             )
 
     def get_review_choices_by_track(self, track):
@@ -260,24 +295,25 @@ def get_review_choices_by_track(self, track):
         return result
 
     def save(self, *args, **kwargs):
-        for submission in self.submissions:
-            submission.assigned_reviewers.set(self.cleaned_data[submission.code])
+        self.save_assignments(
+            "submission_to_assigned_reviewers",
+            lambda submission, user_id: (submission.id, user_id),
+        )
 
 
 class ProposalForReviewerForm(ReviewAssignmentForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        submissions = self.submissions.values_list("id", "title", "track_id")
         self.submissions_by_track = defaultdict(set)
-        for submission in self.submissions:
-            self.submissions_by_track[submission.track_id].add(
-                (submission.id, submission.title)
-            )
+        for submission_id, title, track_id in submissions:
+            self.submissions_by_track[track_id].add((submission_id, title))
         self._submission_choices_by_track = {}
         self.all_submission_choices = sorted(
-            [(submission.id, submission.title) for submission in self.submissions],
+            [(submission_id, title) for submission_id, title, __ in submissions],
             key=lambda s: (s[1] or "").lower(),
         )
-        for reviewer in self.reviewers:
+        for reviewer in self.rows:
             track_limit = []
             if reviewer not in self.reviewers_by_track[None]:
                 for track, reviewers in self.reviewers_by_track.items():
@@ -287,12 +323,12 @@ def __init__(self, *args, **kwargs):
                 "reviewer_to_assigned_submissions"
             ].get(reviewer.id, [])
 
-            self.fields[reviewer.code] = forms.MultipleChoiceField(
+            self.fields[reviewer.code] = self.build_field(
+                label=reviewer.name,
+                choices_id="tracks-"
+                + ("-".join(str(t) for t in sorted(track_limit)) or "all"),
                 choices=self.get_submission_choices_by_tracks(track_limit),
-                widget=EnhancedSelectMultiple,
                 initial=initial_assignments,
-                label=reviewer.name,
-                required=False,
             )
 
     def get_submission_choices_by_tracks(self, track_limit):
@@ -304,11 +340,115 @@ def get_submission_choices_by_tracks(self, track_limit):
         submissions = set()
         for track in track_limit:
             submissions.update(self.submissions_by_track[track])
-        return sorted(submissions, key=lambda submission: (submission[1] or "").lower())
+        result = sorted(
+            submissions, key=lambda submission: (submission[1] or "").lower()
+        )
+        self._submission_choices_by_track[cache_key] = result
+        return result
+
+    def save(self, *args, **kwargs):
+        self.save_assignments(
+            "reviewer_to_assigned_submissions",
+            lambda reviewer, submission_id: (submission_id, reviewer.id),
+        )
+
+
+class ReviewAutoAssignForm(ReviewAssignmentForm):
+    """Assigns reviewers to all submitted proposals in one pass, so that
+    every proposal gets ``reviewers_per_submission`` reviewers and the
+    assignments are spread evenly across reviewers. Reviewers are only
+    assigned to proposals in the tracks their teams are limited to, and
+    never to their own proposals. Existing assignments and reviews count
+    towards both the proposal's reviewers and the reviewer's load."""
+
+    default_renderer = TabularFormRenderer
+
+    reviewers_per_submission = forms.IntegerField(
+        label=_("Reviewers per proposal"),
+        min_value=1,
+        initial=3,
+    )
+    max_assignments = forms.IntegerField(
+        label=_("Maximum proposals per reviewer"),
+        help_text=_("Leave empty to spread the proposals evenly without a limit."),
+        min_value=1,
+        required=False,
+    )
+
+    def get_assignments(self):
+        """Returns the ``(submission_id, user_id)`` pairs to assign, and the
+        number of proposals that could not get enough reviewers."""
+        target = self.cleaned_data["reviewers_per_submission"]
+        max_load = self.cleaned_data.get("max_assignments")
+        assigned = self.review_mapping["submission_to_assigned_reviewers"]
+        reviewed = self.review_mapping["submission_to_reviewers"]
+        # A reviewer's load are the proposals they are assigned to or have
+        # reviewed, counting each proposal once.
+        reviewer_submissions = defaultdict(set)
+        for key in ("reviewer_to_assigned_submissions", "reviewer_to_submissions"):
+            for user_id, submission_ids in self.review_mapping[key].items():
+                reviewer_submissions[user_id].update(submission_ids)
+        load = Counter(
+            {
+                user_id: len(submission_ids)
+                for user_id, submission_ids in reviewer_submissions.items()
+            }
+        )
+        reviewers_by_track_id = {
+            getattr(track, "id", None): {reviewer.id for reviewer in reviewers}
+            for track, reviewers in self.reviewers_by_track.items()
+        }
+        all_tracks = reviewers_by_track_id.get(None, set())
+        speakers = defaultdict(set)
+        for submission_id, user_id in Submission.speakers.through.objects.filter(
+            submission__event=self.event
+        ).values_list("submission_id", "user_id"):
+            speakers[submission_id].add(user_id)
+
+        candidates = {}
+        missing = {}
+        for submission_id, track_id in self.submissions.filter(
+            state=SubmissionStates.SUBMITTED
+        ).values_list("id", "track_id"):
+            covered = set(assigned.get(submission_id, [])) | set(
+                reviewed.get(submission_id, [])
+            )
+            if len(covered) >= target:
+                continue
+            missing[submission_id] = target - len(covered)
+            candidates[submission_id] = (
+                reviewers_by_track_id.get(track_id, set()) | all_tracks
+            ) - (speakers[submission_id] | covered)
+
+        result = set()
+        incomplete = 0
+        # Proposals with the fewest possible reviewers go first, so that
+        # the reviewers they depend on still have capacity left.
+        for submission_id in sorted(
+            candidates, key=lambda pk: (len(candidates[pk]), pk)
+        ):
+            reviewers = sorted(
+                (
+                    user_id
+                    for user_id in candidates[submission_id]
+                    if not max_load or load[user_id] < max_load
+                ),
+                key=lambda user_id: (load[user_id], user_id),
+            )[: missing[submission_id]]
+            if len(reviewers) < missing[submission_id]:
+                incomplete += 1
+            for user_id in reviewers:
+                load[user_id] += 1
+                result.add((submission_id, user_id))
+        return result, incomplete
 
     def save(self, *args, **kwargs):
-        for reviewer in self.reviewers:
-            reviewer.assigned_reviews.set(self.cleaned_data[reviewer.code])
+        assignments, incomplete = self.get_assignments()
+        update_review_assignments(added=assignments)
+        return len(assignments), incomplete
+
+    class Media:
+        extend = False
 
 
 class ReviewExportForm(ExportForm):
@@ -503,6 +503,11 @@
                     review.ReviewAssignmentImport.as_view(),
                     name="reviews.assign.import",
                 ),
+                path(
+                    "reviews/assign/auto",
+                    review.ReviewAssignmentAuto.as_view(),
+                    name="reviews.assign.auto",
+                ),
                 path(
                     "reviews/assign/",
                     review.ReviewAssignment.as_view(),
@@ -608,6 +613,16 @@
                     schedule.TalkList.as_view(),
                     name="schedule.api.talks",
                 ),
+                path(
+                    "schedule/api/talks/batch/",
+                    schedule.TalkBatchUpdate.as_view(),
+                    name="schedule.api.batch",
+                ),
+                path(
+                    "schedule/api/changes/",
+                    schedule.ScheduleChanges.as_view(),
+                    name="schedule.api.changes",
+                ),
                 path(
                     "schedule/api/availabilities/",
                     schedule.ScheduleAvailabilities.as_view(),
@@ -1,133 +1,184 @@
 # SPDX-FileCopyrightText: 2025-present Tobias Kunze
 # SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
 
-from datetime import timedelta
-
-from django.db.models import Avg, Count, Q
-from django.utils.timezone import now
+from django.db.models import Count, DurationField, ExpressionWrapper, F
+from django.db.models.functions import TruncDate
+from django.utils.functional import cached_property
 from django.views.generic import TemplateView
 from django_context_decorator import context
 
 from imanage.common.views.mixins import EventPermissionRequired, PermissionRequired
 from imanage.event.models import AttendeeMetrics, EventMetrics
-from imanage.submission.models import Review, Submission
+from imanage.event.services import (
+    get_attendee_stats,
+    get_review_stats,
+    get_submission_state_counts,
+)
+from imanage.submission.models import Review, Submission, SubmissionStates
 
 
 class AnalyticsDashboardView(EventPermissionRequired, PermissionRequired, TemplateView):
     """Analytics dashboard showing event metrics and visualizations."""
 
     template_name = "orga/analytics/dashboard.html"
-    permission_required = "orga.view_orga_area"
+    permission_required = "event.orga_access_event"
+
+    @cached_property
+    def snapshot(self):
+        """The latest metrics snapshot, which is refreshed periodically.
+        New events may not have one yet."""
+        return (
+            EventMetrics.objects.filter(event=self.request.event)
+            .order_by("-date", "-updated")
+            .first()
+        )
+
+    @cached_property
+    def submission_counts(self):
+        """The number of submissions in total and per state. With a snapshot,
+        we only count the submissions created since in the database. State
+        changes since the snapshot show up with the next snapshot."""
+        event = self.request.event
+        if not (snapshot := self.snapshot):
+            counts = get_submission_state_counts(event)
+            return {"total": sum(counts.values()), **counts}
+        new = get_submission_state_counts(event, since=snapshot.updated)
+        counts = {
+            "total": snapshot.total_submissions + sum(new.values()),
+            SubmissionStates.ACCEPTED: snapshot.accepted_submissions,
+            SubmissionStates.REJECTED: snapshot.rejected_submissions,
+            SubmissionStates.SUBMITTED: snapshot.pending_submissions,
+            SubmissionStates.CONFIRMED: snapshot.confirmed_submissions,
+            SubmissionStates.WITHDRAWN: snapshot.withdrawn_submissions,
+        }
+        for state, count in new.items():
+            counts[state] = counts.get(state, 0) + count
+        return counts
+
+    @cached_property
+    def review_stats(self):
+        """Review count, average score and average turnaround in days. With a
+        snapshot, only reviews created since are loaded from the database."""
+        event = self.request.event
+        if not (snapshot := self.snapshot):
+            stats = get_review_stats(event)
+            turnaround = stats["avg_turnaround"]
+            return {
+                "total": stats["total"],
+                "avg_score": stats["avg_score"] or 0,
+                "avg_turnaround_days": (
+                    turnaround.total_seconds() / 86400 if turnaround else 0
+                ),
+            }
+        new = get_review_stats(event, since=snapshot.updated)
+        total = snapshot.total_reviews + new["total"]
+        score_sum = (snapshot.avg_review_score or 0) * snapshot.total_reviews + float(
+            new["avg_score"] or 0
+        ) * new["total"]
+        return {
+            "total": total,
+            "avg_score": score_sum / total if total else 0,
+            # New reviews have rarely been changed yet, so we use the snapshot
+            "avg_turnaround_days": snapshot.avg_review_turnaround_days or 0,
+        }
 
     @context
     def metrics_data(self):
         """Get current metrics for the event."""
-        # Get the latest metrics or calculate current ones
-        latest_metric = EventMetrics.objects.filter(event=self.request.event).first()
-        
-        # Calculate current statistics
-        submissions = Submission.objects.filter(event=self.request.event)
-        total = submissions.count()
-        accepted = submissions.filter(state='accepted').count()
-        rejected = submissions.filter(state='rejected').count()
-        pending = submissions.filter(state='submitted').count()
-        
-        reviews = Review.objects.filter(submission__event=self.request.event)
-        avg_score = reviews.aggregate(Avg('score'))['score__avg'] or 0
-        
-        attendees = AttendeeMetrics.objects.filter(event=self.request.event)
-        
+        counts = self.submission_counts
+        total = counts["total"]
+        accepted = counts.get(SubmissionStates.ACCEPTED, 0)
+        if snapshot := self.snapshot:
+            attendees = {
+                "total": snapshot.registered_attendees,
+                "active": snapshot.active_attendees,
+            }
+        else:
+            attendees = get_attendee_stats(self.request.event)
+
         return {
-            'total_submissions': total,
-            'accepted_submissions': accepted,
-            'rejected_submissions': rejected,
-            'pending_submissions': pending,
-            'acceptance_rate': (accepted / total * 100) if total > 0 else 0,
-            'total_reviews': reviews.count(),
-            'avg_review_score': round(avg_score, 2),
-            'registered_attendees': attendees.count(),
-            'active_attendees': attendees.filter(last_active__gte=now() - timedelta(days=7)).count(),
+            "total_submissions": total,
+            "accepted_submissions": accepted,
+            "rejected_submissions": counts.get(SubmissionStates.REJECTED, 0),
+            "pending_submissions": counts.get(SubmissionStates.SUBMITTED, 0),
+            "acceptance_rate": (accepted / total * 100) if total > 0 else 0,
+            "total_reviews": self.review_stats["total"],
+            "avg_review_score": round(self.review_stats["avg_score"], 2),
+            "registered_attendees": attendees["total"],
+            "active_attendees": attendees["active"],
+            "updated": snapshot.updated if snapshot else None,
         }
 
     @context
     def submission_timeline_data(self):
         """Get submission timeline data for chart."""
-        from django.db.models.functions import TruncDate
-        
-        submissions = Submission.objects.filter(
-            event=self.request.event
-        ).annotate(
-            date=TruncDate('created')
-        ).values('date').annotate(
-            count=Count('id')
-        ).order_by('date')
-        
+        submissions = (
+            Submission.objects.filter(event=self.request.event)
+            .annotate(date=TruncDate("created"))
+            .values("date")
+            .annotate(count=Count("id"))
+            .order_by("date")
+        )
+
         return {
-            'labels': [str(item['date']) for item in submissions],
-            'data': [item['count'] for item in submissions],
+            "labels": [str(item["date"]) for item in submissions],
+            "data": [item["count"] for item in submissions],
         }
 
     @context
     def submission_status_data(self):
         """Get submission status distribution for pie chart."""
-        submissions = Submission.objects.filter(event=self.request.event)
-        
+        counts = self.submission_counts
         status_counts = {
-            'Accepted': submissions.filter(state='accepted').count(),
-            'Rejected': submissions.filter(state='rejected').count(),
-            'Pending': submissions.filter(state='submitted').count(),
-            'Confirmed': submissions.filter(state='confirmed').count(),
-            'Withdrawn': submissions.filter(state='withdrawn').count(),
+            "Accepted": counts.get(SubmissionStates.ACCEPTED, 0),
+            "Rejected": counts.get(SubmissionStates.REJECTED, 0),
+            "Pending": counts.get(SubmissionStates.SUBMITTED, 0),
+            "Confirmed": counts.get(SubmissionStates.CONFIRMED, 0),
+            "Withdrawn": counts.get(SubmissionStates.WITHDRAWN, 0),
         }
-        
+
         return {
-            'labels': list(status_counts.keys()),
-            'data': list(status_counts.values()),
+            "labels": list(status_counts.keys()),
+            "data": list(status_counts.values()),
         }
 
     @context
     def review_turnaround_data(self):
         """Get review turnaround time data."""
-        from django.db.models import F, ExpressionWrapper, fields
-        
-        reviews = Review.objects.filter(
-            submission__event=self.request.event,
-            created__isnull=False,
-            updated__isnull=False
-        ).annotate(
-            turnaround=ExpressionWrapper(
-                F('updated') - F('created'),
-                output_field=fields.DurationField()
+        latest = (
+            Review.objects.filter(
+                submission__event=self.request.event, updated__gt=F("created")
+            )
+            .annotate(
+                turnaround=ExpressionWrapper(
+                    F("updated") - F("created"), output_field=DurationField()
+                )
             )
+            .order_by("-created")
+            .values_list("turnaround", flat=True)[:20]
         )
-        
-        turnaround_days = []
-        for review in reviews:
-            if review.turnaround:
-                days = review.turnaround.total_seconds() / 86400
-                turnaround_days.append(round(days, 1))
-        
-        # Calculate average turnaround by week
-        avg_turnaround = sum(turnaround_days) / len(turnaround_days) if turnaround_days else 0
-        
+
         return {
-            'avg_turnaround_days': round(avg_turnaround, 1),
-            'turnaround_data': turnaround_days[:20],  # Latest 20 reviews
+            "avg_turnaround_days": round(self.review_stats["avg_turnaround_days"], 1),
+            "turnaround_data": [
+                round(turnaround.total_seconds() / 86400, 1) for turnaround in latest
+            ],
         }
 
     @context
     def attendee_demographics_data(self):
         """Get attendee demographics data."""
-        attendees = AttendeeMetrics.objects.filter(event=self.request.event)
-        
-        # Country distribution
-        countries = attendees.exclude(country='').values('country').annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]
-        
+        countries = (
+            AttendeeMetrics.objects.filter(event=self.request.event)
+            .exclude(country="")
+            .values("country")
+            .annotate(count=Count("id"))
+            .order_by("-count")[:10]
+        )
+
         return {
-            'country_labels': [item['country'] for item in countries],
-            'country_data': [item['count'] for item in countries],
+            "country_labels": [item["country"] for item in countries],
+            "country_data": [item["count"] for item in countries],
         }
 
 
@@ -135,7 +186,7 @@ class AttendeeMetricsView(EventPermissionRequired, PermissionRequired, TemplateV
     """View for detailed attendee metrics."""
 
     template_name = "orga/analytics/attendees.html"
-    permission_required = "orga.view_orga_area"
+    permission_required = "event.orga_access_event"
 
     @context
     def attendees(self):
@@ -147,12 +198,11 @@ def attendees(self):
     @context
     def engagement_stats(self):
         """Calculate engagement statistics."""
-        attendees = AttendeeMetrics.objects.filter(event=self.request.event)
-        
-        total = attendees.count()
-        checked_in = attendees.filter(checked_in=True).count()
-        active_week = attendees.filter(last_active__gte=now() - timedelta(days=7)).count()
-        
+        stats = get_attendee_stats(self.request.event)
+        total = stats["total"]
+        checked_in = stats["checked_in"]
+        active_week = stats["active"]
+
         return {
             'total_attendees': total,
             'checked_in': checked_in,
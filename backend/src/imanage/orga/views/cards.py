@@ -1,37 +1,106 @@
 # SPDX-FileCopyrightText: 2017-present Tobias Kunze
 # SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
 
+import datetime as dt
+
+from celery.result import AsyncResult
+from django.conf import settings
 from django.contrib import messages
-from django.shortcuts import redirect
+from django.core.exceptions import ValidationError
+from django.http import FileResponse, Http404
+from django.shortcuts import redirect, render
+from django.utils import translation
+from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import View
 
+from imanage.common.models import CachedFile
 from imanage.common.views.mixins import EventPermissionRequired
-from imanage.submission.models import SubmissionStates
+from imanage.submission.tasks import task_build_cards
 
 
 class SubmissionCards(EventPermissionRequired, View):
     permission_required = "submission.orga_update_submission"
 
-    def get_queryset(self):
-        return (
-            self.request.event.submissions.select_related("submission_type")
-            .prefetch_related("speakers")
-            .filter(
-                state__in=[
-                    SubmissionStates.ACCEPTED,
-                    SubmissionStates.CONFIRMED,
-                    SubmissionStates.SUBMITTED,
-                ]
-            )
-        )
-
     def get(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        if not queryset.exists():
+        if "file" in request.GET:
+            cached_file = self.get_cached_file(request.GET["file"])
+            if "async_id" in request.GET:
+                return self._check_task_status(
+                    request, AsyncResult(request.GET["async_id"]), cached_file
+                )
+            return self._serve_file(cached_file)
+
+        from imanage.submission.cards import get_card_submissions, get_cards_filename
+
+        if not get_card_submissions(request.event).exists():
             messages.warning(request, _("You don’t seem to have any proposals yet."))
             return redirect(request.event.orga_urls.submissions)
 
-        from imanage.submission.cards import build_cards
+        cached_file = CachedFile.objects.create(
+            expires=now() + dt.timedelta(days=1),
+            timestamp=now(),
+            filename=get_cards_filename(request.event),
+            content_type="application/pdf",
+            session_key=request.session.session_key,
+        )
+        task_kwargs = {
+            "event_id": request.event.pk,
+            "cached_file_id": str(cached_file.pk),
+            "locale": translation.get_language(),
+        }
+        # In eager mode (dev), the task runs synchronously - serve the file directly
+        if settings.CELERY_TASK_ALWAYS_EAGER:
+            task_build_cards.apply_async(kwargs=task_kwargs)
+            cached_file.refresh_from_db()
+            return self._serve_file(cached_file)
+
+        res = task_build_cards.apply_async(kwargs=task_kwargs)
+        return redirect(f"{request.path}?async_id={res.id}&file={cached_file.pk}")
 
-        return build_cards(queryset, request.event)
+    def get_cached_file(self, pk):
+        try:
+            return CachedFile.objects.get(
+                pk=pk, session_key=self.request.session.session_key
+            )
+        except (CachedFile.DoesNotExist, ValidationError, ValueError):
+            raise Http404()
+
+    def _check_task_status(self, request, res, cached_file):
+        download_url = f"{request.path}?file={cached_file.pk}"
+        if request.headers.get("HX-Request"):
+            if res.ready():
+                if res.successful():
+                    return render(
+                        request,
+                        "orga/schedule/export_success_partial.html",
+                        {"download_url": download_url},
+                    )
+                return render(request, "orga/submission/cards_error.html")
+            return render(
+                request,
+                "orga/schedule/export_waiting_partial.html",
+                {"async_id": res.id},
+            )
+
+        if res.ready():
+            if res.successful():
+                return redirect(download_url)
+            messages.error(request, _("Export failed, please try again."))
+            return redirect(request.event.orga_urls.submissions)
+
+        return render(
+            request,
+            "orga/submission/cards_waiting.html",
+            {"async_id": res.id, "file_id": cached_file.pk},
+        )
+
+    def _serve_file(self, cached_file):
+        if not cached_file.file:
+            raise Http404()
+        return FileResponse(
+            cached_file.file.open("rb"),
+            as_attachment=True,
+            filename=cached_file.filename,
+            content_type=cached_file.content_type,
+        )
@@ -22,6 +22,7 @@
 from imanage.common.text.phrases import phrases
 from imanage.common.views.mixins import EventPermissionRequired, PermissionRequired
 from imanage.event.models import Event, Organiser
+from imanage.event.services import get_shred_progress
 from imanage.event.stages import get_stages
 from imanage.orga.signals import dashboard_tile
 from imanage.submission.models import Submission, SubmissionStates
@@ -64,7 +65,10 @@ def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["current_orga_events"] = []
         context["past_orga_events"] = []
-        for event in self.queryset:
+        events = list(self.queryset)
+        shred_progress = get_shred_progress([event.pk for event in events])
+        for event in events:
+            event.shred_progress = shred_progress.get(event.pk)
             if event.date_to >= now().date():
                 context["current_orga_events"].insert(0, event)
             else:
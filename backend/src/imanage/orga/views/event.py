@@ -63,6 +63,7 @@
     EventWizardTimelineForm,
 )
 from imanage.event.models import Event, Team, TeamInvite
+from imanage.event.services import set_shred_progress, task_shred_event
 from imanage.orga.forms import EventForm
 from imanage.orga.forms.event import (
     EventFooterLinkFormset,
@@ -848,7 +849,18 @@ def action_back_url(self):
         return self.get_object().orga_urls.settings
 
     def post(self, request, *args, **kwargs):
-        self.get_object().shred(person=self.request.user)
+        # Deleting a large event takes a while, so we do it in the background
+        # and show its progress on the dashboard.
+        event = self.get_object()
+        set_shred_progress(event.pk, done=0, total=None)
+        task_shred_event.apply_async(
+            kwargs={"event_id": event.pk, "person_id": request.user.pk},
+            ignore_result=True,
+        )
+        messages.success(
+            request,
+            _("The event is being deleted. This may take a few minutes."),
+        )
         return redirect(reverse("orga:dashboard"))
 
 
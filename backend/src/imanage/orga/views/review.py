@@ -5,6 +5,7 @@
 from contextlib import suppress
 
 from django.contrib import messages
+from django.core.paginator import Paginator
 from django.db import transaction
 from django.db.models import (
     Avg,
@@ -22,6 +23,7 @@
 from django.shortcuts import get_object_or_404, redirect
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext as _n
 from django.views.generic import FormView, ListView, TemplateView
 from django_context_decorator import context
 
@@ -33,6 +35,7 @@
 from imanage.common.views.mixins import (
     ActionConfirmMixin,
     EventPermissionRequired,
+    PaginationMixin,
     PermissionRequired,
 )
 from imanage.orga.forms.review import (
@@ -40,6 +43,7 @@
     DirectionForm,
     ProposalForReviewerForm,
     ReviewAssignImportForm,
+    ReviewAutoAssignForm,
     ReviewerForProposalForm,
     ReviewExportForm,
     ReviewForm,
@@ -63,6 +67,7 @@
     questions_for_user,
     reviews_are_open,
 )
+from imanage.submission.services import save_reviews
 
 
 class ReviewDashboard(
@@ -343,10 +348,9 @@ def post(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
 
-class BulkReview(EventPermissionRequired, TemplateView):
+class BulkReview(EventPermissionRequired, PaginationMixin, TemplateView):
     template_name = "orga/review/bulk.html"
     permission_required = "submission.create_review"
-    paginate_by = None
 
     @context
     @cached_property
@@ -367,6 +371,13 @@ def submissions(self):
             submissions = self.filter_form.filter_queryset(submissions)
         return submissions
 
+    @context
+    @cached_property
+    def page_obj(self):
+        return Paginator(self.submissions, self.get_paginate_by()).get_page(
+            self.request.GET.get("page")
+        )
+
     @context
     @cached_property
     def show_tracks(self):
@@ -392,16 +403,28 @@ def categories(self):
             .prefetch_related("limit_tracks", "scores")
         )
 
+    @cached_property
+    def posted_codes(self):
+        # Unchanged rows are not submitted, see orga/js/ui/bulk-review.js
+        if self.request.method != "POST":
+            return set()
+        return {key.split("-", 1)[0] for key in self.request.POST}
+
     @context
     @cached_property
     def forms(self):
+        submissions = list(self.page_obj.object_list)
+        if self.posted_codes:
+            # The order depends on review counts, so posted rows may have
+            # moved to another page since the form was rendered.
+            submissions += self.submissions.filter(
+                code__in=self.posted_codes
+            ).exclude(pk__in=[submission.pk for submission in submissions])
         own_reviews = {
             review.submission_id: review
             for review in self.request.event.reviews.filter(
-                user=self.request.user, submission__in=self.submissions
-            )
-            .select_related("submission")
-            .prefetch_related("scores", "scores__category")
+                user=self.request.user, submission__in=submissions
+            ).prefetch_related("scores")
         }
         categories = defaultdict(list)
         for category in self.categories:
@@ -422,10 +445,14 @@ def forms(self):
                     categories[submission.track_id] if submission.track_id else []
                 )
                 + categories[None],
-                data=(self.request.POST if self.request.method == "POST" else None),
+                data=(
+                    self.request.POST
+                    if submission.code in self.posted_codes
+                    else None
+                ),
                 default_renderer=InlineFormRenderer,
             )
-            for submission in self.submissions
+            for submission in submissions
         }
 
     @context
@@ -440,17 +467,21 @@ def table(self):
                     for category in self.categories
                 ],
             }
-            for submission in self.submissions
+            for submission in self.page_obj.object_list
         ]
 
-    @transaction.atomic
     def post(self, request, *args, **kwargs):
-        if not all(form.is_valid() for form in self.forms.values()):
+        forms = [form for form in self.forms.values() if form.is_bound]
+        if not all(form.is_valid() for form in forms):
             messages.error(self.request, phrases.base.error_saving_changes)
             return super().get(request, *args, **kwargs)
-        for form in self.forms.values():
+        reviews = []
+        for form in forms:
             if form.has_changed():
-                form.save()
+                form.instance.submission = form.submission
+                form.instance.user = form.user
+                reviews.append((form.instance, form.get_scores()))
+        save_reviews(reviews)
         messages.success(self.request, phrases.base.saved)
         return super().get(request, *args, **kwargs)
 
@@ -848,34 +879,7 @@ def post(self, request, **kwargs):
         return redirect(self.request.event.orga_urls.reviews)
 
 
-class ReviewAssignment(EventPermissionRequired, FormView):
-    template_name = "orga/review/assignment.html"
-    permission_required = "event.update_event"
-
-    @cached_property
-    def form_type(self):
-        direction = self.request.GET.get("direction")
-        if not direction or direction not in ("reviewer", "submission"):
-            return "reviewer"
-        return direction
-
-    @context
-    @cached_property
-    def direction_form(self):
-        return DirectionForm(self.request.GET)
-
-    @context
-    @cached_property
-    def review_teams(self):
-        return self.request.event.teams.filter(is_reviewer=True)
-
-    @context
-    def tablist(self):
-        return {
-            "group": _("Assign reviewer teams"),
-            "individual": _("Assign reviewers individually"),
-        }
-
+class ReviewMappingMixin:
     @context
     @cached_property
     def review_mapping(self):
@@ -920,6 +924,50 @@ def review_mapping(self):
             "reviewer_code_to_id": reviewer_code_to_id,
         }
 
+
+class ReviewAssignment(
+    ReviewMappingMixin, EventPermissionRequired, PaginationMixin, FormView
+):
+    template_name = "orga/review/assignment.html"
+    permission_required = "event.update_event"
+
+    @cached_property
+    def form_type(self):
+        direction = self.request.GET.get("direction")
+        if not direction or direction not in ("reviewer", "submission"):
+            return "reviewer"
+        return direction
+
+    @context
+    @cached_property
+    def direction_form(self):
+        return DirectionForm(self.request.GET)
+
+    @context
+    @cached_property
+    def review_teams(self):
+        return self.request.event.teams.filter(is_reviewer=True)
+
+    @context
+    def tablist(self):
+        return {
+            "group": _("Assign reviewer teams"),
+            "individual": _("Assign reviewers individually"),
+        }
+
+    @context
+    @cached_property
+    def page_obj(self):
+        if self.form_type == "submission":
+            rows = self.request.event.submissions.order_by(
+                "title", "pk"
+            ).select_related("track")
+        else:
+            rows = self.request.event.reviewers.order_by("name", "pk")
+        return Paginator(rows, self.get_paginate_by()).get_page(
+            self.request.GET.get("page")
+        )
+
     def get_form(self):
         if self.form_type == "submission":
             form_class = ReviewerForProposalForm
@@ -931,11 +979,49 @@ def get_form(self):
             event=self.request.event,
             prefix=self.form_type,
             review_mapping=self.review_mapping,
+            rows=self.page_obj.object_list,
         )
 
     def form_valid(self, form):
         form.save()
         messages.success(self.request, phrases.base.saved)
+        return redirect(self.request.get_full_path())
+
+
+class ReviewAssignmentAuto(ReviewMappingMixin, EventPermissionRequired, FormView):
+    template_name = "orga/review/assignment-auto.html"
+    permission_required = "event.update_event"
+    form_class = ReviewAutoAssignForm
+
+    def get_form_kwargs(self):
+        result = super().get_form_kwargs()
+        result["event"] = self.request.event
+        result["review_mapping"] = self.review_mapping
+        return result
+
+    @context
+    def submit_buttons(self):
+        return [Button(label=_("Assign reviewers"))]
+
+    def form_valid(self, form):
+        count, incomplete = form.save()
+        messages.success(
+            self.request,
+            _n(
+                "{count} assignment was added.",
+                "{count} assignments were added.",
+                count,
+            ).format(count=count),
+        )
+        if incomplete:
+            messages.warning(
+                self.request,
+                _n(
+                    "{count} proposal could not get enough reviewers.",
+                    "{count} proposals could not get enough reviewers.",
+                    incomplete,
+                ).format(count=incomplete),
+            )
         return redirect(self.request.event.orga_urls.review_assignments)
 
 
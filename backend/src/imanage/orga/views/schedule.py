@@ -7,6 +7,7 @@
 import collections
 import datetime as dt
 import json
+import time
 
 import dateutil.parser
 from celery.result import AsyncResult
@@ -14,6 +15,7 @@
 from django.conf import settings
 from django.contrib import messages
 from django.db import transaction
+from django.db.models import Q
 from django.db.models.deletion import ProtectedError
 from django.http import FileResponse, JsonResponse
 from django.shortcuts import redirect, render
@@ -42,8 +44,13 @@
 )
 from imanage.orga.forms.schedule import ScheduleExportForm, ScheduleReleaseForm
 from imanage.orga.tables.schedule import RoomTable
+from imanage.person.models import User
 from imanage.schedule.forms import QuickScheduleForm, RoomForm
 from imanage.schedule.models import Availability, Room, TalkSlot
+from imanage.schedule.services import (
+    get_notification_progress,
+    has_pending_notifications,
+)
 from imanage.schedule.tasks import task_update_unreleased_schedule_changes
 
 SCRIPT_SRC = "'self' 'unsafe-eval'"
@@ -240,7 +247,8 @@ def changes(self):
     @context
     @cached_property
     def notifications(self):
-        return len(self.request.event.wip_schedule.generate_notifications(save=False))
+        # There is one notification per speaker concerned
+        return len(self.request.event.wip_schedule.speakers_concerned)
 
     def form_invalid(self, form):
         messages.error(
@@ -248,15 +256,48 @@ def form_invalid(self, form):
         )
         return super().form_invalid(form)
 
-    @transaction.atomic
+    def get(self, request, *args, **kwargs):
+        if "notifications" in request.GET:
+            return self._notification_status(request)
+        return super().get(request, *args, **kwargs)
+
+    def _notification_status(self, request):
+        schedule_id = request.GET["notifications"]
+        schedule = (
+            request.event.schedules.filter(
+                pk=schedule_id, version__isnull=False
+            ).first()
+            if schedule_id.isdigit()
+            else None
+        )
+        if not schedule:
+            return redirect(request.event.orga_urls.schedule)
+        progress = get_notification_progress(schedule)
+        context = {
+            "schedule": schedule,
+            "progress": progress,
+            "finished": not has_pending_notifications(schedule),
+        }
+        if request.headers.get("HX-Request"):
+            return render(
+                request, "orga/schedule/release_notifications_partial.html", context
+            )
+        return render(request, "orga/schedule/release_notifications.html", context)
+
     def form_valid(self, form):
-        self.request.event.release_schedule(
+        # Not wrapped in a transaction: the release commits on its own, so
+        # that the notifications can be generated in the background.
+        schedule = self.request.event.release_schedule(
             form.cleaned_data["version"],
             user=self.request.user,
             notify_speakers=form.cleaned_data["notify_speakers"],
             comment=form.cleaned_data["comment"],
-        )
+        )[0]
         messages.success(self.request, _("Nice, your schedule has been released!"))
+        if form.cleaned_data["notify_speakers"] and has_pending_notifications(schedule):
+            return redirect(
+                f"{self.request.event.orga_urls.release_schedule}?notifications={schedule.pk}"
+            )
         return redirect(self.request.event.orga_urls.schedule)
 
 
@@ -328,6 +369,7 @@ def serialize_break(slot):
         "duration": slot.duration,
         "updated": slot.updated.isoformat(),
         "slot_type": slot.slot_type,
+        "revision": slot.revision,
     }
 
 
@@ -367,6 +409,56 @@ def serialize_slot(slot, warnings=None):
     return base_data
 
 
+def is_stale(slot, data):
+    """Editor writes can include the ``revision`` of the slot they are based
+    on. If the slot was changed since, the write is stale and must be
+    rejected, so that concurrent edits don't overwrite each other."""
+    revision = data.get("revision")
+    return revision is not None and slot.revision > int(revision)
+
+
+def stale_response(slots):
+    return JsonResponse(
+        {
+            "error": "The schedule was changed in the meantime.",
+            "talks": [serialize_slot(slot) for slot in slots],
+        },
+        status=409,
+        encoder=I18nJSONEncoder,
+    )
+
+
+def move_slot(slot, data, rooms):
+    """Applies a move from the schedule editor to a slot without saving it,
+    and returns the fields to save. ``rooms`` maps room IDs to rooms."""
+    if not data.get("start"):
+        slot.start = None
+        slot.end = None
+        slot.room = None
+        return ["start", "end", "room", "updated"]
+
+    duration = slot.duration
+    slot.start = dateutil.parser.parse(data.get("start"))
+    if data.get("end"):
+        slot.end = dateutil.parser.parse(data["end"])
+    elif data.get("duration"):
+        slot.end = slot.start + dt.timedelta(minutes=int(data["duration"]))
+    elif not slot.submission:
+        slot.end = slot.start + dt.timedelta(minutes=duration or 30)
+    else:
+        slot.end = slot.start + dt.timedelta(minutes=slot.submission.get_duration())
+    room = rooms.get(int(data.get("room") or getattr(slot.room, "pk", 0)))
+    if not room:
+        raise Room.DoesNotExist()
+    slot.room = room
+    if not slot.submission:
+        new_description = LazyI18nString(data.get("title", ""))
+        slot.description = (
+            new_description if str(new_description) else slot.description
+        )
+    return ["start", "end", "room", "description", "updated"]
+
+
 class TalkList(EventPermissionRequired, View):
     permission_required = "schedule.release_schedule"
 
@@ -395,6 +487,7 @@ def get(self, request, event):
             }
         result["now"] = now().strftime("%Y-%m-%d %H:%M:%S%z")
         result["locales"] = request.event.locales
+        result["revision"] = schedule.revision
         return JsonResponse(result, encoder=I18nJSONEncoder)
 
     @csrf_exempt
@@ -418,24 +511,75 @@ def post(self, request, event):
         slot_type = data.get("slot_type", "break")
         if slot_type not in ("break", "blocker"):
             slot_type = "break"
-        slot = TalkSlot.objects.create(
-            schedule=request.event.wip_schedule,
-            room=(
-                request.event.rooms.get(pk=room)
-                if room
-                else request.event.rooms.first()
-            ),
-            description=LazyI18nString(data.get("title")),
-            start=start,
-            end=end,
-            slot_type=slot_type,
-        )
+        schedule = request.event.wip_schedule
+        with transaction.atomic():
+            slot = TalkSlot.objects.create(
+                schedule=schedule,
+                room=(
+                    request.event.rooms.get(pk=room)
+                    if room
+                    else request.event.rooms.first()
+                ),
+                description=LazyI18nString(data.get("title")),
+                start=start,
+                end=end,
+                slot_type=slot_type,
+                revision=schedule.bump_revision(),
+            )
         task_update_unreleased_schedule_changes.apply_async(
             kwargs={"event": request.event.slug}
         )
         return JsonResponse(serialize_break(slot))
 
 
+class ScheduleChanges(EventPermissionRequired, View):
+    """Returns the slots of the WIP schedule that changed since the revision
+    in ``since``. With ``wait``, waits up to that many seconds for a change
+    first (long polling). ``ids`` lists all current slots, so that clients
+    can drop deleted ones."""
+
+    permission_required = "schedule.release_schedule"
+    max_wait = 25
+    poll_interval = 1
+
+    def get(self, request, event):
+        try:
+            since = int(request.GET.get("since") or 0)
+            wait = min(int(request.GET.get("wait") or 0), self.max_wait)
+        except ValueError:
+            return JsonResponse({"error": "Invalid data"}, status=400)
+        schedule = request.event.wip_schedule
+        deadline = time.monotonic() + wait
+        while schedule.revision == since and time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            schedule.refresh_from_db(fields=["revision"])
+
+        talks = schedule.talks.select_related(
+            "submission__event",
+            "submission__submission_type",
+            "submission__track",
+            "room",
+            "schedule__event",
+        ).prefetch_related("submission__speakers")
+        if since <= schedule.revision:
+            # Otherwise, the client knows an older WIP schedule and needs all slots
+            talks = talks.filter(revision__gt=since)
+        talks = list(talks)
+        warnings = {}
+        if talks and request.GET.get("warnings"):
+            warnings = schedule.get_all_talk_warnings(ids=[talk.pk for talk in talks])
+        return JsonResponse(
+            {
+                "revision": schedule.revision,
+                "talks": [
+                    serialize_slot(talk, warnings=warnings.get(talk)) for talk in talks
+                ],
+                "ids": list(schedule.talks.values_list("pk", flat=True)),
+            },
+            encoder=I18nJSONEncoder,
+        )
+
+
 class ScheduleWarnings(EventPermissionRequired, View):
     permission_required = "schedule.release_schedule"
 
@@ -523,34 +667,26 @@ def patch(self, request, event, pk):
         if not talk:
             return JsonResponse({"error": "Talk not found"})
         data = json.loads(request.body.decode())
-        if data.get("start"):
-            duration = talk.duration
-            talk.start = dateutil.parser.parse(data.get("start"))
-            if data.get("end"):
-                talk.end = dateutil.parser.parse(data["end"])
-            elif data.get("duration"):
-                talk.end = talk.start + dt.timedelta(minutes=int(data["duration"]))
-            elif not talk.submission:
-                talk.end = talk.start + dt.timedelta(minutes=duration or 30)
+        rooms = request.event.rooms.in_bulk()
+        with transaction.atomic():
+            revision = talk.schedule.bump_revision()
+            # The slot may have changed while we waited for the schedule lock
+            talk.refresh_from_db(fields=["revision"])
+            try:
+                stale = is_stale(talk, data)
+            except (TypeError, ValueError):
+                transaction.set_rollback(True)
+                return JsonResponse({"error": "Invalid data"}, status=400)
+            if stale:
+                transaction.set_rollback(True)
             else:
-                talk.end = talk.start + dt.timedelta(
-                    minutes=talk.submission.get_duration()
-                )
-            talk.room = request.event.rooms.get(
-                pk=data["room"] or getattr(talk.room, "pk", None)
-            )
-            if not talk.submission:
-                new_description = LazyI18nString(data.get("title", ""))
-                talk.description = (
-                    new_description if str(new_description) else talk.description
-                )
-            talk.save(update_fields=["start", "end", "room", "description", "updated"])
+                talk.revision = revision
+                talk.save(update_fields=[*move_slot(talk, data, rooms), "revision"])
+        if stale:
+            talk.refresh_from_db()
+            return stale_response([talk])
+        if talk.start:
             talk.refresh_from_db()
-        else:
-            talk.start = None
-            talk.end = None
-            talk.room = None
-            talk.save(update_fields=["start", "end", "room", "updated"])
 
         with_speakers = self.request.event.cfp.request_availabilities
         warnings = talk.schedule.get_talk_warnings(talk, with_speakers=with_speakers)
@@ -566,13 +702,117 @@ def delete(self, request, event, pk):
             return JsonResponse({"error": "Talk not found"})
         if talk.submission:
             return JsonResponse({"error": "Cannot delete talk."})
-        talk.delete()
+        with transaction.atomic():
+            talk.schedule.bump_revision()
+            talk.delete()
         task_update_unreleased_schedule_changes.apply_async(
             kwargs={"event": request.event.slug}
         )
         return JsonResponse({"success": True})
 
 
+class TalkBatchUpdate(EventPermissionRequired, View):
+    """Moves several slots at once, e.g. to shift a room's afternoon. Expects
+    ``{"talks": [...]}`` with the same data per slot as ``TalkUpdate``, plus
+    the slot ``id``. Either all moves are applied, or none."""
+
+    permission_required = "schedule.release_schedule"
+
+    @csrf_exempt
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def post(self, request, event):
+        schedule = request.event.wip_schedule
+        try:
+            moves = json.loads(request.body.decode())["talks"]
+            ids = [int(move["id"]) for move in moves]
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({"error": "Invalid data"}, status=400)
+        talks = schedule.talks.select_related(
+            "submission__submission_type", "room"
+        ).in_bulk(ids)
+        if len(talks) != len(set(ids)):
+            return JsonResponse({"error": "Talk not found"}, status=404)
+
+        rooms = request.event.rooms.in_bulk()
+        affected_rooms = {talk.room_id for talk in talks.values() if talk.room_id}
+        with transaction.atomic():
+            revision = schedule.bump_revision()
+            # Slots may have changed while we waited for the schedule lock
+            current = dict(
+                schedule.talks.filter(pk__in=ids).values_list("pk", "revision")
+            )
+            if len(current) != len(talks):
+                transaction.set_rollback(True)
+                return JsonResponse({"error": "Talk not found"}, status=404)
+            try:
+                stale = []
+                for move in moves:
+                    talk = talks[int(move["id"])]
+                    talk.revision = current[talk.pk]
+                    if is_stale(talk, move):
+                        stale.append(talk.pk)
+                        continue
+                    move_slot(talk, move, rooms)
+                    talk.updated = now()
+                    talk.revision = revision
+                    if talk.room_id:
+                        affected_rooms.add(talk.room_id)
+            except (Room.DoesNotExist, ValueError, TypeError):
+                transaction.set_rollback(True)
+                return JsonResponse({"error": "Invalid data"}, status=400)
+            if stale:
+                transaction.set_rollback(True)
+            else:
+                TalkSlot.objects.bulk_update(
+                    talks.values(),
+                    ["start", "end", "room", "description", "updated", "revision"],
+                )
+        if stale:
+            return stale_response(schedule.talks.filter(pk__in=stale))
+        task_update_unreleased_schedule_changes.apply_async(
+            kwargs={"event": request.event.slug}
+        )
+
+        # Moving slots changes the warnings of everything in the same rooms
+        # and of the speakers' other sessions, too.
+        affected_ids = schedule.talks.filter(
+            Q(pk__in=ids)
+            | Q(room__in=affected_rooms)
+            | Q(
+                submission__speakers__in=User.objects.filter(
+                    submissions__slots__in=ids
+                )
+            )
+        ).values_list("pk", flat=True)
+        warnings = schedule.get_all_talk_warnings(ids=set(affected_ids))
+        moved = (
+            schedule.talks.filter(pk__in=ids)
+            .select_related(
+                "submission__event",
+                "submission__submission_type",
+                "submission__track",
+                "room",
+                "schedule__event",
+            )
+            .prefetch_related("submission__speakers")
+        )
+        return JsonResponse(
+            {
+                "talks": [
+                    serialize_slot(talk, warnings=warnings.get(talk))
+                    for talk in moved
+                ],
+                "warnings": {
+                    talk.submission.code: talk_warnings
+                    for talk, talk_warnings in warnings.items()
+                },
+            },
+            encoder=I18nJSONEncoder,
+        )
+
+
 class QuickScheduleView(PermissionRequired, UpdateView):
     permission_required = "schedule.update_talkslot"
     form_class = QuickScheduleForm
@@ -4,6 +4,7 @@
 # This file contains Apache-2.0 licensed contributions copyrighted by the following contributors:
 # SPDX-FileContributor: michalpirchala
 
+import datetime as dt
 import json
 from collections import Counter
 from operator import itemgetter
@@ -14,6 +15,7 @@
 from django.contrib.syndication.views import Feed
 from django.db import transaction
 from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
 from django.forms.models import BaseModelFormSet, inlineformset_factory
 from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
@@ -880,17 +882,34 @@ def item_pubdate(self, item):
 class SubmissionStats(EventPermissionRequired, TemplateView):
     template_name = "orga/submission/stats.html"
     permission_required = "submission.orga_list_submission"
+    # The states included in Submission.objects
+    visible_states = tuple(
+        state
+        for state in SubmissionStates.display_values
+        if state not in (SubmissionStates.DELETED, SubmissionStates.DRAFT)
+    )
+
+    @cached_property
+    def submission_types(self):
+        return {
+            submission_type.id: submission_type
+            for submission_type in self.request.event.submission_types.all()
+        }
+
+    @cached_property
+    def tracks(self):
+        return {track.id: track for track in self.request.event.tracks.all()}
 
     @context
     def show_submission_types(self):
-        return self.request.event.submission_types.all().count() > 1
+        return len(self.submission_types) > 1
 
     @context
     def id_mapping(self):
         data = {
             "type": {
                 str(submission_type): submission_type.id
-                for submission_type in self.request.event.submission_types.all()
+                for submission_type in self.submission_types.values()
             },
             "state": {
                 str(value): key
@@ -898,17 +917,14 @@ def id_mapping(self):
             },
         }
         if self.show_tracks:
-            data["track"] = {
-                str(track): track.id for track in self.request.event.tracks.all()
-            }
+            data["track"] = {str(track): track.id for track in self.tracks.values()}
         return json.dumps(data)
 
     @context
     @cached_property
     def show_tracks(self):
         return (
-            self.request.event.get_feature_flag("use_tracks")
-            and self.request.event.tracks.all().count() > 1
+            self.request.event.get_feature_flag("use_tracks") and len(self.tracks) > 1
         )
 
     @context
@@ -920,9 +936,8 @@ def timeline_annotations(self):
                 ),
                 str(_("Deadline")) + f" ({submission_type.name})",
             )
-            for submission_type in self.request.event.submission_types.filter(
-                deadline__isnull=False
-            )
+            for submission_type in self.submission_types.values()
+            if submission_type.deadline
         ]
         if self.request.event.cfp.deadline:
             deadlines.append(
@@ -936,33 +951,77 @@ def timeline_annotations(self):
         return json.dumps({"deadlines": deadlines})
 
     @cached_property
-    def raw_submission_timeline_data(self):
-        talk_ids = self.request.event.submissions.exclude(
-            state=SubmissionStates.DELETED
-        ).values_list("id", flat=True)
-        data = Counter(
-            log.timestamp.astimezone(self.request.event.tz).date()
-            for log in ActivityLog.objects.filter(
+    def submission_counts(self):
+        """All non-draft submissions, counted per state, type and track in a
+        single grouped query. Every chart below is built from these rows."""
+        return list(
+            Submission.all_objects.filter(event=self.request.event)
+            .exclude(state=SubmissionStates.DRAFT)
+            .order_by()
+            .values_list("state", "submission_type_id", "track_id")
+            .annotate(count=Count("id"))
+        )
+
+    def build_chart_data(self, label, states=None):
+        counter = Counter()
+        for state, submission_type_id, track_id, count in self.submission_counts:
+            if states is None or state in states:
+                counter[label(state, submission_type_id, track_id)] += count
+        return json.dumps(
+            sorted(
+                [{"label": label, "value": value} for label, value in counter.items()],
+                key=itemgetter("label"),
+            )
+        )
+
+    def get_state_label(self, state, submission_type_id, track_id):
+        return str(SubmissionStates.display_values[state])
+
+    def get_type_label(self, state, submission_type_id, track_id):
+        return str(self.submission_types.get(submission_type_id))
+
+    def get_track_label(self, state, submission_type_id, track_id):
+        return str(self.tracks.get(track_id))
+
+    @cached_property
+    def timeline_counts(self):
+        """Proposal and session creation counts per day, in the event's
+        timezone, in a single grouped query."""
+        submissions = self.request.event.submissions.all()
+        talks = submissions.filter(state__in=SubmissionStates.accepted_states)
+        return {
+            date: (submission_count, talk_count)
+            for date, submission_count, talk_count in ActivityLog.objects.filter(
                 event=self.request.event,
                 action_type="imanage.submission.create",
                 content_type=ContentType.objects.get_for_model(Submission),
-                object_id__in=talk_ids,
+                object_id__in=submissions.values("id"),
             )
-        )
-        dates = data.keys()
+            .annotate(date=TruncDate("timestamp", tzinfo=self.request.event.tz))
+            .order_by()
+            .values_list("date")
+            .annotate(
+                submissions=Count("id"),
+                talks=Count("id", filter=Q(object_id__in=talks.values("id"))),
+            )
+        }
+
+    @cached_property
+    def raw_submission_timeline_data(self):
+        dates = self.timeline_counts.keys()
         if len(dates) > 1:
             date_range = rrule.rrule(
                 rrule.DAILY,
                 count=(max(dates) - min(dates)).days + 1,
                 dtstart=min(dates),
             )
-            return sorted(
-                (
-                    {"x": date.date().isoformat(), "y": data.get(date.date(), 0)}
-                    for date in date_range
-                ),
-                key=lambda x: x["x"],
-            )
+            return [
+                {
+                    "x": date.date().isoformat(),
+                    "y": self.timeline_counts.get(date.date(), (0, 0))[0],
+                }
+                for date in date_range
+            ]
 
     @context
     def submission_timeline_data(self):
@@ -982,72 +1041,36 @@ def total_submission_timeline_data(self):
     @context
     @cached_property
     def submission_state_data(self):
-        counter = Counter(
-            submission.get_state_display()
-            for submission in Submission.all_objects.exclude(
-                state=SubmissionStates.DRAFT
-            ).filter(event=self.request.event)
-        )
-        return json.dumps(
-            sorted(
-                [{"label": label, "value": value} for label, value in counter.items()],
-                key=itemgetter("label"),
-            )
-        )
+        return self.build_chart_data(self.get_state_label)
 
     @context
     def submission_type_data(self):
-        counter = Counter(
-            str(submission.submission_type)
-            for submission in Submission.objects.filter(
-                event=self.request.event
-            ).select_related("submission_type")
-        )
-        return json.dumps(
-            sorted(
-                [{"label": label, "value": value} for label, value in counter.items()],
-                key=itemgetter("label"),
-            )
+        return self.build_chart_data(
+            self.get_type_label, states=self.visible_states
         )
 
     @context
     def submission_track_data(self):
         if self.request.event.get_feature_flag("use_tracks"):
-            counter = Counter(
-                str(submission.track)
-                for submission in Submission.objects.filter(
-                    event=self.request.event
-                ).select_related("track")
-            )
-            return json.dumps(
-                sorted(
-                    [
-                        {"label": label, "value": value}
-                        for label, value in counter.items()
-                    ],
-                    key=itemgetter("label"),
-                )
+            return self.build_chart_data(
+                self.get_track_label, states=self.visible_states
             )
         return ""
 
     @context
     def talk_timeline_data(self):
-        talk_ids = self.request.event.submissions.filter(
-            state__in=SubmissionStates.accepted_states
-        ).values_list("id", flat=True)
-        data = Counter(
-            log.timestamp.astimezone(self.request.event.tz).date().isoformat()
-            for log in ActivityLog.objects.filter(
-                event=self.request.event,
-                action_type="imanage.submission.create",
-                content_type=ContentType.objects.get_for_model(Submission),
-                object_id__in=talk_ids,
-            )
-        )
-        if len(data.keys()) > 1:
+        talk_dates = [
+            date for date, (_submissions, talks) in self.timeline_counts.items() if talks
+        ]
+        if len(talk_dates) > 1:
             return json.dumps(
                 [
-                    {"x": point["x"], "y": data.get(point["x"][:10], 0)}
+                    {
+                        "x": point["x"],
+                        "y": self.timeline_counts.get(
+                            dt.date.fromisoformat(point["x"]), (0, 0)
+                        )[1],
+                    }
                     for point in self.raw_submission_timeline_data
                 ]
             )
@@ -1055,51 +1078,21 @@ def talk_timeline_data(self):
 
     @context
     def talk_state_data(self):
-        counter = Counter(
-            submission.get_state_display()
-            for submission in self.request.event.submissions.filter(
-                state__in=SubmissionStates.accepted_states
-            )
-        )
-        return json.dumps(
-            sorted(
-                [{"label": label, "value": value} for label, value in counter.items()],
-                key=itemgetter("label"),
-            )
+        return self.build_chart_data(
+            self.get_state_label, states=SubmissionStates.accepted_states
         )
 
     @context
     def talk_type_data(self):
-        counter = Counter(
-            str(submission.submission_type)
-            for submission in self.request.event.submissions.filter(
-                state__in=SubmissionStates.accepted_states
-            ).select_related("submission_type")
-        )
-        return json.dumps(
-            sorted(
-                [{"label": label, "value": value} for label, value in counter.items()],
-                key=itemgetter("label"),
-            )
+        return self.build_chart_data(
+            self.get_type_label, states=SubmissionStates.accepted_states
         )
 
     @context
     def talk_track_data(self):
         if self.request.event.get_feature_flag("use_tracks"):
-            counter = Counter(
-                str(submission.track)
-                for submission in self.request.event.submissions.filter(
-                    state__in=SubmissionStates.accepted_states
-                ).select_related("track")
-            )
-            return json.dumps(
-                sorted(
-                    [
-                        {"label": label, "value": value}
-                        for label, value in counter.items()
-                    ],
-                    key=itemgetter("label"),
-                )
+            return self.build_chart_data(
+                self.get_track_label, states=SubmissionStates.accepted_states
             )
         return ""
 
@@ -27,7 +27,7 @@
 from rules.contrib.models import RulesModelBase, RulesModelMixin
 
 from imanage.common.exceptions import UserDeletionError
-from imanage.common.image import create_thumbnail
+from imanage.common.image import get_thumbnail
 from imanage.common.models import TIMEZONE_CHOICES
 from imanage.common.models.mixins import FileCleanupMixin, GenerateCode, LogMixin
 from imanage.common.text.path import path_with_hash
@@ -370,13 +370,7 @@ def get_avatar_url(self, event=None, thumbnail=None):
         if not thumbnail:
             image = self.avatar
         else:
-            image = (
-                self.avatar_thumbnail_tiny
-                if thumbnail == "tiny"
-                else self.avatar_thumbnail
-            )
-            if not image:
-                image = create_thumbnail(self.avatar, thumbnail)
+            image = get_thumbnail(self.avatar, thumbnail)
         if not image:
             return
         if event and event.custom_domain:
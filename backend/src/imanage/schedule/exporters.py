@@ -16,6 +16,7 @@
 from imanage.common.exporter import BaseExporter
 from imanage.common.urls import get_base_url, get_netloc
 from imanage.schedule.ical import get_slots_ical
+from imanage.schedule.services import prefetch_slot_id_suffixes
 
 
 class ScheduleData(BaseExporter):
@@ -48,7 +49,7 @@ def data(self):
             if self.with_accepted
             else schedule.talks.filter(is_visible=True)
         )
-        talks = (
+        talks = prefetch_slot_id_suffixes(
             base_qs.select_related(
                 "submission",
                 "submission__event",
@@ -4,6 +4,7 @@
 import datetime as dt
 
 from django import forms
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from django_scopes.forms import SafeModelChoiceField
 
@@ -94,7 +95,9 @@ def save(self):
             tzinfo=self.event.tz,
         )
         talk.end = talk.start + dt.timedelta(minutes=talk.submission.get_duration())
-        return super().save()
+        with transaction.atomic():
+            talk.revision = talk.schedule.bump_revision()
+            return super().save()
 
     class Meta:
         model = TalkSlot
@@ -33,6 +33,8 @@ def patch_out_timezone_cache(tzinfo):
 def get_slots_ical(event, slots, prodid_suffix=None):
     import vobject
 
+    from imanage.schedule.services import prefetch_slot_id_suffixes
+
     cal = vobject.iCalendar()
     netloc = get_netloc(event)
     prodid = f"-//imanage//{netloc}//{event.slug}"
@@ -40,7 +42,7 @@ def get_slots_ical(event, slots, prodid_suffix=None):
         prodid = f"{prodid}//{prodid_suffix}"
     cal.add("prodid").value = prodid
     creation_time = dt.datetime.now(ZoneInfo("UTC"))
-    for slot in slots:
+    for slot in prefetch_slot_id_suffixes(slots):
         slot.build_ical(cal, creation_time=creation_time, netloc=netloc)
     return cal
 
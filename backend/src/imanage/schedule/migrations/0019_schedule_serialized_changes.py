@@ -0,0 +1,21 @@
+# SPDX-FileCopyrightText: 2026-present Tobias Kunze
+# SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
+
+# Generated by Django 6.0 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedule", "0018_talkslot_slot_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="schedule",
+            name="serialized_changes",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
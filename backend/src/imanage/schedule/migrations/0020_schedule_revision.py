@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2026-present Tobias Kunze
+# SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
+
+# Generated by Django 6.0 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedule", "0019_schedule_serialized_changes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="schedule",
+            name="revision",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="talkslot",
+            name="revision",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -32,6 +32,11 @@ class Schedule(ImanageModel):
     for a schedule release for an :class:`~imanage.event.models.event.Event`.
 
     :param published: ``None`` if the schedule has not been published yet.
+    :param serialized_changes: The changes compared to the previous schedule
+        version, stored on release. Use ``changes`` to access them.
+    :param revision: Incremented on every change to the WIP schedule's slots,
+        so that editors can fetch only what changed since the revision they
+        know. Use ``bump_revision`` to change it.
     """
 
     event = models.ForeignKey(
@@ -51,6 +56,8 @@ class Schedule(ImanageModel):
         + " "
         + phrases.base.use_markdown,
     )
+    serialized_changes = models.JSONField(null=True, blank=True)
+    revision = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ("-published",)
@@ -71,6 +78,20 @@ class urls(EventUrls):
         widget_data = "{public}widgets/schedule.json"
         nojs = "{public}nojs"
 
+    def bump_revision(self) -> int:
+        """Increments the schedule's revision and returns the new value.
+
+        Call this in the transaction that changes the slots: the update
+        locks the schedule row until the transaction ends, so concurrent
+        editors have to take turns. New and changed slots have to be saved
+        with the returned revision.
+        """
+        Schedule.objects.filter(pk=self.pk).update(revision=models.F("revision") + 1)
+        self.refresh_from_db(fields=["revision"])
+        return self.revision
+
+    bump_revision.alters_data = True
+
     def freeze(
         self, name: str, user=None, notify_speakers: bool = True, comment: str = None
     ):
@@ -81,7 +102,8 @@ def freeze(
         :param user: The :class:`~imanage.person.models.user.User` initiating
             the freeze.
         :param notify_speakers: Should notification emails for speakers with
-            changed slots be generated?
+            changed slots be generated? They are generated in a background
+            task once the release is complete.
         :param comment: Public comment for the release
         :rtype: Schedule
         """
@@ -200,9 +222,8 @@ def changes(self) -> dict:
         an update, the ``count`` integer, and the ``new_talks``,
         ``canceled_talks`` and ``moved_talks`` lists are also present.
 
-        This property uses caching with different TTLs:
-        - WIP schedules: 60 seconds
-        - Released schedules: 10 minutes
+        Released schedules store their changes in ``serialized_changes``
+        when they are released, WIP schedules cache them for 60 seconds.
         """
         return get_cached_schedule_changes(self)
 
@@ -353,6 +374,8 @@ def get_all_talk_warnings(self, ids=None, filter_updated=None):
             )
             .prefetch_related("submission__speakers")
         )
+        if ids is not None:
+            talks = talks.filter(pk__in=ids)
         if filter_updated:
             talks = talks.filter(updated__gte=filter_updated)
         with_speakers = self.event.cfp.request_availabilities
@@ -368,19 +391,19 @@ def get_all_talk_warnings(self, ids=None, filter_updated=None):
         if with_speakers:
             from imanage.person.models import SpeakerProfile
 
+            profiles = SpeakerProfile.objects.filter(event=self.event)
+            if ids is not None:
+                profiles = profiles.filter(
+                    user__submissions__in=talks.values("submission")
+                ).distinct()
             speaker_profiles = {
-                profile.user: profile
-                for profile in SpeakerProfile.objects.filter(
-                    event=self.event
-                ).select_related("user")
+                profile.user: profile for profile in profiles.select_related("user")
             }
             speaker_avails = defaultdict(
                 list,
                 {
                     profile.pk: profile.availabilities.all()
-                    for profile in SpeakerProfile.objects.filter(
-                        event=self.event
-                    ).prefetch_related("availabilities")
+                    for profile in profiles.prefetch_related("availabilities")
                 },
             )
         result = {}
@@ -434,16 +457,19 @@ def speakers_concerned(self):
         """
         result = {}
         if self.changes["action"] == "create":
-            from imanage.person.models import User
-
-            for speaker in User.objects.filter(submissions__slots__schedule=self):
-                talks = self.talks.filter(
-                    submission__speakers=speaker,
+            talks = (
+                self.talks.filter(
+                    submission__isnull=False,
                     room__isnull=False,
                     start__isnull=False,
                 )
-                if talks:
-                    result[speaker] = {"create": talks, "update": []}
+                .select_related("submission", "submission__event", "room")
+                .prefetch_related("submission__speakers")
+            )
+            for talk in talks:
+                for speaker in talk.submission.speakers.all():
+                    result.setdefault(speaker, {"create": [], "update": []})
+                    result[speaker]["create"].append(talk)
             return result
 
         if self.changes["count"] == len(self.changes["canceled_talks"]):
@@ -458,37 +484,17 @@ def speakers_concerned(self):
                 speakers[speaker]["update"].append(moved_talk)
         return speakers
 
-    def generate_notifications(self, save=False):
-        """A list of unsaved :class:`~imanage.mail.models.QueuedMail` objects
-        to be sent on schedule release."""
-        from imanage.mail.models import MailTemplateRoles
-
-        mails = []
-        for speaker, data in self.speakers_concerned.items():
-            locale = speaker.get_locale_for_event(self.event)
-            slots = list(data.get("create") or []) + [
-                talk["new_slot"] for talk in (data.get("update") or [])
-            ]
-            submissions = [slot.submission for slot in slots if slot]
-            mails.append(
-                self.event.get_mail_template(MailTemplateRoles.NEW_SCHEDULE).to_mail(
-                    user=speaker,
-                    event=self.event,
-                    context_kwargs={"user": speaker},
-                    commit=save,
-                    locale=locale,
-                    submissions=submissions,
-                    attachments=[
-                        {
-                            "name": f"{slot.frab_slug}.ics",
-                            "content": slot.full_ical().serialize(),
-                            "content_type": "text/calendar",
-                        }
-                        for slot in slots
-                    ],
-                )
-            )
-        return mails
+    def generate_notifications(self, save=False, progress=None):
+        """A list of :class:`~imanage.mail.models.QueuedMail` objects to be
+        sent on schedule release. The objects are unsaved unless ``save`` is
+        set.
+
+        :param progress: Optional callable, called with the number of
+            generated and the total number of notifications.
+        """
+        from imanage.schedule.notifications import generate_schedule_notifications
+
+        return generate_schedule_notifications(self, save=save, progress=progress)
 
     generate_notifications.alters_data = True
 
@@ -87,6 +87,8 @@ class TalkSlot(ImanageModel):
         help_text=_("When the talk ends, if it is currently scheduled"),
     )
     description = I18nCharField(null=True)
+    # The schedule revision of the last change in the schedule editor
+    revision = models.PositiveIntegerField(default=0)
 
     objects = ScopedManager(event="schedule__event")
 
@@ -177,7 +179,9 @@ def copy_to_schedule(self, new_schedule, save=True):
         new_slot = TalkSlot(schedule=new_schedule)
 
         for field in (
-            fn for fn in self._meta.fields if fn.name not in ("id", "schedule")
+            fn
+            for fn in self._meta.fields
+            if fn.name not in ("id", "schedule", "revision")
         ):
             setattr(new_slot, field.name, getattr(self, field.name))
 
@@ -198,7 +202,7 @@ def id_suffix(self):
         all_slots = list(
             TalkSlot.objects.filter(
                 submission_id=self.submission_id, schedule_id=self.schedule_id
-            ).order_by("start")
+            ).order_by("start", "pk")
         )
         if len(all_slots) == 1:
             return ""
@@ -45,3 +45,115 @@ def get_current_notifications(speaker, event):
     if not event.current_schedule:
         return empty_result
     return event.current_schedule.speakers_concerned.get(speaker, empty_result)
+
+
+NOTIFICATION_BATCH_SIZE = 500
+
+
+def generate_schedule_notifications(schedule, save=False, progress=None):
+    """Builds one :class:`~imanage.mail.models.QueuedMail` per speaker
+    concerned by a schedule release.
+
+    Instead of going through ``MailTemplate.to_mail`` for every speaker, the
+    placeholders, the mail template and the calendar attachment of every slot
+    are looked up once, and all mails are inserted in bulk if ``save`` is set.
+    """
+    from django.db import transaction
+    from django.utils.translation import override as override_language
+
+    from imanage.common.exceptions import SendMailException
+    from imanage.mail.context import get_available_placeholders, get_used_placeholders
+    from imanage.mail.models import MailTemplateRoles, QueuedMail
+    from imanage.schedule.services import prefetch_slot_id_suffixes
+
+    event = schedule.event
+    slots_by_speaker = {
+        speaker: [
+            slot
+            for slot in list(data.get("create") or [])
+            + [talk["new_slot"] for talk in (data.get("update") or [])]
+            if slot
+        ]
+        for speaker, data in schedule.speakers_concerned.items()
+    }
+    total = len(slots_by_speaker)
+    if not total:
+        return []
+
+    slots = prefetch_slot_id_suffixes(
+        {slot.pk: slot for slots in slots_by_speaker.values() for slot in slots}.values()
+    )
+    attachments = {
+        slot.pk: {
+            "name": f"{slot.frab_slug}.ics",
+            "content": slot.full_ical().serialize(),
+            "content_type": "text/calendar",
+        }
+        for slot in slots
+    }
+
+    template = event.get_mail_template(MailTemplateRoles.NEW_SCHEDULE)
+    placeholders = get_available_placeholders(event, ["event", "user"])
+    used_placeholders = {
+        identifier.split(".")[0].split("[")[0]
+        for identifier in get_used_placeholders(template.subject)
+        | get_used_placeholders(template.text)
+    } & set(placeholders)
+
+    mails = []
+    recipients = []
+    for index, (speaker, speaker_slots) in enumerate(slots_by_speaker.items()):
+        if progress and index % 20 == 0:
+            progress(index, total)
+        locale = speaker.get_locale_for_event(event)
+        with override_language(locale):
+            context = {
+                identifier: placeholders[identifier].render(
+                    {"event": event, "user": speaker}
+                )
+                for identifier in used_placeholders
+            }
+            try:
+                subject = str(template.subject).format(**context)
+                text = str(template.text).format(**context)
+            except KeyError as e:
+                raise SendMailException(
+                    f"Experienced KeyError when rendering email text: {str(e)}"
+                )
+        if len(subject) > 200:
+            subject = subject[:198] + "…"
+        mail = QueuedMail(
+            event=event,
+            template=template,
+            to=None if save else speaker.email,
+            reply_to=template.reply_to,
+            bcc=template.bcc,
+            subject=subject,
+            text=text,
+            locale=locale,
+            attachments=[attachments[slot.pk] for slot in speaker_slots],
+        )
+        mails.append(mail)
+        recipients.append((speaker, {slot.submission for slot in speaker_slots}))
+
+    if save:
+        with transaction.atomic():
+            QueuedMail.objects.bulk_create(mails, batch_size=NOTIFICATION_BATCH_SIZE)
+            QueuedMail.to_users.through.objects.bulk_create(
+                [
+                    QueuedMail.to_users.through(queuedmail_id=mail.pk, user_id=speaker.pk)
+                    for mail, (speaker, _submissions) in zip(mails, recipients)
+                ],
+                batch_size=NOTIFICATION_BATCH_SIZE,
+            )
+            QueuedMail.submissions.through.objects.bulk_create(
+                [
+                    QueuedMail.submissions.through(
+                        queuedmail_id=mail.pk, submission_id=submission.pk
+                    )
+                    for mail, (_speaker, submissions) in zip(mails, recipients)
+                    for submission in submissions
+                ],
+                batch_size=NOTIFICATION_BATCH_SIZE,
+            )
+    return mails
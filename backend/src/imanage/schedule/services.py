@@ -4,6 +4,7 @@
 import json
 from collections import defaultdict, namedtuple
 from contextlib import suppress
+from itertools import batched
 
 from django.db import models, transaction
 from django.db.utils import DatabaseError
@@ -13,6 +14,49 @@
 from imanage.schedule.models.slot import SlotType
 from imanage.schedule.signals import schedule_release
 
+SLOT_COPY_BATCH_SIZE = 500
+
+
+def prefetch_slot_id_suffixes(slots):
+    """Sets the ``id_suffix`` of all given slots with a single query.
+
+    ``TalkSlot.id_suffix`` (and with it ``frab_slug`` and ``uuid``) needs to
+    know the position of a slot among all slots of its submission, which
+    would otherwise cost one query per slot in exports.
+    Returns the slots as a list.
+    """
+    from imanage.schedule.models import TalkSlot
+
+    slots = list(slots)
+    if not slots:
+        return slots
+    if not slots[0].event.get_feature_flag("present_multiple_times"):
+        for slot in slots:
+            slot.id_suffix = ""
+        return slots
+
+    submission_ids = {slot.submission_id for slot in slots}
+    query = models.Q(submission_id__in=submission_ids - {None})
+    if None in submission_ids:
+        query |= models.Q(submission__isnull=True)
+    siblings = defaultdict(list)
+    for pk, schedule_id, submission_id in (
+        TalkSlot.objects.filter(
+            query, schedule_id__in={slot.schedule_id for slot in slots}
+        )
+        .order_by("start", "pk")
+        .values_list("pk", "schedule_id", "submission_id")
+    ):
+        siblings[schedule_id, submission_id].append(pk)
+
+    for slot in slots:
+        slot_ids = siblings[slot.schedule_id, slot.submission_id]
+        if len(slot_ids) == 1:
+            slot.id_suffix = ""
+        elif slot.pk in slot_ids:
+            slot.id_suffix = f"-{slot_ids.index(slot.pk)}"
+    return slots
+
 
 def serialize_schedule_changes(changes: dict) -> dict:
     serialized = {
@@ -62,25 +106,32 @@ def serialize_schedule_changes(changes: dict) -> dict:
 
 
 def deserialize_schedule_changes(serialized: dict, event) -> dict:
+    return deserialize_many_schedule_changes([serialized], event)[0]
+
+
+def deserialize_many_schedule_changes(serialized_list: list, event) -> list:
+    """Deserializes a list of serialized schedule changes, loading the
+    submissions, slots and rooms for all of them at once."""
     # Collect all IDs we need to fetch
     submission_codes = set()
     slot_ids = set()
     room_ids = set()
 
-    for item in serialized["new_talks"] + serialized["canceled_talks"]:
-        if item["submission_code"]:
-            submission_codes.add(item["submission_code"])
-        slot_ids.add(item["id"])
-
-    for item in serialized["moved_talks"]:
-        if item["submission_code"]:
-            submission_codes.add(item["submission_code"])
-        if item["new_slot_id"]:
-            slot_ids.add(item["new_slot_id"])
-        if item.get("new_room"):
-            room_ids.add(item["new_room"])
-        if item.get("old_room"):
-            room_ids.add(item["old_room"])
+    for serialized in serialized_list:
+        for item in serialized["new_talks"] + serialized["canceled_talks"]:
+            if item["submission_code"]:
+                submission_codes.add(item["submission_code"])
+            slot_ids.add(item["id"])
+
+        for item in serialized["moved_talks"]:
+            if item["submission_code"]:
+                submission_codes.add(item["submission_code"])
+            if item["new_slot_id"]:
+                slot_ids.add(item["new_slot_id"])
+            if item.get("new_room"):
+                room_ids.add(item["new_room"])
+            if item.get("old_room"):
+                room_ids.add(item["old_room"])
 
     from imanage.schedule.models import Room, TalkSlot
     from imanage.submission.models import Submission
@@ -109,6 +160,17 @@ def deserialize_schedule_changes(serialized: dict, event) -> dict:
             room.id: room for room in Room.objects.filter(id__in=room_ids, event=event)
         }
 
+    return [
+        _build_schedule_changes(
+            serialized, submissions_by_code, slots_by_id, rooms_by_id
+        )
+        for serialized in serialized_list
+    ]
+
+
+def _build_schedule_changes(
+    serialized, submissions_by_code, slots_by_id, rooms_by_id
+) -> dict:
     changes = {
         "count": serialized["count"],
         "action": serialized["action"],
@@ -290,7 +352,46 @@ def invalidate_cached_schedule_changes(schedule):
     schedule.event.cache.delete(cache_key)
 
 
+def store_schedule_changes(schedule) -> dict:
+    """Calculates the changes of a released schedule compared to its
+    predecessor and stores them on the schedule. Released schedules don't
+    change, so this needs to happen only once per release."""
+    changes = calculate_schedule_changes(schedule)
+    schedule.serialized_changes = serialize_schedule_changes(changes)
+    schedule.event.schedules.filter(pk=schedule.pk).update(
+        serialized_changes=schedule.serialized_changes
+    )
+    return changes
+
+
+def prefetch_schedule_changes(schedules) -> list:
+    """Loads the stored changes of all given released schedules of one event
+    with a constant number of queries. Returns the schedules as a list."""
+    schedules = list(schedules)
+    stored = [
+        schedule
+        for schedule in schedules
+        if schedule.version and schedule.serialized_changes
+    ]
+    if stored:
+        all_changes = deserialize_many_schedule_changes(
+            [schedule.serialized_changes for schedule in stored], stored[0].event
+        )
+        for schedule, changes in zip(stored, all_changes):
+            schedule.__dict__["changes"] = changes
+    return schedules
+
+
 def get_cached_schedule_changes(schedule) -> dict:
+    if schedule.version:
+        # Released schedules store their changes on release. Schedules
+        # released before we started doing that get them stored now.
+        if schedule.serialized_changes:
+            return deserialize_schedule_changes(
+                schedule.serialized_changes, schedule.event
+            )
+        return store_schedule_changes(schedule)
+
     cache_key = f"schedule_{schedule.id}_changes"
     cached_data = schedule.event.cache.get(cache_key)
 
@@ -301,20 +402,15 @@ def get_cached_schedule_changes(schedule) -> dict:
 
     result = calculate_schedule_changes(schedule)
 
-    # Cache the result depending on schedule status:
-    # WIP schedules: 60 seconds cache
-    # Released schedules: 10 minutes cache
-    timeout = 60 if schedule.version is None else 600
-
+    # WIP schedules change all the time, so we only cache them briefly
     with suppress(Exception):
         serialized = serialize_schedule_changes(result)
-        schedule.event.cache.set(cache_key, json.dumps(serialized), timeout)
+        schedule.event.cache.set(cache_key, json.dumps(serialized), 60)
 
     # Update the unreleased changes flag when WIP schedule changes are recalculated
-    if schedule.version is None:
-        update_unreleased_schedule_changes(
-            schedule.event, _get_boolean_changes(schedule, result)
-        )
+    update_unreleased_schedule_changes(
+        schedule.event, _get_boolean_changes(schedule, result)
+    )
 
     return result
 
@@ -348,6 +444,54 @@ def update_unreleased_schedule_changes(event, value=None):
     event.cache.set(cache_key, value, 24 * 60 * 60)
 
 
+def copy_slots_to_schedule(slots, schedule, batch_size=SLOT_COPY_BATCH_SIZE):
+    """Copies the given slots to a new schedule in batches, without loading
+    full model instances or their related objects.
+
+    Equivalent to calling ``TalkSlot.copy_to_schedule`` on every slot.
+    """
+    from imanage.schedule.models import TalkSlot
+
+    fields = [
+        field.attname
+        for field in TalkSlot._meta.concrete_fields
+        if field.name not in ("id", "schedule", "revision")
+    ]
+    values = slots.order_by().values(*fields).iterator(chunk_size=batch_size)
+    for batch in batched(values, batch_size):
+        TalkSlot.objects.bulk_create(
+            [TalkSlot(schedule=schedule, **slot) for slot in batch]
+        )
+
+
+def _notification_progress_key(schedule):
+    return f"schedule_{schedule.pk}_notification_progress"
+
+
+def set_notification_progress(schedule, done, total, failed=False):
+    """Records how many speaker notifications of a schedule release have been
+    generated. ``total`` is ``None`` while the speakers are being collected."""
+    schedule.event.cache.set(
+        _notification_progress_key(schedule),
+        {"done": done, "total": total, "failed": failed},
+        24 * 60 * 60,
+    )
+
+
+def get_notification_progress(schedule) -> dict | None:
+    """Returns a dictionary with the ``done`` and ``total`` notification
+    counts and the ``failed`` flag, or ``None`` if no notifications are being
+    generated."""
+    return schedule.event.cache.get(_notification_progress_key(schedule))
+
+
+def has_pending_notifications(schedule) -> bool:
+    progress = get_notification_progress(schedule)
+    if not progress or progress["failed"]:
+        return False
+    return progress["total"] is None or progress["done"] < progress["total"]
+
+
 def freeze_schedule(
     schedule, name: str, user=None, notify_speakers: bool = True, comment: str = None
 ):
@@ -362,8 +506,8 @@ def freeze_schedule(
     if not name:
         raise Exception("Cannot create schedule version without a version name.")
 
-    from imanage.schedule.models import TalkSlot
-    from imanage.submission.models import SubmissionStates
+    from imanage.schedule.models import Schedule
+    from imanage.submission.models import Submission, SubmissionStates
 
     with transaction.atomic():
         schedule.version = name
@@ -371,34 +515,53 @@ def freeze_schedule(
         schedule.published = now()
 
         # Create WIP schedule first, to avoid race conditions
-        from imanage.schedule.models import Schedule
-
         wip_schedule = Schedule.objects.create(event=schedule.event)
 
         schedule.save(update_fields=["published", "version", "comment"])
         schedule.log_action("imanage.schedule.release", person=user, orga=True)
 
-        # Set visibility: confirmed submissions and breaks are visible, blockers remain hidden
-        schedule.talks.all().update(is_visible=False)
-        schedule.talks.filter(
-            models.Q(submission__state=SubmissionStates.CONFIRMED)
-            | models.Q(slot_type=SlotType.BREAK),
-            start__isnull=False,
-        ).update(is_visible=True)
+        # Set visibility: confirmed submissions and breaks are visible, blockers remain hidden.
+        # UPDATE queries can't use joins, so we use a subquery for the submission state.
+        confirmed = Submission.objects.filter(
+            event=schedule.event, state=SubmissionStates.CONFIRMED
+        ).values("pk")
+        schedule.talks.all().update(
+            is_visible=models.Case(
+                models.When(
+                    models.Q(submission_id__in=confirmed)
+                    | models.Q(slot_type=SlotType.BREAK),
+                    start__isnull=False,
+                    then=models.Value(True),
+                ),
+                default=models.Value(False),
+            )
+        )
 
         # Copy all talks to new WIP schedule
-        talks = []
-        for talk in schedule.talks.select_related("submission", "room").all():
-            talks.append(talk.copy_to_schedule(wip_schedule, save=False))
-        TalkSlot.objects.bulk_create(talks)
+        copy_slots_to_schedule(schedule.talks.all(), wip_schedule)
 
         # Delete blockers from the released schedule (they should only exist in WIP)
         schedule.talks.filter(slot_type=SlotType.BLOCKER).delete()
 
+    # Use a fresh object to avoid dealing with stale data
+    released = Schedule.objects.get(pk=schedule.pk)
+    store_schedule_changes(released)
+    schedule.serialized_changes = released.serialized_changes
+    schedule.__dict__.pop("changes", None)
+    schedule.__dict__.pop("speakers_concerned", None)
+
     if notify_speakers:
-        # Complete refresh to avoid dealing with stale data
-        schedule = schedule.__class__.objects.get(pk=schedule.pk)
-        schedule.generate_notifications(save=True)
+        # Generating notifications renders mails and calendar files for every
+        # speaker concerned, so we do it in the background, after the release
+        # has been committed.
+        from imanage.schedule.tasks import task_generate_schedule_notifications
+
+        set_notification_progress(schedule, done=0, total=None)
+        transaction.on_commit(
+            lambda: task_generate_schedule_notifications.apply_async(
+                kwargs={"schedule_id": schedule.pk}, ignore_result=True
+            )
+        )
 
     with suppress(AttributeError):
         del wip_schedule.event.wip_schedule
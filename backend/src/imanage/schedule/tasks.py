@@ -1,10 +1,14 @@
 # SPDX-FileCopyrightText: 2025-present Tobias Kunze
 # SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
 
-from django_scopes import scope
+import logging
+
+from django_scopes import scope, scopes_disabled
 
 from imanage.celery_app import app
 
+LOGGER = logging.getLogger(__name__)
+
 
 @app.task(name="imanage.schedule.update_unreleased_schedule_changes")
 def task_update_unreleased_schedule_changes(event=None, value=None):
@@ -14,3 +18,30 @@ def task_update_unreleased_schedule_changes(event=None, value=None):
     event = Event.objects.get(slug=event)
     with scope(event=event):
         update_unreleased_schedule_changes(event=event, value=value)
+
+
+@app.task(name="imanage.schedule.generate_notifications")
+def task_generate_schedule_notifications(*, schedule_id: int):
+    from imanage.schedule.models import Schedule
+    from imanage.schedule.services import set_notification_progress
+
+    with scopes_disabled():
+        schedule = (
+            Schedule.objects.select_related("event").filter(pk=schedule_id).first()
+        )
+    if not schedule:
+        LOGGER.error(f"Could not find Schedule ID {schedule_id} for notifications.")
+        return
+
+    with scope(event=schedule.event):
+        try:
+            mails = schedule.generate_notifications(
+                save=True,
+                progress=lambda done, total: set_notification_progress(
+                    schedule, done=done, total=total
+                ),
+            )
+        except Exception:
+            set_notification_progress(schedule, done=0, total=None, failed=True)
+            raise
+        set_notification_progress(schedule, done=len(mails), total=len(mails))
@@ -1,6 +1,20 @@
 // SPDX-FileCopyrightText: 2022-present Tobias Kunze
 // SPDX-License-Identifier: Apache-2.0
 
+// Selects only contain their selected options, the others are shared
+// between all selects with the same choice list.
+const addChoices = (select, choiceLists) => {
+    const choices = choiceLists[select.dataset.choices]
+    if (!choices) return
+    const selected = new Set(Array.from(select.options).map(option => option.value))
+    const fragment = document.createDocumentFragment()
+    choices.forEach(([value, label]) => {
+        if (selected.has(String(value))) return
+        fragment.appendChild(new Option(label, value))
+    })
+    select.appendChild(fragment)
+}
+
 const addReviewData = () => {
     const reviewMappingElement = document.getElementById('review-mapping')
     if (!reviewMappingElement) return
@@ -13,6 +27,9 @@ const addReviewData = () => {
         return
     }
 
+    const choicesElement = document.getElementById('assignment-choices')
+    const choiceLists = choicesElement ? JSON.parse(choicesElement.textContent) : {}
+
     const enhancedSelects = document.querySelectorAll('select.enhanced')
     const urlParams = new URLSearchParams(window.location.search)
     const direction = urlParams.get('direction') || 'reviewer'
@@ -34,6 +51,7 @@ const addReviewData = () => {
         if (select._choicesInstance) {
             select._choicesInstance.destroy()
         }
+        addChoices(select, choiceLists)
 
         Array.from(select.options).forEach(option => {
             const optionId = parseInt(option.value)
@@ -0,0 +1,25 @@
+// SPDX-FileCopyrightText: 2026-present Tobias Kunze
+// SPDX-License-Identifier: Apache-2.0
+
+/*
+ * Only submit the rows that were changed, so that the server only has to
+ * validate and save those.
+ */
+const bulkReviewForm = document.querySelector("#bulk-review")
+
+if (bulkReviewForm) {
+    const markChanged = (e) => {
+        const row = e.target.closest("tr")
+        if (row) row.dataset.changed = "true"
+    }
+    bulkReviewForm.addEventListener("input", markChanged)
+    bulkReviewForm.addEventListener("change", markChanged)
+    bulkReviewForm.addEventListener("submit", () => {
+        bulkReviewForm.querySelectorAll("tbody tr").forEach((row) => {
+            if (row.dataset.changed) return
+            row.querySelectorAll("input, textarea, select").forEach((input) => {
+                input.disabled = true
+            })
+        })
+    })
+}
@@ -6,10 +6,11 @@
 
 import tempfile
 import unicodedata
+from functools import cache
 
 import reportlab.rl_config
 from django.contrib.staticfiles import finders
-from django.http import HttpResponse
+from django.core.files import File
 from django.utils.html import conditional_escape
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
@@ -23,6 +24,8 @@
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import BaseDocTemplate, Flowable, Frame, PageTemplate, Paragraph
 
+from imanage.submission.models import SubmissionStates
+
 reportlab.rl_config.TTFSearchPath.append(finders.find("fonts"))
 pdfmetrics.registerFont(TTFont("Muli", "mulish-v12-latin-ext-regular.ttf"))
 pdfmetrics.registerFont(TTFont("Muli-Italic", "mulish-v12-latin-ext-italic.ttf"))
@@ -43,14 +46,31 @@ def _text(text, max_length=None):
     return text
 
 
+# Submissions are loaded in chunks of this size, with their relations
+CARD_CHUNK_SIZE = 500
+
+
 class SubmissionCard(Flowable):
     def __init__(self, submission, styles, width):
         super().__init__()
-        self.submission = submission
         self.styles = styles
         self.width = width
-        self.height = min(2.5 * max(submission.get_duration(), 30) * mm, A4[1])
+        # Cards only keep the text they need, so that the story doesn't hold on
+        # to every submission and its relations until the PDF is built.
+        duration = submission.get_duration()
+        self.height = min(2.5 * max(duration, 30) * mm, A4[1])
         self.text_location = 0
+        self.submission_type = submission.submission_type.name
+        self.url = submission.orga_urls.quick_schedule.full()
+        self.title = submission.title
+        self.speakers = ", ".join(
+            speaker.get_display_name() for speaker in submission.speakers.all()
+        )
+        self.meta = _("{} minutes, #{}, {}, {}").format(
+            duration, submission.code, submission.content_locale, submission.state
+        )
+        self.abstract = submission.abstract
+        self.notes = submission.notes
 
     def coord(self, x, y, unit=1):
         """http://stackoverflow.com/questions/4726011/wrap-text-in-a-table-
@@ -68,12 +88,10 @@ def draw(self):
 
         self.canv.rotate(90)
         self.canv.setFont("Titillium-Bold", 16)
-        self.canv.drawString(
-            25 * mm, -12 * mm, _text(self.submission.submission_type.name)
-        )
+        self.canv.drawString(25 * mm, -12 * mm, _text(self.submission_type))
         self.canv.rotate(-90)
 
-        qr_code = qr.QrCodeWidget(self.submission.orga_urls.quick_schedule.full())
+        qr_code = qr.QrCodeWidget(self.url)
         bounds = qr_code.getBounds()
         width = bounds[2] - bounds[0]
         height = bounds[3] - bounds[1]
@@ -82,43 +100,25 @@ def draw(self):
         renderPDF.draw(drawing, self.canv, 15, 10)
 
         self.render_paragraph(
-            Paragraph(_text(self.submission.title), style=self.styles["Title"]), gap=10
+            Paragraph(_text(self.title), style=self.styles["Title"]), gap=10
         )
         self.render_paragraph(
-            Paragraph(
-                _text(
-                    ", ".join(
-                        s.get_display_name() for s in self.submission.speakers.all()
-                    )
-                ),
-                style=self.styles["Speaker"],
-            )
-        )
-        self.render_paragraph(
-            Paragraph(
-                _("{} minutes, #{}, {}, {}").format(
-                    self.submission.get_duration(),
-                    self.submission.code,
-                    self.submission.content_locale,
-                    self.submission.state,
-                ),
-                style=self.styles["Meta"],
-            )
+            Paragraph(_text(self.speakers), style=self.styles["Speaker"])
         )
+        self.render_paragraph(Paragraph(self.meta, style=self.styles["Meta"]))
 
-        if self.submission.abstract:
+        if self.abstract:
             self.render_paragraph(
-                Paragraph(
-                    _text(self.submission.abstract, 140), style=self.styles["Meta"]
-                )
+                Paragraph(_text(self.abstract, 140), style=self.styles["Meta"])
             )
 
-        if self.submission.notes:
+        if self.notes:
             self.render_paragraph(
-                Paragraph(_text(self.submission.notes, 140), style=self.styles["Meta"])
+                Paragraph(_text(self.notes, 140), style=self.styles["Meta"])
             )
 
 
+@cache
 def get_style():
     stylesheet = StyleSheet1()
     stylesheet.add(
@@ -136,15 +136,33 @@ def get_style():
     return stylesheet
 
 
+def get_card_submissions(event):
+    return (
+        event.submissions.select_related("event", "submission_type")
+        .prefetch_related("speakers")
+        .filter(
+            state__in=[
+                SubmissionStates.ACCEPTED,
+                SubmissionStates.CONFIRMED,
+                SubmissionStates.SUBMITTED,
+            ]
+        )
+        .order_by("pk")
+    )
+
+
 def get_story(doc, queryset):
     styles = get_style()
-    story = []
-    for s in queryset:
-        story.append(SubmissionCard(s, styles, doc.width / 2))
-    return story
+    return [
+        SubmissionCard(submission, styles, doc.width / 2)
+        for submission in queryset.iterator(chunk_size=CARD_CHUNK_SIZE)
+    ]
 
 
-def build_cards(queryset, event):
+def build_cards(queryset, cached_file):
+    """Renders the cards for all submissions in ``queryset`` and stores the
+    PDF in ``cached_file``. The PDF is written to a temporary file rather
+    than kept in memory."""
     with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
         doc = BaseDocTemplate(
             f.name,
@@ -188,12 +206,11 @@ def build_cards(queryset, event):
         )
         doc.build(get_story(doc, queryset))
         f.seek(0)
-        timestamp = now().strftime("%Y-%m-%d-%H%M")
-        r = HttpResponse(
-            content_type="application/pdf",
-            headers={
-                "Content-Disposition": f'attachment; filename="{event.slug}_submission_cards_{timestamp}.pdf"'
-            },
-        )
-        r.write(f.read())
-        return r
+        cached_file.file.save(cached_file.filename, File(f), save=False)
+        cached_file.save(update_fields=("file",))
+    return cached_file
+
+
+def get_cards_filename(event):
+    timestamp = now().strftime("%Y-%m-%d-%H%M")
+    return f"{event.slug}_submission_cards_{timestamp}.pdf"
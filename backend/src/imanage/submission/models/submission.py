@@ -15,7 +15,7 @@
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q
 from django.db.models.fields.files import FieldFile
 from django.utils.crypto import get_random_string
@@ -502,11 +502,16 @@ def update_duration(self):
 
         Should be called whenever the duration changes.
         """
-        for slot in self.event.wip_schedule.talks.filter(
-            submission=self, start__isnull=False
-        ):
-            slot.end = slot.start + dt.timedelta(minutes=self.get_duration())
-            slot.save()
+        schedule = self.event.wip_schedule
+        with transaction.atomic():
+            slots = list(schedule.talks.filter(submission=self, start__isnull=False))
+            if not slots:
+                return
+            revision = schedule.bump_revision()
+            for slot in slots:
+                slot.end = slot.start + dt.timedelta(minutes=self.get_duration())
+                slot.revision = revision
+                slot.save()
 
     update_duration.alters_data = True
 
@@ -554,6 +559,33 @@ def update_review_scores(self):
         for review in self.reviews.all():
             review.save(update_score=True)
 
+    def check_state_change(self, new_state):
+        """Raises a SubmissionError with a helpful message if this Submission
+        can't move to the new state (based on
+        SubmissionStates.valid_next_states)."""
+        if new_state in SubmissionStates.valid_next_states.get(self.state, []):
+            return
+        source_states = (
+            src
+            for src, dsts in SubmissionStates.valid_next_states.items()
+            if new_state in dsts
+        )
+
+        # build an error message mentioning all states, which are valid source states for the desired new state.
+        trans_or = pgettext_lazy(
+            'used in talk confirm/accept/reject/...-errors, like "... must be accepted OR foo OR bar ..."',
+            " or ",
+        )
+        state_names = dict(SubmissionStates.get_choices())
+        source_states = trans_or.join(
+            str(state_names[state]) for state in source_states
+        )
+        raise SubmissionError(
+            _("Proposal must be {src_states} not {state} to be {new_state}.").format(
+                src_states=source_states, state=self.state, new_state=new_state
+            )
+        )
+
     def _set_state(self, new_state, force=False, person=None):
         """Check if the new state is valid for this Submission (based on
         SubmissionStates.valid_next_states).
@@ -561,55 +593,31 @@ def _set_state(self, new_state, force=False, person=None):
         If yes, set it and save the object. if no, raise a
         SubmissionError with a helpful message.
         """
-        valid_next_states = SubmissionStates.valid_next_states.get(self.state, [])
-
         if self.state == new_state:
             self.pending_state = None
             self.save(update_fields=["state", "pending_state"])
             self.update_talk_slots()
             return
-        if force or new_state in valid_next_states:
-            old_state = self.state
-            self.state = new_state
-            self.pending_state = None
-            if new_state in (
-                SubmissionStates.REJECTED,
-                SubmissionStates.DELETED,
-                SubmissionStates.CANCELED,
-                SubmissionStates.WITHDRAWN,
-            ):
-                self.is_featured = False
-            self.save(update_fields=["state", "pending_state"])
-            self.update_talk_slots()
-            submission_state_change.send_robust(
-                self.event,
-                submission=self,
-                old_state=old_state if old_state != SubmissionStates.DRAFT else None,
-                user=person,
-            )
-        else:
-            source_states = (
-                src
-                for src, dsts in SubmissionStates.valid_next_states.items()
-                if new_state in dsts
-            )
-
-            # build an error message mentioning all states, which are valid source states for the desired new state.
-            trans_or = pgettext_lazy(
-                'used in talk confirm/accept/reject/...-errors, like "... must be accepted OR foo OR bar ..."',
-                " or ",
-            )
-            state_names = dict(SubmissionStates.get_choices())
-            source_states = trans_or.join(
-                str(state_names[state]) for state in source_states
-            )
-            raise SubmissionError(
-                _(
-                    "Proposal must be {src_states} not {state} to be {new_state}."
-                ).format(
-                    src_states=source_states, state=self.state, new_state=new_state
-                )
-            )
+        if not force:
+            self.check_state_change(new_state)
+        old_state = self.state
+        self.state = new_state
+        self.pending_state = None
+        if new_state in (
+            SubmissionStates.REJECTED,
+            SubmissionStates.DELETED,
+            SubmissionStates.CANCELED,
+            SubmissionStates.WITHDRAWN,
+        ):
+            self.is_featured = False
+        self.save(update_fields=["state", "pending_state"])
+        self.update_talk_slots()
+        submission_state_change.send_robust(
+            self.event,
+            submission=self,
+            old_state=old_state if old_state != SubmissionStates.DRAFT else None,
+            user=person,
+        )
 
     def update_talk_slots(self):
         """Makes sure the correct amount of.
@@ -626,40 +634,32 @@ def update_talk_slots(self):
             self.state in SubmissionStates.accepted_states
             or self.pending_state in SubmissionStates.accepted_states
         )
-
-        if not scheduling_allowed:
-            TalkSlot.objects.filter(
-                submission=self, schedule=self.event.wip_schedule
-            ).delete()
-            return
-
-        slot_count_current = TalkSlot.objects.filter(
-            submission=self,
-            schedule=self.event.wip_schedule,
-        ).count()
-        diff = slot_count_current - self.slot_count
-
-        if diff > 0:
-            # We build a list of all IDs to delete as .delete() doesn't work on sliced querysets.
-            # We delete unscheduled talks first.
-            talks_to_delete = (
-                TalkSlot.objects.filter(
-                    submission=self,
-                    schedule=self.event.wip_schedule,
-                )
-                .order_by("start", "room", "is_visible")[:diff]
-                .values_list("id", flat=True)
+        schedule = self.event.wip_schedule
+        slots = TalkSlot.objects.filter(submission=self, schedule=schedule)
+
+        with transaction.atomic():
+            revision = schedule.bump_revision()
+            if not scheduling_allowed:
+                slots.delete()
+                return
+
+            diff = slots.count() - self.slot_count
+            if diff > 0:
+                # We build a list of all IDs to delete as .delete() doesn't work
+                # on sliced querysets. We delete unscheduled talks first.
+                talks_to_delete = slots.order_by("start", "room", "is_visible")[
+                    :diff
+                ].values_list("id", flat=True)
+                TalkSlot.objects.filter(pk__in=list(talks_to_delete)).delete()
+            elif diff < 0:
+                for __ in repeat(None, abs(diff)):
+                    TalkSlot.objects.create(
+                        submission=self, schedule=schedule, revision=revision
+                    )
+            is_visible = self.state == SubmissionStates.CONFIRMED
+            slots.exclude(is_visible=is_visible).update(
+                is_visible=is_visible, revision=revision
             )
-            TalkSlot.objects.filter(pk__in=list(talks_to_delete)).delete()
-        elif diff < 0:
-            for __ in repeat(None, abs(diff)):
-                TalkSlot.objects.create(
-                    submission=self,
-                    schedule=self.event.wip_schedule,
-                )
-        TalkSlot.objects.filter(
-            submission=self, schedule=self.event.wip_schedule
-        ).update(is_visible=self.state == SubmissionStates.CONFIRMED)
 
     update_talk_slots.alters_data = True
 
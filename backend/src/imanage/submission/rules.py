@@ -380,8 +380,8 @@ def get_reviewable_submissions(event, user, queryset=None):
     queryset = limit_for_reviewers(queryset, event, user, add_assignments=True)
     queryset = queryset.annotate(review_count=Count("reviews"))
     # This is not randomised, because order_by("review_count", "?") sets all annotated
-    # review_count values to 1.
-    return queryset.order_by("-is_assigned", "review_count")
+    # review_count values to 1. The primary key keeps pages stable, as most rows tie.
+    return queryset.order_by("-is_assigned", "review_count", "pk")
 
 
 def get_missing_reviews(event, user, ignore=None):
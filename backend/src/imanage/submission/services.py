@@ -0,0 +1,232 @@
+# SPDX-FileCopyrightText: 2026-present Tobias Kunze
+# SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
+
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.utils.timezone import now
+
+from imanage.common.exceptions import SubmissionError
+from imanage.common.models import ActivityLog
+from imanage.common.text.serialize import json_roundtrip
+from imanage.submission.models import Review, Submission, SubmissionStates
+from imanage.submission.signals import submission_state_change
+
+# States that can't be featured, see Submission._set_state
+UNFEATURED_STATES = (
+    SubmissionStates.REJECTED,
+    SubmissionStates.DELETED,
+    SubmissionStates.CANCELED,
+    SubmissionStates.WITHDRAWN,
+)
+
+
+def update_talk_slots(event, submissions):
+    """Does what ``Submission.update_talk_slots`` does for all given
+    submissions at once, with a fixed number of queries (plus one per
+    submission that has more slots than it should)."""
+    from imanage.schedule.models import TalkSlot
+
+    schedule = event.wip_schedule
+    slots = TalkSlot.objects.filter(schedule=schedule)
+    scheduled, unscheduled = [], []
+    for submission in submissions:
+        if (
+            submission.state in SubmissionStates.accepted_states
+            or submission.pending_state in SubmissionStates.accepted_states
+        ):
+            scheduled.append(submission)
+        else:
+            unscheduled.append(submission)
+
+    with transaction.atomic():
+        revision = schedule.bump_revision()
+        if unscheduled:
+            slots.filter(submission__in=unscheduled).delete()
+        if not scheduled:
+            return
+
+        current_counts = dict(
+            slots.filter(submission__in=scheduled)
+            .order_by()
+            .values_list("submission_id")
+            .annotate(count=models.Count("id"))
+        )
+        new_slots = []
+        for submission in scheduled:
+            diff = current_counts.get(submission.pk, 0) - submission.slot_count
+            if diff > 0:
+                # As in Submission.update_talk_slots, unscheduled talks go first
+                talks_to_delete = (
+                    slots.filter(submission=submission)
+                    .order_by("start", "room", "is_visible")[:diff]
+                    .values_list("id", flat=True)
+                )
+                TalkSlot.objects.filter(pk__in=list(talks_to_delete)).delete()
+            elif diff < 0:
+                new_slots += [
+                    TalkSlot(
+                        submission=submission, schedule=schedule, revision=revision
+                    )
+                    for __ in range(abs(diff))
+                ]
+        TalkSlot.objects.bulk_create(new_slots)
+        confirmed = [
+            submission
+            for submission in scheduled
+            if submission.state == SubmissionStates.CONFIRMED
+        ]
+        slots.filter(submission__in=confirmed, is_visible=False).update(
+            is_visible=True, revision=revision
+        )
+        slots.filter(submission__in=scheduled, is_visible=True).exclude(
+            submission__in=confirmed
+        ).update(is_visible=False, revision=revision)
+
+
+def bulk_set_state(event, submissions, new_state, person=None, orga=True):
+    """Moves all given submissions to ``new_state``, like calling
+    ``accept()``, ``reject()`` etc. on each of them, but with one
+    transaction, one bulk update, one batch of log entries and batched slot
+    updates.
+
+    Submissions that can't move to the new state are skipped. Returns a
+    dictionary of submission code to ``None`` on success or the error
+    message otherwise. State mails are queued after the transaction has
+    succeeded.
+    """
+    results = {}
+    changed = []
+    previous_states = {}
+    for submission in submissions:
+        previous = submission.state
+        if previous != new_state:
+            try:
+                submission.check_state_change(new_state)
+            except SubmissionError as e:
+                results[submission.code] = str(e)
+                continue
+            submission.state = new_state
+            if new_state in UNFEATURED_STATES:
+                submission.is_featured = False
+        submission.pending_state = None
+        previous_states[submission.pk] = previous
+        results[submission.code] = None
+        changed.append(submission)
+
+    if not changed:
+        return results
+
+    action = f"imanage.submission.{SubmissionStates.method_names[new_state]}"
+    content_type = ContentType.objects.get_for_model(Submission)
+    with transaction.atomic():
+        Submission.objects.bulk_update(
+            changed, ["state", "pending_state", "is_featured"]
+        )
+        update_talk_slots(event, changed)
+        ActivityLog.objects.bulk_create(
+            [
+                ActivityLog(
+                    event=event,
+                    person=person,
+                    content_type=content_type,
+                    object_id=submission.pk,
+                    action_type=action,
+                    data=json_roundtrip(
+                        {
+                            "previous": previous_states[submission.pk],
+                            "from_pending": False,
+                        }
+                    ),
+                    is_orga_action=orga,
+                )
+                for submission in changed
+            ]
+        )
+
+    for submission in changed:
+        previous = previous_states[submission.pk]
+        if previous == new_state:
+            continue
+        submission_state_change.send_robust(
+            event,
+            submission=submission,
+            old_state=previous if previous != SubmissionStates.DRAFT else None,
+            user=person,
+        )
+        if (
+            new_state == SubmissionStates.ACCEPTED
+            and previous not in SubmissionStates.accepted_states
+        ) or new_state == SubmissionStates.REJECTED:
+            submission.send_state_mail()
+    return results
+
+
+def update_review_assignments(added=(), removed=()):
+    """Adds and removes reviewer assignments, given as ``(submission_id,
+    user_id)`` pairs, with one bulk insert and one delete on the through
+    table, instead of a ``.set()`` call per submission or reviewer."""
+    through = Submission.assigned_reviewers.through
+    with transaction.atomic():
+        if removed:
+            removed_by_submission = defaultdict(set)
+            for submission_id, user_id in removed:
+                removed_by_submission[submission_id].add(user_id)
+            query = models.Q()
+            for submission_id, user_ids in removed_by_submission.items():
+                query |= models.Q(submission_id=submission_id, user_id__in=user_ids)
+            through.objects.filter(query).delete()
+        if added:
+            through.objects.bulk_create(
+                [
+                    through(submission_id=submission_id, user_id=user_id)
+                    for submission_id, user_id in added
+                ],
+                ignore_conflicts=True,
+            )
+
+
+def save_reviews(reviews):
+    """Saves ``(review, scores)`` pairs, where ``scores`` are the
+    ``ReviewScore`` objects chosen for the review. This does what saving each
+    review with ``scores.set()`` and ``update_score()`` does, but with one
+    insert, one update and one rewrite of the score rows for all reviews.
+
+    The score categories and their ``limit_tracks`` should be prefetched, as
+    the review scores are calculated from them without further queries."""
+    reviews = list(reviews)
+    new_reviews, existing_reviews = [], []
+    for review, scores in reviews:
+        track_id = review.submission.track_id
+        review.score = Review.calculate_score(
+            [
+                score
+                for score in scores
+                if score.category.active
+                and (
+                    not (limit_tracks := score.category.limit_tracks.all())
+                    or track_id in {track.pk for track in limit_tracks}
+                )
+            ]
+        )
+        if review.pk:
+            review.updated = now()
+            existing_reviews.append(review)
+        else:
+            new_reviews.append(review)
+
+    through = Review.scores.through
+    with transaction.atomic():
+        Review.objects.bulk_create(new_reviews)
+        Review.objects.bulk_update(
+            existing_reviews, ["text", "internal_text", "score", "updated"]
+        )
+        through.objects.filter(review__in=existing_reviews).delete()
+        through.objects.bulk_create(
+            [
+                through(review_id=review.pk, reviewscore_id=score.pk)
+                for review, scores in reviews
+                for score in scores
+            ]
+        )
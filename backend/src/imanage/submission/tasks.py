@@ -3,9 +3,11 @@
 
 import logging
 
+from django.utils.translation import override
 from django_scopes import scope, scopes_disabled
 
 from imanage.celery_app import app
+from imanage.common.models import CachedFile
 from imanage.event.models import Event
 
 LOGGER = logging.getLogger(__name__)
@@ -24,3 +26,20 @@ def recalculate_all_review_scores(*, event_id: int):
     with scope(event=event):
         for submission in event.submissions.all():
             submission.update_review_scores()
+
+
+@app.task(name="imanage.submission.build_cards")
+def task_build_cards(*, event_id: int, cached_file_id: str, locale: str = None):
+    from imanage.submission.cards import build_cards, get_card_submissions
+
+    with scopes_disabled():
+        event = Event.objects.filter(pk=event_id).first()
+        cached_file = CachedFile.objects.filter(pk=cached_file_id).first()
+    if not event or not cached_file:
+        LOGGER.error(
+            f"Could not find Event ID {event_id} or file {cached_file_id} for cards."
+        )
+        return
+
+    with scope(event=event), override(locale or event.locale):
+        build_cards(get_card_submissions(event), cached_file)
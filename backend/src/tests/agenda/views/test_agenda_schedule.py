@@ -10,6 +10,8 @@
 from django.urls import reverse
 from django_scopes import scope
 
+from imanage.agenda.views.speaker import SpeakerList
+
 
 @pytest.mark.django_db
 @pytest.mark.usefixtures("other_slot")
@@ -153,6 +155,28 @@ def test_speaker_list(client, django_assert_num_queries, event, speaker):
     assert speaker.name in response.text
 
 
+@pytest.mark.django_db
+@pytest.mark.usefixtures("slot", "other_slot")
+def test_speaker_list_pagination(
+    client, django_assert_num_queries, event, speaker, other_speaker, monkeypatch
+):
+    monkeypatch.setattr(SpeakerList, "paginate_by", 1)
+    url = event.urls.speakers
+    with django_assert_num_queries(9):
+        response = client.get(url, follow=True)
+    assert response.status_code == 200
+    assert speaker.name in response.text
+    assert other_speaker.name not in response.text
+
+    with django_assert_num_queries(9):
+        response = client.get(url + "?page=2", follow=True)
+    assert response.status_code == 200
+    assert other_speaker.name in response.text
+    assert "Albrecht Dürer" in response.text
+    assert speaker.name not in response.text
+    assert "Lametta" not in response.text
+
+
 @pytest.mark.django_db
 @pytest.mark.usefixtures("other_slot")
 def test_speaker_page(
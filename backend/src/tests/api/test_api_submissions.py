@@ -1308,6 +1308,99 @@ def test_orga_cannot_make_submitted_submission_readonly_token(
         )
 
 
+@pytest.mark.django_db
+def test_orga_can_bulk_accept_submissions(
+    client, orga_user_write_token, submission, rejected_submission
+):
+    with scope(event=submission.event):
+        mail_count = submission.event.queued_mails.count()
+    response = client.post(
+        submission.event.api_urls.submissions + "bulk-state/",
+        data={
+            "submissions": [submission.code.lower(), rejected_submission.code],
+            "state": "accepted",
+        },
+        content_type="application/json",
+        headers={
+            "Authorization": f"Token {orga_user_write_token.token}",
+        },
+    )
+    assert response.status_code == 200, response.text
+    assert response.data == [
+        {
+            "code": submission.code,
+            "success": True,
+            "state": "accepted",
+            "detail": None,
+        },
+        {
+            "code": rejected_submission.code,
+            "success": True,
+            "state": "accepted",
+            "detail": None,
+        },
+    ]
+    with scope(event=submission.event):
+        for sub in (submission, rejected_submission):
+            sub.refresh_from_db()
+            assert sub.state == SubmissionStates.ACCEPTED
+            assert sub.slots.filter(schedule=sub.event.wip_schedule).count() == 1
+            assert (
+                sub.logged_actions()
+                .filter(action_type="imanage.submission.accept")
+                .count()
+                == 1
+            )
+        assert submission.event.queued_mails.count() == mail_count + 2
+
+
+@pytest.mark.django_db
+def test_orga_bulk_state_reports_errors(
+    client, orga_user_write_token, submission, accepted_submission
+):
+    response = client.post(
+        submission.event.api_urls.submissions + "bulk-state/",
+        data={
+            "submissions": [submission.code, accepted_submission.code, "NOPE"],
+            "state": "confirmed",
+        },
+        content_type="application/json",
+        headers={
+            "Authorization": f"Token {orga_user_write_token.token}",
+        },
+    )
+    assert response.status_code == 200, response.text
+    assert [result["success"] for result in response.data] == [False, True, False]
+    assert response.data[0]["state"] == "submitted"
+    assert response.data[2]["detail"] == "Not found."
+    with scope(event=submission.event):
+        submission.refresh_from_db()
+        accepted_submission.refresh_from_db()
+        assert submission.state == SubmissionStates.SUBMITTED
+        assert accepted_submission.state == SubmissionStates.CONFIRMED
+        assert accepted_submission.slots.get(
+            schedule=submission.event.wip_schedule
+        ).is_visible
+
+
+@pytest.mark.django_db
+def test_orga_cannot_bulk_change_state_readonly_token(
+    client, orga_user_token, submission
+):
+    response = client.post(
+        submission.event.api_urls.submissions + "bulk-state/",
+        data={"submissions": [submission.code], "state": "accepted"},
+        content_type="application/json",
+        headers={
+            "Authorization": f"Token {orga_user_token.token}",
+        },
+    )
+    assert response.status_code == 403
+    with scope(event=submission.event):
+        submission.refresh_from_db()
+        assert submission.state == SubmissionStates.SUBMITTED
+
+
 @pytest.mark.django_db
 def test_orga_can_add_speaker_to_submission(
     client, orga_user_write_token, submission, speaker
@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: 2026-present Tobias Kunze
+# SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
+
+import pytest
+
+
+def get(client, url, **kwargs):
+    """Requests ``url`` and reads the full response, so that streamed
+    responses run all their queries inside the measurement."""
+    response = client.get(url, follow=True, **kwargs)
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url", ("schedule_widget_data", "frab_json", "frab_xml", "ical")
+)
+def benchmark_schedule_exports(client, large_event, benchmark, url):
+    response = benchmark(url, lambda: get(client, getattr(large_event.urls, url)))
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "endpoint,expand",
+    (
+        ("submissions", "speakers,track,submission_type,slots.room"),
+        ("speakers", "submissions"),
+    ),
+)
+def benchmark_api_lists(
+    client, large_event, benchmark_api_headers, benchmark, endpoint, expand
+):
+    url = f"{getattr(large_event.api_urls, endpoint)}?expand={expand}"
+    response = benchmark(
+        f"api_{endpoint}",
+        lambda: get(client, url, headers=benchmark_api_headers),
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "name,url",
+    (
+        ("orga_talk_list", "{schedule}api/talks/"),
+        ("orga_review_dashboard", "{reviews}"),
+        ("orga_submission_list", "{submissions}"),
+    ),
+)
+def benchmark_orga_pages(benchmark_orga_client, large_event, benchmark, name, url):
+    urls = large_event.orga_urls
+    url = url.format(
+        schedule=urls.schedule, reviews=urls.reviews, submissions=urls.submissions
+    )
+    response = benchmark(name, lambda: get(benchmark_orga_client, url))
+    assert response.status_code == 200
@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: 2026-present Tobias Kunze
+# SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_scopes import scopes_disabled
+
+BUDGET_FILE = Path(__file__).parent / "budgets.json"
+SCALE = float(os.environ.get("IMANAGE_BENCHMARK_SCALE") or 1)
+TOLERANCE = float(os.environ.get("IMANAGE_BENCHMARK_TOLERANCE") or 1.5)
+UPDATE = bool(os.environ.get("IMANAGE_BENCHMARK_UPDATE"))
+SLUG = "benchcon"
+# At scale 1, this is a fifth of a large production event
+EVENT_SIZE = {
+    "submissions": 1000,
+    "speakers": 800,
+    "reviews": 12000,
+    "rooms": 10,
+    "slots": 400,
+    "log_entries": 5000,
+}
+
+RESULTS = {}
+
+
+def load_budgets():
+    return json.loads(BUDGET_FILE.read_text())
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not RESULTS:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'path':<32} {'queries':>8} {'seconds':>8}")
+    for name, result in sorted(RESULTS.items()):
+        terminalreporter.write_line(
+            f"{name:<32} {result['queries']:>8} {result['seconds']:>8.3f}"
+        )
+    if UPDATE:
+        budgets = load_budgets()
+        budgets["scale"] = SCALE
+        budgets["paths"].update(RESULTS)
+        BUDGET_FILE.write_text(json.dumps(budgets, indent=2, sort_keys=True) + "\n")
+        terminalreporter.write_line(f"Budgets written to {BUDGET_FILE}.")
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    """Generates the benchmark event once per session. Benchmarks run in
+    transactions on top of it, so they can't change it for each other."""
+    from imanage.person.models import User, UserApiToken
+    from imanage.person.models.auth_token import ENDPOINTS
+
+    with django_db_blocker.unblock(), scopes_disabled():
+        user = User.objects.create_superuser(
+            email="benchmark@example.org", name="Benchmark", password="benchmark"
+        )
+        call_command(
+            "create_test_event",
+            slug=SLUG,
+            seed=1,
+            schedules=3,
+            **{key: int(value * SCALE) for key, value in EVENT_SIZE.items()},
+        )
+        token = UserApiToken.objects.create(name="benchmark", user=user)
+        token.events.set(user.get_events_with_any_permission())
+        token.endpoints = {key: ["list", "retrieve"] for key in ENDPOINTS}
+        token.save()
+
+
+@pytest.fixture
+def large_event(django_db_setup):
+    from imanage.event.models import Event
+
+    with scopes_disabled():
+        return Event.objects.get(slug=SLUG)
+
+
+@pytest.fixture
+def benchmark_user(django_db_setup):
+    from imanage.person.models import User
+
+    return User.objects.get(email="benchmark@example.org")
+
+
+@pytest.fixture
+def benchmark_orga_client(benchmark_user, client):
+    client.force_login(benchmark_user)
+    return client
+
+
+@pytest.fixture
+def benchmark_api_headers(benchmark_user):
+    with scopes_disabled():
+        token = benchmark_user.api_tokens.get(name="benchmark")
+    return {"Authorization": f"Token {token.token}"}
+
+
+@pytest.fixture
+def benchmark():
+    """Returns a function that calls ``func``, records its query count and
+    run time under ``name``, and fails if either exceeds the stored budget.
+    Caches are cleared first, so that cached responses don't hide queries."""
+    budgets = load_budgets()
+
+    def measure(name, func):
+        for cache in caches.all():
+            cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+        RESULTS[name] = {"queries": len(context), "seconds": round(elapsed, 3)}
+        if UPDATE:
+            return result
+        budget = budgets["paths"].get(name)
+        assert budget, (
+            f"{name} has no budget yet. Record one with IMANAGE_BENCHMARK_UPDATE=1."
+        )
+        assert len(context) <= budget["queries"], (
+            f"{name} ran {len(context)} queries, the budget is {budget['queries']}."
+        )
+        if budgets["scale"] == SCALE:
+            assert elapsed <= budget["seconds"] * TOLERANCE, (
+                f"{name} took {elapsed:.3f}s, the budget is {budget['seconds']:.3f}s."
+            )
+        return result
+
+    return measure
@@ -1,12 +1,21 @@
 # SPDX-FileCopyrightText: 2019-present Tobias Kunze
 # SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
 
+from pathlib import Path
+
 import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
 from django.http import HttpResponseNotAllowed
 from django_scopes import scope
 from i18nfield.strings import LazyI18nString
 
-from imanage.cfp.flow import BaseCfPStep, i18n_string
+from imanage.cfp.flow import (
+    BaseCfPStep,
+    LinkedTemporaryUpload,
+    TemporaryUpload,
+    i18n_string,
+)
 from imanage.person.forms.profile import SpeakerProfileForm
 from imanage.submission.forms.submission import InfoForm
 
@@ -288,3 +297,50 @@ def test_speaker_profile_form_avatar_required_matches_cfp(
         # Widget has hide-optional class when avatar is required
         widget_class = form.fields["avatar"].widget.attrs.get("class", "")
         assert ("hide-optional" in widget_class) is expect_hide_optional
+
+
+def test_temporary_upload_opens_lazily_and_reopens(tmp_path):
+    storage = FileSystemStorage(str(tmp_path))
+    name = storage.save("upload.txt", ContentFile(b"content"))
+    upload = TemporaryUpload(storage, name, name="upload.txt", size=7)
+
+    assert upload.closed
+    assert not hasattr(upload, "temporary_file_path")
+    assert upload.read() == b"content"
+    assert not upload.closed
+    upload.close()
+    assert upload.closed
+    assert b"".join(upload.chunks()) == b"content"
+    upload.close()
+    assert storage.exists(name)
+
+
+def test_linked_temporary_upload_moves_link_only(tmp_path):
+    storage = FileSystemStorage(str(tmp_path / "cached"))
+    target = FileSystemStorage(str(tmp_path / "final"))
+    name = storage.save("upload.txt", ContentFile(b"content"))
+    upload = LinkedTemporaryUpload(
+        storage, name, tmp_path / "links", name="upload.txt", size=7
+    )
+
+    saved = target.save("upload.txt", upload)
+    upload.close()
+    # The final file is the stored file, moved instead of copied
+    assert target.path(saved) != storage.path(name)
+    assert Path(target.path(saved)).samefile(storage.path(name))
+    assert storage.open(name).read() == b"content"
+    assert not list((tmp_path / "links").iterdir())
+
+
+def test_linked_temporary_upload_removes_unused_link(tmp_path):
+    storage = FileSystemStorage(str(tmp_path / "cached"))
+    name = storage.save("upload.txt", ContentFile(b"content"))
+    upload = LinkedTemporaryUpload(
+        storage, name, tmp_path / "links", name="upload.txt", size=7
+    )
+
+    path = Path(upload.temporary_file_path())
+    assert path.read_bytes() == b"content"
+    upload.close()
+    assert not path.exists()
+    assert storage.exists(name)
@@ -6,6 +6,7 @@
 
 import datetime as dt
 import json
+from unittest import mock
 from urllib.parse import urlparse
 
 import bs4
@@ -16,6 +17,7 @@
 from django.utils.timezone import now
 from django_scopes import scope, scopes_disabled
 
+from imanage.common.models import CachedFile
 from imanage.submission.forms import InfoForm
 from imanage.submission.models import Submission, SubmissionStates, SubmissionType, Tag
 
@@ -340,6 +342,10 @@ def test_wizard_existing_user(
         self.assert_mail(submission, user)
         with scope(event=event):
             assert file_question.answers.first().answer_file.read() == b"file_content"
+        # The temporary upload was moved, not copied, and is no longer tracked
+        assert not CachedFile.objects.filter(
+            session_key__startswith="cfp-upload-"
+        ).exists()
 
     @pytest.mark.django_db
     def test_wizard_logged_in_user(
@@ -822,6 +828,63 @@ def test_wizard_with_availabilities(self, event, client):
         user = self.assert_user(submission, email="testuser@example.com")
         self.assert_mail(submission, user)
 
+    @pytest.mark.django_db
+    def test_wizard_does_not_revalidate_finished_steps(self, event, client, user):
+        with scope(event=event):
+            submission_type = SubmissionType.objects.filter(event=event).first().pk
+
+        client.force_login(user)
+        response, current_url = self.perform_init_wizard(client, event=event)
+        response, current_url = self.perform_info_wizard(
+            client,
+            response,
+            current_url,
+            submission_type=submission_type,
+            next_step="profile",
+            event=event,
+        )
+        with mock.patch.object(
+            InfoForm, "is_valid", autospec=True, side_effect=InfoForm.is_valid
+        ) as is_valid:
+            response, current_url = self.perform_profile_form(
+                client, response, current_url, event=event
+            )
+        # The info step was validated when it was submitted, and is only
+        # validated once more when it is saved
+        assert is_valid.call_count == 1
+        submission = self.assert_submission(event)
+        user = self.assert_user(submission)
+        self.assert_mail(submission, user)
+
+    @pytest.mark.django_db
+    def test_wizard_returns_to_step_when_type_deadline_passed(
+        self, event, client, user, submission_type
+    ):
+        with scope(event=event):
+            submission_type.deadline = now() + dt.timedelta(days=1)
+            submission_type.save()
+
+        client.force_login(user)
+        response, current_url = self.perform_init_wizard(client, event=event)
+        response, current_url = self.perform_info_wizard(
+            client,
+            response,
+            current_url,
+            submission_type=submission_type.pk,
+            next_step="profile",
+            event=event,
+        )
+        with scope(event=event):
+            submission_type.deadline = now() - dt.timedelta(minutes=1)
+            submission_type.save()
+        response, current_url = self.get_response_and_url(
+            client, current_url, data={"name": "Jane Doe", "biography": "l337 hax0r"}
+        )
+        assert response.status_code == 200
+        assert "/info/" in current_url
+        with scope(event=event):
+            assert not Submission.all_objects.filter(event=event).exists()
+
 
 @pytest.mark.django_db
 def test_infoform_set_submission_type(event, other_event):
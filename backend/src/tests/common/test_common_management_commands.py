@@ -5,13 +5,18 @@
 import os
 import subprocess
 from contextlib import suppress
+from io import BytesIO, StringIO
 
 import pytest
 import responses
+from django.core.files.base import ContentFile
 from django.core.management import call_command
 from django_scopes import scope
 
+from imanage.common.models import ActivityLog
 from imanage.event.models import Event
+from imanage.person.models import SpeakerProfile
+from imanage.submission.models import Review
 
 
 @pytest.mark.django_db
@@ -48,6 +53,56 @@ def test_common_test_event_with_seed(administrator):
     assert Event.objects.get(slug="democon")
 
 
+@pytest.mark.skipif(
+    "CI" not in os.environ or not os.environ["CI"],
+    reason="Having Faker installed increases test runtime, so we just test this on CI.",
+)
+@pytest.mark.django_db
+def test_common_test_event_with_scale(administrator):
+    call_command(
+        "create_test_event",
+        seed=1,
+        submissions=40,
+        speakers=30,
+        reviews=150,
+        rooms=3,
+        slots=12,
+        schedules=3,
+        log_entries=25,
+    )
+    event = Event.objects.get(slug="democon")
+    with scope(event=event):
+        assert event.submissions.count() == 40
+        assert SpeakerProfile.objects.filter(event=event).count() == 30
+        assert Review.objects.filter(submission__event=event).count() == 150
+        assert event.rooms.count() == 3
+        assert event.submissions.filter(state="confirmed").count() == 12
+        assert event.schedules.filter(version__isnull=False).count() == 3
+        assert event.current_schedule.talks.filter(is_visible=True).count() == 12
+        assert (
+            ActivityLog.objects.filter(
+                event=event, action_type="imanage.submission.update"
+            ).count()
+            == 25
+        )
+
+
+@pytest.mark.skipif(
+    "CI" not in os.environ or not os.environ["CI"],
+    reason="Having Faker installed increases test runtime, so we just test this on CI.",
+)
+@pytest.mark.django_db
+def test_common_test_event_review_stage_creates_slots(administrator):
+    call_command(
+        "create_test_event", stage="review", seed=1, submissions=40, slots=12
+    )
+    event = Event.objects.get(slug="democon")
+    with scope(event=event):
+        confirmed = event.submissions.filter(state="confirmed")
+        assert confirmed.count() == 12
+        assert event.wip_schedule.talks.filter(submission__in=confirmed).count() == 12
+
+
 @pytest.mark.skipif(
     "CI" not in os.environ or not os.environ["CI"],
     reason="Having Faker installed increases test runtime, so we just test this on CI.",
@@ -112,3 +167,41 @@ def test_common_move_event(event, slot):
 def test_generate_api_docs():
     # Just make sure there is no exception
     call_command("spectacular")
+
+
+def test_common_parse_importtime():
+    from imanage.common.management.commands.profile_imports import parse_importtime
+
+    output = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      3000 |       4500 | imanage.common.templatetags.rich_text
+something else entirely"""
+    assert parse_importtime(output) == [
+        ("_io", 120, 120),
+        ("imanage.common.templatetags.rich_text", 3000, 4500),
+    ]
+
+
+def test_common_profile_imports(capsys):
+    call_command("profile_imports", limit=3, filter="imanage")
+    output = capsys.readouterr().out
+    assert "Total import time" in output
+
+
+@pytest.mark.django_db
+def test_common_generate_thumbnails(orga_user):
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", (600, 600), "red").save(buffer, format="PNG")
+    orga_user.avatar.save("avatar.png", ContentFile(buffer.getvalue()))
+
+    call_command("generate_thumbnails", workers=1)
+    orga_user.refresh_from_db()
+    assert orga_user.avatar_thumbnail
+    assert orga_user.avatar_thumbnail_tiny
+
+    # Images with thumbnails are skipped, so interrupted runs can be resumed
+    out = StringIO()
+    call_command("generate_thumbnails", workers=1, stdout=out)
+    assert "Found 0 images" in out.getvalue()
@@ -54,3 +54,63 @@ def test_send_chained_with_results(event):
     event.plugins = "tests"
     event.save()
     footer_link.send_chained(event, request="test", chain_kwarg_name="test")
+
+
+@pytest.mark.django_db
+def test_signal_receiver_table_follows_plugins(event):
+    event.plugins = None
+    assert footer_link_test not in footer_link.get_active_receivers(event)
+    event.plugins = "tests"
+    assert footer_link_test in footer_link.get_active_receivers(event)
+    event.plugins = ""
+    assert footer_link_test not in footer_link.get_active_receivers(event)
+
+
+@pytest.mark.django_db
+def test_signal_receiver_table_is_reused(event, mocker):
+    event.plugins = "tests"
+    footer_link.clear_receiver_tables()
+    is_active = mocker.spy(EventPluginSignal, "_is_active")
+    first = footer_link.send(event, request=None)
+    calls = is_active.call_count
+    assert calls
+    second = footer_link.send(event, request=None)
+    assert is_active.call_count == calls
+    assert [r for r, _ in first] == [r for r, _ in second]
+    assert first == sorted(first, key=lambda r: (r[0].__module__, r[0].__name__))
+
+
+@pytest.mark.django_db
+def test_signal_receiver_table_cleared_on_connect(event):
+    event.plugins = "tests"
+
+    def footer_link_extra(sender, request, **kwargs):
+        return []
+
+    footer_link.get_active_receivers(event)
+    footer_link.connect(footer_link_extra)
+    try:
+        assert footer_link_extra in footer_link.get_active_receivers(event)
+    finally:
+        footer_link.disconnect(footer_link_extra)
+    assert footer_link_extra not in footer_link.get_active_receivers(event)
+
+
+@pytest.mark.django_db
+def test_signal_send_microbenchmark(event):
+    """Sending a signal repeatedly should not get slower than building the
+    receiver table from scratch every time."""
+    import timeit
+
+    event.plugins = "tests"
+    footer_link.get_active_receivers(event)
+
+    def uncached():
+        footer_link.clear_receiver_tables()
+        footer_link.get_active_receivers(event)
+
+    cached = min(
+        timeit.repeat(lambda: footer_link.get_active_receivers(event), number=500)
+    )
+    rebuilt = min(timeit.repeat(uncached, number=500))
+    assert cached <= rebuilt
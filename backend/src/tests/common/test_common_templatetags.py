@@ -117,3 +117,14 @@ def copy(self):  # pragma: no cover
 class FakeRequest:
     def __init__(self, get):  # pragma: no cover
         self.GET = MockEncodeDict(get)
+
+
+def test_common_templatetag_rich_text_builds_cleaners_lazily():
+    from imanage.common.templatetags import rich_text as rich_text_module
+
+    rich_text_module.get_cleaner.cache_clear()
+    assert rich_text_module.get_cleaner.cache_info().currsize == 0
+    rich_text("foo.com")
+    assert rich_text_module.get_cleaner.cache_info().currsize == 1
+    assert rich_text_module.CLEANER is rich_text_module.get_cleaner()
+    assert "com" in rich_text_module.ALLOWED_TLDS
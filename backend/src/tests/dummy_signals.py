@@ -62,8 +62,9 @@ def activate_event_test(sender, request, **kwargs):
 
 
 @receiver(submission_state_change)
-def submission_state_change_test(sender, submission, **kwargs):
+def submission_state_change_test(sender, submission, old_state, **kwargs):
     submission._state_change_called = getattr(submission, "_state_change_called", 0) + 1
+    submission._state_change_old_state = old_state
     submission.event.settings.submission_state_change_called = submission.code
 
 
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026-present Tobias Kunze
+# SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
+
+import datetime as dt
+
+import pytest
+from django_scopes import scope
+
+from imanage.event.models import EventMetrics
+from imanage.submission.models import Review, Submission
+
+
+@pytest.mark.django_db
+def test_analytics_dashboard_aggregates(
+    orga_client, event, submission, accepted_submission, review, other_review_user
+):
+    with scope(event=event):
+        second = Review.objects.create(
+            score=2, submission=accepted_submission, user=other_review_user
+        )
+        Review.objects.filter(pk=second.pk).update(
+            updated=second.created + dt.timedelta(days=2)
+        )
+        # Unchanged reviews don't count towards the turnaround
+        Review.objects.filter(pk=review.pk).update(updated=review.created)
+
+    response = orga_client.get(event.orga_urls.analytics)
+
+    assert response.status_code == 200
+    metrics = response.context["metrics_data"]
+    assert metrics["total_submissions"] == 2
+    assert metrics["accepted_submissions"] == 1
+    assert metrics["pending_submissions"] == 1
+    assert metrics["acceptance_rate"] == 50
+    assert metrics["total_reviews"] == 2
+    assert metrics["avg_review_score"] == 1.5
+    status = response.context["submission_status_data"]
+    assert dict(zip(status["labels"], status["data"]))["Accepted"] == 1
+    turnaround = response.context["review_turnaround_data"]
+    assert turnaround["avg_turnaround_days"] == 2
+    assert turnaround["turnaround_data"] == [2]
+
+
+@pytest.mark.django_db
+def test_analytics_dashboard_uses_snapshot(
+    orga_client, event, submission, accepted_submission, review
+):
+    from imanage.event.services import update_event_metrics
+
+    with scope(event=event):
+        snapshot = update_event_metrics(event)
+        assert snapshot.total_submissions == 2
+        assert snapshot.accepted_submissions == 1
+        assert snapshot.total_reviews == 1
+        # Pretend that our submission came in after the snapshot
+        Submission.objects.filter(pk=submission.pk).update(
+            created=snapshot.updated + dt.timedelta(minutes=1)
+        )
+        EventMetrics.objects.filter(pk=snapshot.pk).update(
+            total_submissions=1, pending_submissions=0
+        )
+
+    response = orga_client.get(event.orga_urls.analytics)
+
+    assert response.status_code == 200
+    metrics = response.context["metrics_data"]
+    assert metrics["total_submissions"] == 2
+    assert metrics["pending_submissions"] == 1
+    assert metrics["accepted_submissions"] == 1
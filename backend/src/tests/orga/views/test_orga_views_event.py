@@ -3,6 +3,7 @@
 
 import datetime as dt
 import json
+from unittest import mock
 
 import pytest
 from django.conf import settings
@@ -11,6 +12,7 @@
 from django_scopes import scope
 
 from imanage.event.models import Event
+from imanage.submission.models import Submission
 
 
 def get_settings_form_data(event):
@@ -492,6 +494,26 @@ def test_administrator_can_delete_event(event, administrator_client, submission)
     assert Event.objects.count() == 0
 
 
+@pytest.mark.django_db
+def test_shred_event_deletes_files_after_commit(
+    event, submission, django_capture_on_commit_callbacks
+):
+    with scope(event=event):
+        Submission.all_objects.filter(pk=submission.pk).update(image="img/talk.png")
+    progress = []
+    with (
+        mock.patch("imanage.event.services.task_delete_files.apply_async") as task,
+        django_capture_on_commit_callbacks(execute=True),
+        scope(event=event),
+    ):
+        event.shred(progress=lambda done, total: progress.append((done, total)))
+    assert Event.objects.count() == 0
+    assert progress[-1][0] == progress[-1][1] == len(progress)
+    task.assert_called_once_with(
+        kwargs={"names": ["img/talk.png"]}, ignore_result=True
+    )
+
+
 @pytest.mark.django_db
 def test_edit_review_settings(orga_client, event):
     with scope(event=event):
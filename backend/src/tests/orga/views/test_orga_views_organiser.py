@@ -534,3 +534,32 @@ def test_administrator_can_delete_organiser(event, administrator_client, submiss
     assert response.status_code == 200
     assert Event.objects.count() == 0
     assert Organiser.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_event_copy_data_remaps_relations(event, choice_question, track, information):
+    with scopes_disabled():
+        choice_question.tracks.add(track)
+        information.limit_tracks.add(track)
+        information.limit_types.add(event.cfp.default_type)
+        category = event.score_categories.first()
+        category.limit_tracks.add(track)
+        new_event = Event.objects.create(
+            organiser=event.organiser,
+            name="Copied Event",
+            slug="copied-event",
+            date_from=event.date_from + dt.timedelta(days=365),
+            date_to=event.date_to + dt.timedelta(days=365),
+        )
+        new_event.copy_data_from(event)
+
+        new_track = new_event.tracks.get()
+        assert new_track.pk != track.pk
+        new_question = new_event.questions.get(position=choice_question.position)
+        assert new_question.options.count() == 3
+        assert list(new_question.tracks.all()) == [new_track]
+        new_information = new_event.information.get()
+        assert list(new_information.limit_tracks.all()) == [new_track]
+        assert list(new_information.limit_types.all()) == [new_event.cfp.default_type]
+        new_category = new_event.score_categories.get(limit_tracks=new_track)
+        assert new_category.scores.count() == category.scores.count()
@@ -7,6 +7,9 @@
 import pytest
 from django_scopes import scope
 
+from imanage.event.models import Team
+from imanage.person.models import User
+from imanage.submission.models import Review, Submission
 from imanage.submission.models.question import QuestionRequired
 
 
@@ -572,6 +575,122 @@ def test_orga_can_assign_submission_to_reviewer(orga_client, review_user, submis
         assert submission.assigned_reviewers.all().count() == 1
 
 
+@pytest.mark.django_db
+def test_orga_assignment_only_changes_submitted_page(
+    orga_client, review_user, other_review_user, submission, other_submission
+):
+    with scope(event=submission.event):
+        submission.assigned_reviewers.add(other_review_user)
+        other_submission.assigned_reviewers.add(review_user)
+        first, second = sorted(
+            (submission, other_submission), key=lambda sub: sub.title
+        )
+    url = submission.event.orga_urls.reviews + "assign/?direction=submission"
+    response = orga_client.get(url + "&page_size=1")
+    assert response.status_code == 200
+    assert list(response.context["form"].fields) == [first.code]
+
+    response = orga_client.post(
+        url + "&page=1",
+        {f"submission-{first.code}": [review_user.id]},
+    )
+    assert response.status_code == 302
+    with scope(event=submission.event):
+        assert list(first.assigned_reviewers.all()) == [review_user]
+        assert second.assigned_reviewers.count() == 1
+
+
+@pytest.mark.django_db
+def test_orga_assignment_pages_with_duplicate_titles(
+    orga_client, submission, other_submission
+):
+    with scope(event=submission.event):
+        other_submission.title = submission.title
+        other_submission.save()
+    url = submission.event.orga_urls.reviews + "assign/?direction=submission"
+    for page, shown in ((1, submission), (2, other_submission)):
+        response = orga_client.get(url + f"&page_size=1&page={page}")
+        assert response.status_code == 200
+        assert list(response.context["form"].fields) == [shown.code]
+
+
+@pytest.mark.django_db
+def test_orga_can_assign_reviewers_automatically(
+    orga_client, review_user, other_review_user, submission, other_submission
+):
+    with scope(event=submission.event):
+        other_submission.assigned_reviewers.add(review_user)
+    response = orga_client.get(submission.event.orga_urls.reviews + "assign/auto")
+    assert response.status_code == 200
+    response = orga_client.post(
+        submission.event.orga_urls.reviews + "assign/auto",
+        {"reviewers_per_submission": 1, "max_assignments": 1},
+    )
+    assert response.status_code == 302
+    with scope(event=submission.event):
+        assert list(other_submission.assigned_reviewers.all()) == [review_user]
+        assert list(submission.assigned_reviewers.all()) == [other_review_user]
+        assert review_user.assigned_reviews.count() == 1
+
+
+@pytest.mark.django_db
+def test_orga_auto_assignment_respects_track_limits(
+    orga_client, review_user, submission, other_submission, track, other_track
+):
+    with scope(event=submission.event):
+        submission.track = track
+        submission.save()
+        other_submission.track = other_track
+        other_submission.save()
+        track_reviewer = User.objects.create_user(
+            email="trackreviewer@orga.org", password="reviewpassw0rd"
+        )
+        team = Team.objects.create(
+            name="Track reviewers",
+            organiser=submission.event.organiser,
+            is_reviewer=True,
+        )
+        team.limit_events.add(submission.event)
+        team.limit_tracks.add(track)
+        team.members.add(track_reviewer)
+    response = orga_client.post(
+        submission.event.orga_urls.reviews + "assign/auto",
+        {"reviewers_per_submission": 2},
+    )
+    assert response.status_code == 302
+    with scope(event=submission.event):
+        assert set(submission.assigned_reviewers.all()) == {review_user, track_reviewer}
+        assert list(other_submission.assigned_reviewers.all()) == [review_user]
+
+
+@pytest.mark.django_db
+def test_orga_auto_assignment_skips_own_proposals_and_counts_reviews(
+    orga_client, review_user, other_review_user, submission, other_submission
+):
+    with scope(event=submission.event):
+        submission.speakers.add(review_user)
+        Review.objects.create(
+            submission=other_submission, user=other_review_user, score=1
+        )
+        third = Submission.objects.create(
+            title="A third proposal",
+            event=submission.event,
+            submission_type=submission.submission_type,
+            content_locale="en",
+        )
+    response = orga_client.post(
+        submission.event.orga_urls.reviews + "assign/auto",
+        {"reviewers_per_submission": 1, "max_assignments": 1},
+    )
+    assert response.status_code == 302
+    with scope(event=submission.event):
+        # review_user is a speaker of submission, and other_review_user has
+        # reached the maximum with their review of other_submission.
+        assert not submission.assigned_reviewers.exists()
+        assert not other_submission.assigned_reviewers.exists()
+        assert list(third.assigned_reviewers.all()) == [review_user]
+
+
 @pytest.mark.django_db
 def test_orga_can_export_reviews(review, orga_client):
     response = orga_client.get(review.event.orga_urls.reviews + "export/")
@@ -645,3 +764,61 @@ def test_orga_can_bulk_tag_submissions(
         assert submission.tags.first() == tag2
         assert other_submission.tags.count() == 1
         assert other_submission.tags.first() == tag2
+
+
+@pytest.mark.django_db
+def test_reviewer_can_bulk_review_posted_rows(
+    review_client, submission, other_submission, review
+):
+    with scope(event=submission.event):
+        category = submission.event.score_categories.first()
+        score = category.scores.filter(value=1).first()
+    url = submission.event.orga_urls.reviews + "bulk/"
+    response = review_client.get(url)
+    assert response.status_code == 200
+    assert submission.title in response.text
+
+    response = review_client.post(
+        url,
+        {
+            f"{submission.code}-score_{category.id}": score.id,
+            f"{submission.code}-text": "Changed my mind",
+        },
+        follow=True,
+    )
+    assert response.status_code == 200
+    with scope(event=submission.event):
+        review.refresh_from_db()
+        assert review.text == "Changed my mind"
+        assert review.score == 1
+        assert list(review.scores.all()) == [score]
+        assert not other_submission.reviews.exists()
+
+    response = review_client.post(
+        url,
+        {
+            f"{other_submission.code}-score_{category.id}": score.id,
+            f"{other_submission.code}-text": "LGTM",
+        },
+        follow=True,
+    )
+    assert response.status_code == 200
+    with scope(event=submission.event):
+        new_review = other_submission.reviews.get()
+        assert new_review.text == "LGTM"
+        assert new_review.score == 1
+        assert list(new_review.scores.all()) == [score]
+        review.refresh_from_db()
+        assert review.text == "Changed my mind"
+
+
+@pytest.mark.django_db
+def test_reviewer_bulk_review_pages_are_stable(
+    review_client, submission, other_submission
+):
+    url = submission.event.orga_urls.reviews + "bulk/"
+    pages = [
+        list(review_client.get(url + f"?page_size=1&page={page}").context["page_obj"])
+        for page in (1, 2)
+    ]
+    assert pages == [[submission], [other_submission]]
@@ -6,6 +6,7 @@
 from uuid import uuid4
 
 import pytest
+from django.test import override_settings
 from django.urls import reverse
 from django.utils.timezone import now
 from django_scopes import scope
@@ -71,6 +72,248 @@ def test_talk_schedule_api_update(orga_client, event, schedule, slot, room, with
         assert slot.room == room
 
 
+@pytest.mark.django_db
+def test_talk_schedule_api_batch_update(
+    orga_client, event, slot, break_slot, other_room
+):
+    with scope(event=event):
+        talk = event.wip_schedule.talks.get(submission__isnull=False)
+        pause = event.wip_schedule.talks.get(submission__isnull=True)
+        start = event.datetime_from + dt.timedelta(hours=2)
+    response = orga_client.post(
+        reverse("orga:schedule.api.batch", kwargs={"event": event.slug}),
+        json.dumps(
+            {
+                "talks": [
+                    {"id": talk.pk, "room": other_room.pk, "start": start.isoformat()},
+                    {
+                        "id": pause.pk,
+                        "room": other_room.pk,
+                        "start": (start - dt.timedelta(minutes=10)).isoformat(),
+                        "duration": 30,
+                    },
+                ]
+            }
+        ),
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    content = json.loads(response.text)
+    assert {result["id"] for result in content["talks"]} == {talk.pk, pause.pk}
+    code = talk.submission.code
+    assert "room_overlap" in [
+        warning["type"] for warning in content["warnings"][code]
+    ]
+    with scope(event=event):
+        talk.refresh_from_db()
+        pause.refresh_from_db()
+        assert talk.start == start
+        assert talk.room == other_room
+        assert pause.start == start - dt.timedelta(minutes=10)
+        assert pause.duration == 30
+        assert pause.room == other_room
+
+
+@pytest.mark.django_db
+def test_talk_schedule_api_batch_update_is_atomic(
+    orga_client, event, slot, break_slot, room
+):
+    with scope(event=event):
+        talk = event.wip_schedule.talks.get(submission__isnull=False)
+        pause = event.wip_schedule.talks.get(submission__isnull=True)
+        start = event.datetime_from + dt.timedelta(hours=2)
+    response = orga_client.post(
+        reverse("orga:schedule.api.batch", kwargs={"event": event.slug}),
+        json.dumps(
+            {
+                "talks": [
+                    {"id": talk.pk, "room": room.pk, "start": start.isoformat()},
+                    {"id": pause.pk, "room": room.pk + 100, "start": start.isoformat()},
+                ]
+            }
+        ),
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+    with scope(event=event):
+        talk.refresh_from_db()
+        assert talk.start != start
+
+
+@pytest.mark.django_db
+def test_talk_schedule_api_batch_update_deleted_slot(
+    orga_client, event, slot, break_slot, room, monkeypatch
+):
+    with scope(event=event):
+        talk = event.wip_schedule.talks.get(submission__isnull=False)
+        pause = event.wip_schedule.talks.get(submission__isnull=True)
+        start = event.datetime_from + dt.timedelta(hours=2)
+    bump_revision = Schedule.bump_revision
+
+    def delete_then_bump(schedule, *args, **kwargs):
+        # Another editor deletes a slot while we wait for the schedule lock
+        schedule.talks.filter(pk=pause.pk).delete()
+        return bump_revision(schedule, *args, **kwargs)
+
+    monkeypatch.setattr(Schedule, "bump_revision", delete_then_bump)
+    response = orga_client.post(
+        reverse("orga:schedule.api.batch", kwargs={"event": event.slug}),
+        json.dumps(
+            {
+                "talks": [
+                    {"id": talk.pk, "room": room.pk, "start": start.isoformat()},
+                    {"id": pause.pk, "room": room.pk, "start": start.isoformat()},
+                ]
+            }
+        ),
+        content_type="application/json",
+    )
+    assert response.status_code == 404
+    with scope(event=event):
+        talk.refresh_from_db()
+        assert talk.start != start
+
+
+@pytest.mark.django_db
+def test_talk_schedule_api_rejects_stale_update(orga_client, event, slot, room):
+    with scope(event=event):
+        slot = event.wip_schedule.talks.first()
+        known_revision = slot.revision
+    url = reverse(
+        "orga:schedule.api.update", kwargs={"event": event.slug, "pk": slot.pk}
+    )
+    first_start = event.datetime_from + dt.timedelta(hours=1)
+    response = orga_client.patch(
+        url,
+        data=json.dumps(
+            {
+                "room": room.pk,
+                "start": first_start.isoformat(),
+                "revision": known_revision,
+            }
+        ),
+    )
+    assert response.status_code == 200
+    revision = json.loads(response.text)["revision"]
+    assert revision > known_revision
+
+    # A second editor still knows the slot at its previous revision
+    response = orga_client.patch(
+        url,
+        data=json.dumps(
+            {
+                "room": room.pk,
+                "start": (first_start + dt.timedelta(hours=1)).isoformat(),
+                "revision": known_revision,
+            }
+        ),
+    )
+    assert response.status_code == 409
+    assert json.loads(response.text)["talks"][0]["revision"] == revision
+    with scope(event=event):
+        slot.refresh_from_db()
+        assert slot.start == first_start
+        assert slot.revision == revision
+        event.wip_schedule.refresh_from_db()
+        assert event.wip_schedule.revision == revision
+
+
+@pytest.mark.django_db
+def test_talk_schedule_api_changes(orga_client, event, slot, break_slot, room):
+    with scope(event=event):
+        talk = event.wip_schedule.talks.get(submission__isnull=False)
+        pause = event.wip_schedule.talks.get(submission__isnull=True)
+    url = reverse("orga:schedule.api.changes", kwargs={"event": event.slug})
+    since = json.loads(orga_client.get(url).text)["revision"]
+    response = orga_client.get(url + f"?since={since}")
+    content = json.loads(response.text)
+    assert content["revision"] == since
+    assert content["talks"] == []
+    assert set(content["ids"]) == {talk.pk, pause.pk}
+
+    orga_client.patch(
+        reverse(
+            "orga:schedule.api.update", kwargs={"event": event.slug, "pk": talk.pk}
+        ),
+        data=json.dumps({"room": room.pk, "start": event.datetime_from.isoformat()}),
+    )
+    response = orga_client.get(url + f"?since={since}&warnings=1")
+    content = json.loads(response.text)
+    assert content["revision"] == since + 1
+    assert [result["id"] for result in content["talks"]] == [talk.pk]
+    response = orga_client.get(url + f"?since={since + 1}")
+    assert json.loads(response.text)["talks"] == []
+
+
+@pytest.mark.django_db
+def test_talk_schedule_api_changes_include_quick_schedule(
+    orga_client, event, room, accepted_submission
+):
+    with scope(event=event):
+        slot = accepted_submission.slots.get(schedule=event.wip_schedule)
+    url = reverse("orga:schedule.api.changes", kwargs={"event": event.slug})
+    since = json.loads(orga_client.get(url).text)["revision"]
+    response = orga_client.post(
+        accepted_submission.orga_urls.quick_schedule,
+        data={
+            "start_date": event.date_from.strftime("%Y-%m-%d"),
+            "start_time": "10:00:00",
+            "room": room.pk,
+        },
+    )
+    assert response.status_code == 302
+    content = json.loads(orga_client.get(url + f"?since={since}").text)
+    assert content["revision"] > since
+    assert [result["id"] for result in content["talks"]] == [slot.pk]
+    assert content["talks"][0]["start"]
+
+
+@pytest.mark.django_db
+def test_talk_schedule_api_changes_include_state_changes(
+    orga_client, event, accepted_submission
+):
+    with scope(event=event):
+        slot = accepted_submission.slots.get(schedule=event.wip_schedule)
+    url = reverse("orga:schedule.api.changes", kwargs={"event": event.slug})
+    since = json.loads(orga_client.get(url).text)["revision"]
+    with scope(event=event):
+        accepted_submission.confirm()
+    content = json.loads(orga_client.get(url + f"?since={since}").text)
+    assert [result["id"] for result in content["talks"]] == [slot.pk]
+    assert content["talks"][0]["revision"] == content["revision"]
+
+    with scope(event=event):
+        since = content["revision"]
+        accepted_submission.withdraw(force=True)
+    content = json.loads(orga_client.get(url + f"?since={since}").text)
+    assert content["revision"] > since
+    assert content["talks"] == []
+    assert slot.pk not in content["ids"]
+
+
+@pytest.mark.django_db
+def test_talk_schedule_api_changes_after_release(orga_client, event, slot, room):
+    with scope(event=event):
+        talk = event.wip_schedule.talks.get(submission__isnull=False)
+    orga_client.patch(
+        reverse(
+            "orga:schedule.api.update", kwargs={"event": event.slug, "pk": talk.pk}
+        ),
+        data=json.dumps({"room": room.pk, "start": event.datetime_from.isoformat()}),
+    )
+    with scope(event=event):
+        event.wip_schedule.freeze("test", notify_speakers=False)
+        event = Event.objects.get(pk=event.pk)
+        wip_ids = set(event.wip_schedule.talks.values_list("pk", flat=True))
+
+    url = reverse("orga:schedule.api.changes", kwargs={"event": event.slug})
+    response = orga_client.get(url + "?since=0")
+    content = json.loads(response.text)
+    assert content["revision"] == 0
+    assert content["talks"] == []
+    assert set(content["ids"]) == wip_ids
+
+
 @pytest.mark.django_db
 def test_talk_schedule_api_update_wrong_slot(orga_client, event, schedule, slot):
     with scope(event=event):
@@ -283,6 +526,54 @@ def test_orga_can_see_schedule_release_view(orga_client, event):
     assert response.status_code == 200
 
 
+@pytest.mark.django_db
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "release-notification-progress",
+        }
+    }
+)
+@pytest.mark.parametrize("htmx", (True, False))
+def test_orga_can_see_schedule_release_notification_progress(
+    orga_client, event, slot, htmx
+):
+    from imanage.schedule.services import set_notification_progress
+
+    with scope(event=event):
+        schedule = slot.schedule
+        set_notification_progress(schedule, done=3, total=10)
+    headers = {"HX-Request": "true"} if htmx else {}
+    response = orga_client.get(
+        event.orga_urls.release_schedule,
+        data={"notifications": schedule.pk},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert "3 of 10" in response.text
+
+    with scope(event=event):
+        set_notification_progress(schedule, done=10, total=10)
+    response = orga_client.get(
+        event.orga_urls.release_schedule,
+        data={"notifications": schedule.pk},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert event.orga_urls.outbox in response.text
+
+
+@pytest.mark.django_db
+def test_orga_schedule_release_notification_progress_unknown_schedule(
+    orga_client, event
+):
+    response = orga_client.get(
+        event.orga_urls.release_schedule, data={"notifications": "nope"}
+    )
+    assert response.status_code == 302
+
+
 @pytest.mark.django_db
 def test_orga_cannot_reset_to_wrong_version(orga_client, event):
     with scope(event=event):
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
 
 import datetime as dt
+import json
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -806,6 +807,15 @@ def test_submission_statistics(use_tracks, slot, other_slot, orga_client):
         )
     response = orga_client.get(slot.event.orga_urls.stats)
     assert response.status_code == 200
+    timeline = json.loads(response.context["submission_timeline_data"])
+    assert [point["y"] for point in timeline] == [1, 0, 1]
+    assert json.loads(response.context["talk_timeline_data"]) == timeline
+    assert json.loads(response.context["submission_state_data"]) == [
+        {"label": "confirmed", "value": 2}
+    ]
+    talk_types = json.loads(response.context["talk_type_data"])
+    assert sum(point["value"] for point in talk_types) == 2
+    assert bool(response.context["submission_track_data"]) is use_tracks
 
 
 @pytest.mark.django_db
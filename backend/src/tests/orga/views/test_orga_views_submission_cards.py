@@ -1,9 +1,13 @@
 # SPDX-FileCopyrightText: 2017-present Tobias Kunze
 # SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
 
+import datetime as dt
+
 import pytest
+from django.utils.timezone import now
 from django_scopes import scope
 
+from imanage.common.models import CachedFile
 from imanage.submission.cards import _text
 
 
@@ -26,3 +30,32 @@ def test_orga_can_show_cards(orga_client, event, slot, other_slot):
         other_slot.submission.save()
     response = orga_client.get(event.orga_urls.submission_cards)
     assert response.status_code == 200
+    assert response["Content-Type"] == "application/pdf"
+    assert b"".join(response.streaming_content).startswith(b"%PDF")
+    cached_file = CachedFile.objects.get()
+    assert cached_file.session_key == orga_client.session.session_key
+
+    response = orga_client.get(
+        event.orga_urls.submission_cards + f"?file={cached_file.pk}"
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_cards_are_only_served_to_their_session(orga_client, event, slot):
+    cached_file = CachedFile.objects.create(
+        expires=now() + dt.timedelta(days=1),
+        filename="cards.pdf",
+        content_type="application/pdf",
+        session_key="other-session",
+    )
+    response = orga_client.get(
+        event.orga_urls.submission_cards + f"?file={cached_file.pk}"
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_cards_with_malformed_file_id(orga_client, event):
+    response = orga_client.get(event.orga_urls.submission_cards + "?file=nope")
+    assert response.status_code == 404
@@ -1,7 +1,10 @@
 # SPDX-FileCopyrightText: 2017-present Tobias Kunze
 # SPDX-License-Identifier: AGPL-3.0-only WITH LicenseRef-Imanage-AGPL-3.0-Terms
 
+from io import BytesIO
+
 import pytest
+from django.core.files.base import ContentFile
 from django_scopes import scope, scopes_disabled
 
 from imanage.person.models.user import User, avatar_path
@@ -113,6 +116,25 @@ def test_user_attributes(orga_user):
     assert not orga_user.has_avatar
 
 
+@pytest.mark.django_db
+def test_user_avatar_thumbnail_generated_in_background(orga_user):
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", (600, 600), "red").save(buffer, format="PNG")
+    orga_user.avatar.save("avatar.png", ContentFile(buffer.getvalue()))
+    assert not orga_user.avatar_thumbnail_tiny
+
+    # Without a thumbnail, we get the original image immediately
+    assert orga_user.get_avatar_url(thumbnail="tiny").endswith(orga_user.avatar.url)
+    orga_user.refresh_from_db()
+    assert orga_user.avatar_thumbnail
+    assert orga_user.avatar_thumbnail_tiny
+    assert orga_user.get_avatar_url(thumbnail="tiny").endswith(
+        orga_user.avatar_thumbnail_tiny.url
+    )
+
+
 @pytest.mark.django_db
 def test_user_reset_password_without_text(orga_user, event):
     with scope(event=event):
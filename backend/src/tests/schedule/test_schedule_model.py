@@ -5,6 +5,7 @@
 
 import pytest
 from django.core import mail as djmail
+from django.test import override_settings
 from django.utils.timezone import now
 from django_scopes import scope
 
@@ -48,6 +49,59 @@ def test_freeze(slot):
         assert not new.version
 
 
+@pytest.mark.django_db
+def test_copy_slots_to_schedule(slot, break_slot):
+    from imanage.schedule.services import copy_slots_to_schedule
+
+    with scope(event=slot.submission.event):
+        new_schedule = Schedule.objects.create(
+            event=slot.submission.event, version="Version"
+        )
+        copy_slots_to_schedule(slot.schedule.talks.all(), new_schedule, batch_size=1)
+        assert new_schedule.talks.count() == slot.schedule.talks.count()
+        new_slot = new_schedule.talks.get(submission=slot.submission)
+        assert new_slot.room == slot.room
+        assert new_slot.start == slot.start
+        assert new_slot.end == slot.end
+        assert new_slot.is_visible == slot.is_visible
+        assert new_schedule.talks.filter(slot_type=SlotType.BREAK).exists()
+
+
+@pytest.mark.django_db
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "notification-progress",
+        }
+    }
+)
+def test_freeze_sets_visibility_and_notification_progress(
+    slot, accepted_submission, room, django_capture_on_commit_callbacks
+):
+    from imanage.schedule.services import (
+        get_notification_progress,
+        has_pending_notifications,
+    )
+
+    with scope(event=slot.submission.event):
+        slot.event.wip_schedule.talks.filter(submission=accepted_submission).update(
+            start=slot.start, end=slot.end, room=room, is_visible=True
+        )
+        with django_capture_on_commit_callbacks() as callbacks:
+            old, new = slot.event.wip_schedule.freeze("Version")
+        # Notifications are only generated once the release is committed
+        assert has_pending_notifications(old)
+        for callback in callbacks:
+            callback()
+        assert old.talks.get(submission=slot.submission).is_visible
+        assert not old.talks.get(submission=accepted_submission).is_visible
+        assert not new.talks.get(submission=accepted_submission).is_visible
+        progress = get_notification_progress(old)
+        assert progress["done"] == progress["total"]
+        assert not has_pending_notifications(old)
+
+
 @pytest.mark.parametrize("version", ["wip", "latest", None, ""])
 @pytest.mark.django_db
 def test_freeze_fail(slot, schedule, version):
@@ -179,7 +233,9 @@ def test_is_archived(event, break_slot):
 
 
 @pytest.mark.django_db
-def test_schedule_changes(event, slot, room, accepted_submission):
+def test_schedule_changes(
+    event, slot, room, accepted_submission, django_capture_on_commit_callbacks
+):
     with scope(event=slot.submission.event):
         djmail.outbox = []
         QueuedMail.objects.filter(sent__isnull=True).update(sent=now())
@@ -196,7 +252,8 @@ def test_schedule_changes(event, slot, room, accepted_submission):
         slot.is_visible = False
         slot.save()
         assert QueuedMail.objects.filter(sent__isnull=True).count() == 0
-        schedule, _ = event.wip_schedule.freeze("test")
+        with django_capture_on_commit_callbacks(execute=True):
+            schedule, _ = event.wip_schedule.freeze("test")
         assert schedule.changes == {
             "count": 1,
             "action": "update",
@@ -229,7 +286,8 @@ def test_schedule_changes(event, slot, room, accepted_submission):
         second_slot.start = current_slot.start + dt.timedelta(hours=2)
         second_slot.end = current_slot.end + dt.timedelta(hours=2)
         second_slot.save()
-        schedule, _ = event.wip_schedule.freeze("test2")
+        with django_capture_on_commit_callbacks(execute=True):
+            schedule, _ = event.wip_schedule.freeze("test2")
         assert schedule.changes == {
             "count": 1,
             "action": "update",
@@ -259,6 +317,34 @@ def test_schedule_changes(event, slot, room, accepted_submission):
         assert len(schedule.changes["canceled_talks"]) == 1
 
 
+@pytest.mark.django_db
+def test_freeze_stores_schedule_changes(event, slot):
+    from imanage.schedule.services import prefetch_schedule_changes
+
+    with scope(event=event):
+        current_slot = slot.submission.slots.get(schedule=event.wip_schedule)
+        current_slot.start += dt.timedelta(hours=1)
+        current_slot.save()
+        first, _ = event.wip_schedule.freeze("first")
+        current_slot = slot.submission.slots.get(schedule=event.wip_schedule)
+        current_slot.start += dt.timedelta(hours=1)
+        current_slot.save()
+        second, _ = event.wip_schedule.freeze("second")
+        assert first.serialized_changes["count"] == 1
+        assert second.serialized_changes["count"] == 1
+        assert len(second.serialized_changes["moved_talks"]) == 1
+
+        schedules = list(event.schedules.filter(version__isnull=False))
+        # Schedules released before changes were stored get them on access
+        schedules[-1].serialized_changes = None
+        Schedule.objects.filter(pk=schedules[-1].pk).update(serialized_changes=None)
+        schedules = prefetch_schedule_changes(schedules)
+        assert "changes" not in schedules[-1].__dict__
+        for schedule in schedules:
+            assert schedule.changes == Schedule.objects.get(pk=schedule.pk).changes
+        assert Schedule.objects.get(pk=schedules[-1].pk).serialized_changes
+
+
 @pytest.mark.django_db
 def test_blocker_not_in_released_schedule(slot, blocker_slot, room):
     with scope(event=slot.submission.event):
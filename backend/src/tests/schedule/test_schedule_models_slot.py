@@ -120,3 +120,47 @@ def test_slot_warning_when_speaker_overbooked(
             warnings[1]["message"]
             == "Jane Speaker is scheduled for another session at the same time."
         )
+
+
+@pytest.mark.django_db
+def test_slot_prefetch_id_suffixes(accepted_submission, django_assert_num_queries):
+    from imanage.schedule.services import prefetch_slot_id_suffixes
+
+    event = accepted_submission.event
+    with scope(event=event):
+        event.feature_flags["present_multiple_times"] = True
+        event.save()
+        accepted_submission.slot_count = 3
+        accepted_submission.save()
+        accepted_submission.accept()
+        expected = {
+            slot.pk: slot.id_suffix
+            for slot in TalkSlot.objects.filter(schedule=event.wip_schedule)
+        }
+        assert sorted(expected.values()) == ["-0", "-1", "-2"]
+
+        slots = list(
+            TalkSlot.objects.filter(schedule=event.wip_schedule).select_related(
+                "submission", "submission__event"
+            )
+        )
+        with django_assert_num_queries(1):
+            prefetch_slot_id_suffixes(slots)
+            for slot in slots:
+                assert slot.id_suffix == expected[slot.pk]
+                assert f"-{slot.submission.pk}{slot.id_suffix}" in slot.frab_slug
+        assert len({slot.uuid for slot in slots}) == 3
+
+
+@pytest.mark.django_db
+def test_slot_prefetch_id_suffixes_without_feature_flag(
+    slot, django_assert_num_queries
+):
+    from imanage.schedule.services import prefetch_slot_id_suffixes
+
+    with scope(event=slot.event):
+        slot = TalkSlot.objects.select_related(
+            "submission", "submission__event"
+        ).get(pk=slot.pk)
+        with django_assert_num_queries(0):
+            assert prefetch_slot_id_suffixes([slot])[0].id_suffix == ""
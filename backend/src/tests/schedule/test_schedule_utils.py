@@ -56,3 +56,38 @@ def assert_result_is_same(result, expected):
         )
         assert get_current_notifications(speaker, event) == {"create": [], "update": []}
         assert_result_is_same(get_full_notifications(speaker, event), expected)
+
+
+@pytest.mark.django_db
+def test_schedule_notifications_generated_in_bulk(event, slot, other_slot):
+    from imanage.mail.models import QueuedMail
+
+    with scope(event=event):
+        schedule = slot.schedule
+        speakers = set(schedule.speakers_concerned)
+        assert speakers
+
+        unsaved = schedule.generate_notifications(save=False)
+        assert len(unsaved) == len(speakers)
+        assert not any(mail.pk for mail in unsaved)
+        assert {mail.to for mail in unsaved} == {speaker.email for speaker in speakers}
+
+        mail_count = QueuedMail.objects.count()
+        progress = []
+        mails = schedule.generate_notifications(
+            save=True, progress=lambda done, total: progress.append((done, total))
+        )
+        assert progress[0] == (0, len(speakers))
+        assert QueuedMail.objects.count() == mail_count + len(speakers)
+        for mail in mails:
+            mail.refresh_from_db()
+            speaker = mail.to_users.get()
+            assert speaker in speakers
+            assert not mail.to
+            assert set(mail.submissions.all()) == set(
+                speaker.submissions.filter(slots__schedule=schedule)
+            )
+            assert all(
+                attachment["content_type"] == "text/calendar"
+                for attachment in mail.attachments
+            )
@@ -9,6 +9,7 @@
 from imanage.common.exceptions import SubmissionError
 from imanage.submission.models import Answer, Submission, SubmissionStates
 from imanage.submission.models.submission import submission_image_path
+from imanage.submission.services import bulk_set_state
 
 
 @pytest.mark.parametrize(
@@ -223,6 +224,24 @@ def test_make_submitted(submission, state):
         assert submission.logged_actions().count() == 1
 
 
+@pytest.mark.parametrize("bulk", (True, False))
+@pytest.mark.django_db
+def test_make_submitted_from_draft_signal(submission, bulk):
+    submission.event.plugins = "tests"
+    submission.event.save()
+    with scope(event=submission.event):
+        submission.state = SubmissionStates.DRAFT
+        submission.save()
+
+        if bulk:
+            bulk_set_state(submission.event, [submission], SubmissionStates.SUBMITTED)
+        else:
+            submission.make_submitted()
+        assert submission.state == SubmissionStates.SUBMITTED
+        assert submission._state_change_called == 1
+        assert submission._state_change_old_state is None
+
+
 @pytest.mark.django_db
 def test_submission_set_state_error_msg(submission):
     with scope(event=submission.event):